@@ -0,0 +1,119 @@
+import argparse
+import copy
+import json
+import os
+import sys
+
+from api_accuracy_checker.common.utils import get_json_contents, print_info_log, print_warn_log, print_error_log
+from ptdbg_ascend.src.python.ptdbg_ascend.common.file_check_util import FileOpen, FileCheckConst, FileChecker, \
+    check_file_suffix, change_mode
+
+
+class ApiInfoReader:
+    """
+    Read-only mapping over a forward, backward or stack info file dumped as json lines, one
+    {api_name: info} object per line. Opening the file only records the line offset of every api
+    name, an entry is parsed when it is looked up. Files dumped as a single json object are loaded
+    entirely, convert them with convert_api_info_file to read them lazily. Any other line that is not
+    valid json raises ValueError, except an incomplete last line which is skipped.
+    """
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.offsets = {}
+        self.content = None
+        self._cached_line = (None, None)
+        self._build_index()
+
+    def _build_index(self):
+        offset = 0
+        parsed_line = False
+        with FileOpen(self.file_path, 'rb') as f:
+            for line_no, line in enumerate(f, 1):
+                line_offset, offset = offset, offset + len(line)
+                if not line.strip():
+                    continue
+                try:
+                    entries = json.loads(line)
+                except json.JSONDecodeError as err:
+                    if parsed_line and not line.endswith(b'\n'):
+                        print_warn_log(f"Skip the incomplete last line of {self.file_path}.")
+                        return
+                    if parsed_line:
+                        print_error_log(f"Line {line_no} of {self.file_path} is not valid json: {err}")
+                        raise ValueError(f"line {line_no} of {self.file_path} is not valid json") from err
+                    print_warn_log(f"{self.file_path} is not in json lines format and is loaded entirely, "
+                                   f"convert it with api_info_reader.py to reduce memory usage.")
+                    self.offsets = {}
+                    self.content = get_json_contents(self.file_path)
+                    return
+                parsed_line = True
+                for api_name in entries:
+                    self.offsets[api_name] = line_offset
+
+    def _read_line(self, offset):
+        # consecutive lookups often hit the same line, e.g. a dump written as one single line json
+        if self._cached_line[0] != offset:
+            with FileOpen(self.file_path, 'rb') as f:
+                f.seek(offset)
+                self._cached_line = (offset, json.loads(f.readline()))
+        return self._cached_line[1]
+
+    def __contains__(self, api_name):
+        if self.content is not None:
+            return api_name in self.content
+        return api_name in self.offsets
+
+    def __getitem__(self, api_name):
+        # callers such as gen_kwargs modify the returned info in place
+        if self.content is not None:
+            return copy.deepcopy(self.content[api_name])
+        return copy.deepcopy(self._read_line(self.offsets[api_name])[api_name])
+
+    def __len__(self):
+        return len(self.content) if self.content is not None else len(self.offsets)
+
+    def get(self, api_name, default=None):
+        return self[api_name] if api_name in self else default
+
+    def keys(self):
+        return list(self.content.keys()) if self.content is not None else list(self.offsets.keys())
+
+    def items(self):
+        for api_name in self.keys():
+            yield api_name, self[api_name]
+
+
+def convert_api_info_file(input_file, output_file):
+    """Rewrite an info file dumped as a single json object into json lines, one api per line."""
+    content = get_json_contents(input_file)
+    with FileOpen(output_file, 'w') as f:
+        for api_name, api_info in content.items():
+            f.write(json.dumps({api_name: api_info}) + '\n')
+    change_mode(output_file, FileCheckConst.DATA_FILE_AUTHORITY)
+    print_info_log(f"Convert {len(content)} apis from {input_file} to {output_file}.")
+
+
+def _convert_parser(parser):
+    parser.add_argument("-i", "--input_file", dest="input_file", type=str, required=True,
+                        help="<Required> The forward, backward or stack info file dumped as a single json object.")
+    parser.add_argument("-o", "--output_file", dest="output_file", type=str, required=True,
+                        help="<Required> The converted json lines file.")
+
+
+def _convert():
+    parser = argparse.ArgumentParser()
+    _convert_parser(parser)
+    args = parser.parse_args(sys.argv[1:])
+    input_file = os.path.realpath(args.input_file)
+    output_file = os.path.realpath(args.output_file)
+    check_file_suffix(input_file, FileCheckConst.JSON_SUFFIX)
+    check_file_suffix(output_file, FileCheckConst.JSON_SUFFIX)
+    FileChecker(input_file, FileCheckConst.FILE, ability=FileCheckConst.READ_ABLE).common_check()
+    if os.path.exists(output_file):
+        print_error_log(f"file {output_file} already exists, please remove it first.")
+        raise ValueError(f"file {output_file} already exists")
+    convert_api_info_file(input_file, output_file)
+
+
+if __name__ == '__main__':
+    _convert()
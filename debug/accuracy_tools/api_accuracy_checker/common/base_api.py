@@ -1,6 +1,8 @@
 import os
 import torch
-from api_accuracy_checker.common.utils import print_error_log, write_pt
+from api_accuracy_checker.common.utils import print_error_log
+from api_accuracy_checker.common.config import msCheckerConfig
+from api_accuracy_checker.common.real_data_writer import real_data_writer
 
 
 class BaseAPIInfo:
@@ -43,13 +45,12 @@ class BaseAPIInfo:
 
     def analyze_tensor(self, arg):
         single_arg = {}
-        if not self.is_save_data:
-
+        if not self.is_save_data or self.is_real_data_oversized(arg):
+            if self.is_save_data:
+                # keep the file names of the following real data args unchanged
+                self.args_num += 1
             single_arg.update({'type' : 'torch.Tensor'})
-            single_arg.update({'dtype' : str(arg.dtype)})
-            single_arg.update({'shape' : arg.shape})
-            single_arg.update({'Max' : self.transfer_types(self.get_tensor_extremum(arg,'max'), str(arg.dtype))})
-            single_arg.update({'Min' : self.transfer_types(self.get_tensor_extremum(arg,'min'), str(arg.dtype))})
+            self.update_tensor_statistics(single_arg, arg)
             single_arg.update({'requires_grad': arg.requires_grad})
 
         else:
@@ -62,12 +63,29 @@ class BaseAPIInfo:
                 backward_real_data_path = os.path.join(self.save_path, self.backward_path)
                 file_path = os.path.join(backward_real_data_path, f'{api_args}.pt')
             self.args_num += 1
-            pt_path = write_pt(file_path, arg.contiguous().cpu().detach())
             single_arg.update({'type' : 'torch.Tensor'})
-            single_arg.update({'datapath' : pt_path})
+            single_arg.update({'datapath' : os.path.realpath(file_path)})
             single_arg.update({'requires_grad': arg.requires_grad})
+            real_data_writer.submit(file_path, arg,
+                                    on_failure=lambda host_tensor: self.drop_real_data(single_arg, host_tensor))
         return single_arg
 
+    def update_tensor_statistics(self, single_arg, arg):
+        single_arg.update({'dtype' : str(arg.dtype)})
+        single_arg.update({'shape' : arg.shape})
+        single_arg.update({'Max' : self.transfer_types(self.get_tensor_extremum(arg,'max'), str(arg.dtype))})
+        single_arg.update({'Min' : self.transfer_types(self.get_tensor_extremum(arg,'min'), str(arg.dtype))})
+
+    def drop_real_data(self, single_arg, host_tensor):
+        """The real data was not saved, record the statistics so run_ut generates the arg randomly instead."""
+        del single_arg['datapath']
+        self.update_tensor_statistics(single_arg, host_tensor)
+
+    @staticmethod
+    def is_real_data_oversized(arg):
+        """Tensors over real_data_max_size MB are recorded by their statistics and regenerated randomly."""
+        return arg.numel() * arg.element_size() > msCheckerConfig.real_data_max_size * 1024 * 1024
+
     def analyze_builtin(self, arg):
         single_arg = {}
         if self.is_save_data:
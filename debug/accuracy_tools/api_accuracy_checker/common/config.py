@@ -18,7 +18,8 @@ class Config:
             'dump_step': int,
             'error_data_path': str,
             'target_iter': int,
-            'precision': int
+            'precision': int,
+            'real_data_max_size': int
         }
         if not isinstance(value, validators.get(key)):
             raise ValueError(f"{key} must be {validators[key].__name__} type")
@@ -26,6 +27,8 @@ class Config:
             raise ValueError("target_iter must be greater than 0")
         if key == 'precision' and value < 0:
             raise ValueError("precision must be greater than 0")
+        if key == 'real_data_max_size' and value <= 0:
+            raise ValueError("real_data_max_size must be greater than 0")
         return value
 
     def __getattr__(self, item):
@@ -0,0 +1,97 @@
+import atexit
+import os
+import queue
+import threading
+import torch
+
+from api_accuracy_checker.common.utils import print_error_log, write_pt
+
+
+class RealDataWriter:
+    """
+    Save the real data tensors of the dumped apis off the training step. submit copies the tensor to a
+    host buffer, pinned and asynchronous for device tensors, and a background thread serializes the
+    queued copies with write_pt. The queue is bounded so that host memory stays limited when the disk
+    is slower than the training step.
+    """
+    QUEUE_SIZE = 64
+
+    def __init__(self):
+        self.queue = None
+        self.thread = None
+        self.pid = None
+        self.pending_paths = set()
+        self.lock = threading.Lock()
+        atexit.register(self.flush)
+
+    @staticmethod
+    def copy_to_host(tensor):
+        tensor = tensor.detach()
+        if tensor.device.type == 'cpu':
+            # the caller may modify the tensor in place before it is saved
+            return tensor.clone(memory_format=torch.contiguous_format), None
+        try:
+            # pinned blocks are recycled by the torch host allocator once the saved copy is released
+            host_tensor = torch.empty(tensor.shape, dtype=tensor.dtype, pin_memory=True)
+            host_tensor.copy_(tensor, non_blocking=True)
+            event = getattr(torch, tensor.device.type).Event()
+            event.record()
+        except (RuntimeError, AttributeError):
+            return tensor.contiguous().cpu(), None
+        return host_tensor, event
+
+    def submit(self, file_path, tensor, on_failure=None):
+        """
+        Queue tensor to be saved into file_path and return the real path it is saved to. If the save fails,
+        on_failure is called with the host copy of the tensor in the writer thread.
+        """
+        full_path = os.path.realpath(file_path)
+        self._start()
+        with self.lock:
+            if os.path.exists(full_path) or full_path in self.pending_paths:
+                raise ValueError(f"File {file_path} already exists")
+            self.pending_paths.add(full_path)
+        host_tensor, event = self.copy_to_host(tensor)
+        self.queue.put((full_path, host_tensor, event, on_failure))
+        return full_path
+
+    def flush(self):
+        if self.queue is not None and self.pid == os.getpid():
+            self.queue.join()
+
+    def _start(self):
+        # threads do not survive fork, a forked child starts its own writer
+        if self.pid == os.getpid():
+            return
+        self.queue = queue.Queue(maxsize=self.QUEUE_SIZE)
+        self.pending_paths = set()
+        self.pid = os.getpid()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        while True:
+            full_path, host_tensor, event, on_failure = self.queue.get()
+            try:
+                if event is not None:
+                    event.synchronize()
+                write_pt(full_path, host_tensor)
+            except Exception as err:
+                print_error_log(f"Save real data {full_path} failed: {err}")
+                self._handle_failure(full_path, host_tensor, on_failure)
+            finally:
+                with self.lock:
+                    self.pending_paths.discard(full_path)
+                self.queue.task_done()
+
+    @staticmethod
+    def _handle_failure(full_path, host_tensor, on_failure):
+        if on_failure is None:
+            return
+        try:
+            on_failure(host_tensor)
+        except Exception as err:
+            print_error_log(f"Record the failed save of real data {full_path} failed: {err}")
+
+
+real_data_writer = RealDataWriter()
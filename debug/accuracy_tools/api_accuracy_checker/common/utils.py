@@ -15,6 +15,7 @@
 # limitations under the License.
 """
 import collections
+import io
 import json
 import os
 import random
@@ -204,6 +205,42 @@ def write_csv(data, filepath):
         writer = csv.writer(f)
         writer.writerows(data)
 
+
+def read_csv(filepath):
+    with FileOpen(filepath, 'r') as f:
+        return list(csv.reader(f))
+
+
+class BufferedCsvWriter:
+    """
+    Collect csv rows in memory and append them to filepath with a single write and fsync on flush.
+    size is the file size once the buffered rows are flushed, so callers can record a consistent
+    position before the rows reach the disk.
+    """
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self.size = os.path.getsize(filepath) if os.path.exists(filepath) else 0
+        self.chunks = []
+        self.row_count = 0
+
+    def write_rows(self, rows):
+        rows_io = io.StringIO()
+        csv.writer(rows_io).writerows(rows)
+        data = rows_io.getvalue().encode()
+        self.chunks.append(data)
+        self.size += len(data)
+        self.row_count += len(rows)
+
+    def flush(self):
+        if not self.chunks:
+            return
+        with FileOpen(self.filepath, 'ab') as f:
+            f.write(b"".join(self.chunks))
+            f.flush()
+            os.fsync(f.fileno())
+        self.chunks = []
+        self.row_count = 0
+
 def _print_log(level, msg):
     current_time = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(int(time.time())))
     pid = os.getgid()
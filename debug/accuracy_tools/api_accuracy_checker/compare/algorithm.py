@@ -138,28 +138,87 @@ def flatten_compare_result(result):
             flatten_result.append(result_i)
     return flatten_result
 
+def get_rel_err_metrics(b_value, n_value):
+    """
+    Max relative error, max absolute error and relative error ratios computed together from one eps handled copy
+    of the outputs and one difference array. Values are the same as get_max_rel_err, get_max_abs_err and
+    get_rel_err_ratio_(ten_)thousandth. Return None when the outputs can not be compared this way.
+    """
+    b_value, n_value, msg = get_msg_and_handle_value(b_value.copy(), n_value.copy())
+    if msg:
+        return None
+    diff = n_value - b_value
+    rel_errs = np.abs(diff / b_value)
+    rel_err = rel_errs.max()
+    abs_err = np.abs(diff).max()
+
+    def rel_err_ratio(thresholding):
+        ratio = np.divide(np.sum(rel_errs < thresholding), np.size(rel_errs))
+        return ratio, ratio > (1 - thresholding), msg
+
+    ten_thousandth_result = rel_err_ratio(0.0001)
+    if n_value.dtype == np.float16:
+        ten_thousandth_result = (ten_thousandth_result[0], True,
+                                 f"This indicator is not used to evaluate {n_value.dtype} data")
+    return {
+        get_max_rel_err: (rel_err, rel_err < (0.0001 if n_value.dtype == np.float32 else 0.001), msg),
+        get_max_abs_err: (abs_err, abs_err < 0.001, msg),
+        get_rel_err_ratio_thousandth: rel_err_ratio(0.001),
+        get_rel_err_ratio_ten_thousandth: ten_thousandth_result
+    }
+
+
+def compare_torch_tensor_multi(cpu_output, npu_output, algs):
+    if not check_dtype_comparable(cpu_output, npu_output):
+        return [compare_torch_tensor(cpu_output, npu_output, None)] * len(algs)
+    if cpu_output.dtype in [bool, np.uint8, np.int8, np.int16, np.uint16, np.uint32, np.int32, np.int64, np.uint64]:
+        return [compare_bool_tensor(cpu_output, npu_output)] * len(algs)
+    rel_err_metrics = None
+    if any(alg in REL_ERR_ALGORITHMS for alg in algs):
+        rel_err_metrics = get_rel_err_metrics(cpu_output, npu_output)
+    results = []
+    for alg in algs:
+        if rel_err_metrics and alg in rel_err_metrics:
+            results.append(rel_err_metrics[alg])
+        elif alg is cosine_sim:
+            results.append(cosine_sim(cpu_output, npu_output))
+        else:
+            # other algorithms may modify the values in place, as get_msg_and_handle_value does
+            results.append(alg(cpu_output.copy(), npu_output.copy()))
+    return results
+
+
+REL_ERR_ALGORITHMS = [get_max_rel_err, get_max_abs_err, get_rel_err_ratio_thousandth, get_rel_err_ratio_ten_thousandth]
+
+
 # 本函数用alg比对bench_out 和npu_out，返回详细比对结果compare_result和标志比对是否通过的布尔变量test_success
 def compare_core(bench_out, npu_out, alg):
-    msg = ""
+    return compare_core_multi(bench_out, npu_out, [alg])[0]
+
+
+# 本函数用algs中的每个算法比对bench_out和npu_out，输出只遍历和转换一次，按algs顺序返回每个算法的compare_core结果
+def compare_core_multi(bench_out, npu_out, algs):
+    alg_num = len(algs)
+    # every algorithm gets its own result lists, the caller concatenates them in place
     if not isinstance(bench_out, type(npu_out)):
-        return [(CompareConst.NA, "bench and npu output type is different.")], False, CompareConst.NA, CompareConst.NA, CompareConst.NA
+        return [([(CompareConst.NA, "bench and npu output type is different.")], False, CompareConst.NA, CompareConst.NA, CompareConst.NA)
+                for _ in algs]
     if isinstance(bench_out, (list, tuple)):
-        compare_result, test_success, bench_dtype, npu_dtype, shape = [], True, [], [], []
         if len(bench_out) != len(npu_out):
-            return [(CompareConst.NA, "bench and npu output structure is different")], False, CompareConst.NA, CompareConst.NA, CompareConst.NA
+            return [([(CompareConst.NA, "bench and npu output structure is different")], False, CompareConst.NA, CompareConst.NA, CompareConst.NA)
+                    for _ in algs]
+        alg_results = [[[], True, [], [], [], ""] for _ in algs]
         for b_out_i, n_out_i in zip(bench_out, npu_out):
-            compare_result_i, test_success_i, bench_dtype_i, npu_dtype_i, shape_i = compare_core(b_out_i, n_out_i, alg)
-            compare_result.append(compare_result_i)
-            test_success = test_success and test_success_i
-            bench_dtype.append(bench_dtype_i)
-            npu_dtype.append(npu_dtype_i)
-            shape.append(shape_i)
+            for alg_result, result_i in zip(alg_results, compare_core_multi(b_out_i, n_out_i, algs)):
+                compare_result_i, test_success_i, bench_dtype_i, npu_dtype_i, shape_i = result_i
+                alg_result[0].append(compare_result_i)
+                alg_result[1] = alg_result[1] and test_success_i
+                alg_result[2].append(bench_dtype_i)
+                alg_result[3].append(npu_dtype_i)
+                alg_result[4].append(shape_i)
     elif isinstance(bench_out, dict):
-        b_keys, n_keys = set(bench_out.keys()), set(npu_out.keys())
-        if b_keys != n_keys:
-            compare_result, test_success, bench_dtype, npu_dtype, shape = [(CompareConst.NA, "bench and npu output dict keys are different")], False, \
-                CompareConst.NA, CompareConst.NA, CompareConst.NA
-        compare_result, test_success, bench_dtype, npu_dtype, shape = compare_core(list(bench_out.values()), list(npu_out.values()), alg)
+        alg_results = [list(result) + [""] for result in
+                       compare_core_multi(list(bench_out.values()), list(npu_out.values()), algs)]
     elif isinstance(bench_out, torch.Tensor):
         copy_bench_out = bench_out.detach().clone()
         copy_npu_out = npu_out.detach().clone()
@@ -169,23 +228,21 @@ def compare_core(bench_out, npu_out, alg):
         if copy_npu_out.dtype == torch.bfloat16:
             copy_bench_out = copy_bench_out.to(torch.float32)
             copy_npu_out = copy_npu_out.to(torch.float32)
-        compare_result, test_success, msg = compare_torch_tensor(copy_bench_out.numpy(), copy_npu_out.cpu().numpy(), alg)
+        alg_results = [[compare_result, test_success, bench_dtype, npu_dtype, shape, msg] for compare_result, test_success, msg
+                       in compare_torch_tensor_multi(copy_bench_out.numpy(), copy_npu_out.cpu().numpy(), algs)]
     elif isinstance(bench_out, (bool, int, float, str)):
         compare_result, test_success, msg = compare_builtin_type(bench_out, npu_out)
-        bench_dtype = str(type(bench_out))
-        npu_dtype = str(type(npu_out))
-        shape = str(type(npu_out))
+        alg_results = [[compare_result, test_success, str(type(bench_out)), str(type(npu_out)), str(type(npu_out)), msg]] * alg_num
     elif bench_out is None:
-        compare_result, test_success, msg = CompareConst.NA, True, "output is None"
-        bench_dtype = CompareConst.NA
-        npu_dtype = CompareConst.NA
-        shape = CompareConst.NA
+        alg_results = [[CompareConst.NA, True, CompareConst.NA, CompareConst.NA, CompareConst.NA, "output is None"]] * alg_num
     else:
-        compare_result, test_success, msg = CompareConst.NA, True, "Unexpected output type \
+        msg = "Unexpected output type \
                      in compare_core: {}".format(type(bench_out))
-        bench_dtype = CompareConst.NA
-        npu_dtype = CompareConst.NA
-        shape = CompareConst.NA
+        alg_results = [[CompareConst.NA, True, CompareConst.NA, CompareConst.NA, CompareConst.NA, msg]] * alg_num
+    return [_flatten_compare_core_result(*alg_result) for alg_result in alg_results]
+
+
+def _flatten_compare_core_result(compare_result, test_success, bench_dtype, npu_dtype, shape, msg):
     if isinstance(compare_result, list):
         compare_result = flatten_compare_result(compare_result)
     else:
@@ -198,4 +255,4 @@ def compare_core(bench_out, npu_out, alg):
         bench_dtype = [bench_dtype]
         npu_dtype = [npu_dtype]
         shape = [shape]
-    return compare_result, test_success, bench_dtype, npu_dtype, shape
\ No newline at end of file
+    return compare_result, test_success, bench_dtype, npu_dtype, shape
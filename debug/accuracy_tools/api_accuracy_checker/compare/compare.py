@@ -1,16 +1,25 @@
 # 进行比对及结果展示
+import atexit
 import os
+import time
 from rich.table import Table
 from rich.console import Console
-from api_accuracy_checker.compare.algorithm import compare_core, cosine_sim, cosine_standard, get_max_rel_err, get_max_abs_err, \
+from api_accuracy_checker.compare.algorithm import compare_core_multi, cosine_sim, cosine_standard, get_max_rel_err, get_max_abs_err, \
     compare_builtin_type, get_rel_err_ratio_thousandth, get_rel_err_ratio_ten_thousandth
-from api_accuracy_checker.common.utils import get_json_contents, print_info_log, write_csv
+from api_accuracy_checker.common.utils import print_info_log, write_csv, read_csv, \
+    BufferedCsvWriter
+from api_accuracy_checker.common.api_info_reader import ApiInfoReader
 from api_accuracy_checker.compare.compare_utils import CompareConst 
+from api_accuracy_checker.compare.progress_journal import ProgressJournal
 from api_accuracy_checker.common.config import msCheckerConfig
 
 class Comparator:
     TEST_FILE_NAME = "accuracy_checking_result.csv"
     DETAIL_TEST_FILE_NAME = "accuracy_checking_details.csv"
+    PROGRESS_FILE_NAME = "accuracy_checking_progress.jsonl"
+    # buffered result rows are flushed at an api boundary once either limit is reached
+    FLUSH_ROWS = 500
+    FLUSH_INTERVAL = 10
 
     # consts for result csv 
     COLUMN_API_NAME = "API name"
@@ -18,15 +27,19 @@ class Comparator:
     COLUMN_BACKWARD_SUCCESS = "Backward Test Success"
     COLUMN_STACK_INFO = "Traceback callstack info"
 
-    def __init__(self, result_save_path, stack_info_json_path=None):
+    def __init__(self, result_save_path, stack_info_json_path=None, is_continue_run_ut=False):
         self.save_path = os.path.join(result_save_path, self.TEST_FILE_NAME)
-        if os.path.exists(self.save_path):
-            raise ValueError(f"file {self.save_path} already exists, please remove it first or use a new dump path")
         self.detail_save_path = os.path.join(result_save_path, self.DETAIL_TEST_FILE_NAME)
-        if os.path.exists(self.detail_save_path):
-            raise ValueError(f"file {self.detail_save_path} already exists, please remove it first or use a new dump path")
+        self.journal = ProgressJournal(os.path.join(result_save_path, self.PROGRESS_FILE_NAME))
+        is_continue_run_ut = is_continue_run_ut and os.path.exists(self.save_path) \
+            and os.path.exists(self.detail_save_path)
+        if not is_continue_run_ut:
+            if os.path.exists(self.save_path):
+                raise ValueError(f"file {self.save_path} already exists, please remove it first or use a new dump path")
+            if os.path.exists(self.detail_save_path):
+                raise ValueError(f"file {self.detail_save_path} already exists, please remove it first or use a new dump path")
         if stack_info_json_path:
-            self.stack_info = get_json_contents(stack_info_json_path)
+            self.stack_info = ApiInfoReader(stack_info_json_path)
         else:
             self.stack_info = None
         self.compare_alg = {}
@@ -42,7 +55,62 @@ class Comparator:
             "total_num": 0
         }
         self.result_save_path = result_save_path
-        self.write_csv_title()
+        if is_continue_run_ut:
+            self.resume_from_journal()
+        else:
+            self.journal.remove()
+            self.write_csv_title()
+        self.summary_writer = BufferedCsvWriter(self.save_path)
+        self.detail_writer = BufferedCsvWriter(self.detail_save_path)
+        self.last_flush_time = time.time()
+        self.pid = os.getpid()
+        atexit.register(self.flush)
+
+    def flush(self):
+        """
+        Write the buffered result rows, then commit their progress records, so that an interrupted
+        flush leaves at most uncommitted rows which a continued run cuts off and checks again.
+        """
+        # a forked child must not write the rows buffered by its parent
+        if os.getpid() != self.pid:
+            return
+        self.summary_writer.flush()
+        self.detail_writer.flush()
+        self.journal.flush()
+        self.last_flush_time = time.time()
+
+    def resume_from_journal(self):
+        """
+        Restore the results of an interrupted run: cut the csv files back to the sizes of the last
+        committed api so rows of an unfinished api are not duplicated, and rebuild the statistics.
+        """
+        self.journal.load()
+        if self.journal.last_record is None:
+            os.remove(self.save_path)
+            os.remove(self.detail_save_path)
+            self.write_csv_title()
+            return
+        summary_size, detail_size = self.journal.last_record["file_sizes"]
+        os.truncate(self.save_path, summary_size)
+        os.truncate(self.detail_save_path, detail_size)
+        for record in self.journal.records.values():
+            if "SKIP" in (record["forward"], record["backward"]):
+                continue
+            self.test_result_cnt["total_num"] += 1
+            self.update_test_result_cnt(self._parse_success(record["forward"]),
+                                        self._parse_success(record["backward"]))
+        print_info_log(f"Continue run_ut from {self.result_save_path}, "
+                       f"{len(self.journal.records)} apis have been checked.")
+
+    def is_api_completed(self, api_name):
+        return self.journal.is_completed(api_name)
+
+    def record_progress(self, api_name, fwd_result, bwd_result):
+        file_sizes = [self.summary_writer.size, self.detail_writer.size]
+        self.journal.append(api_name, fwd_result, bwd_result, file_sizes)
+        if self.summary_writer.row_count + self.detail_writer.row_count >= self.FLUSH_ROWS or \
+                time.time() - self.last_flush_time >= self.FLUSH_INTERVAL:
+            self.flush()
 
     def print_pretest_result(self):
         if self.test_result_cnt.get("total_num") != 0:
@@ -102,7 +170,7 @@ class Comparator:
             stack_info = "\n".join(self.stack_info[name])
             df_row.append(stack_info)
         test_rows.append(df_row)
-        write_csv(test_rows, self.save_path)
+        self.summary_writer.write_rows(test_rows)
 
     def write_detail_csv(self, test_result):
         test_rows = []
@@ -121,7 +189,7 @@ class Comparator:
                 test_subject = ["{:.{}f}".format(item, msCheckerConfig.precision) if isinstance(item, float) else item for item in test_subject]
                 test_rows.append([subject] + list(test_subject))
 
-        write_csv(test_rows, self.detail_save_path)
+        self.detail_writer.write_rows(test_rows)
 
     def record_results(self, *args):
         self.write_summary_csv(args)
@@ -145,6 +213,11 @@ class Comparator:
         else:
             is_bwd_success, bwd_compare_alg_results = CompareConst.NA, None
         self.record_results(api_name, is_fwd_success, is_bwd_success, fwd_compare_alg_results, bwd_compare_alg_results)
+        self.record_progress(api_name, is_fwd_success, is_bwd_success)
+        self.update_test_result_cnt(is_fwd_success, is_bwd_success)
+        return is_fwd_success, is_bwd_success
+
+    def update_test_result_cnt(self, is_fwd_success, is_bwd_success):
         if is_fwd_success and is_bwd_success:
             self.test_result_cnt['success_num'] += 1
         elif not is_fwd_success and not is_bwd_success:
@@ -153,7 +226,23 @@ class Comparator:
             self.test_result_cnt['forward_fail_num'] += 1
         else:
             self.test_result_cnt['backward_fail_num'] += 1
-        return is_fwd_success, is_bwd_success
+
+    def merge_shard_results(self, shard_paths):
+        """
+        Append the summary and detail rows written by every shard of a sharded run_ut to the result csv
+        files, in shard order, and rebuild the statistics from the merged summary rows.
+        """
+        for shard_path in shard_paths:
+            summary_rows = read_csv(os.path.join(shard_path, self.TEST_FILE_NAME))[1:]
+            detail_rows = read_csv(os.path.join(shard_path, self.DETAIL_TEST_FILE_NAME))[1:]
+            self.summary_writer.write_rows(summary_rows)
+            self.detail_writer.write_rows(detail_rows)
+            for row in summary_rows:
+                if "SKIP" in row[1:3]:
+                    continue
+                self.test_result_cnt["total_num"] += 1
+                self.update_test_result_cnt(self._parse_success(row[1]), self._parse_success(row[2]))
+        self.flush()
 
 
     def _compare_core_wrapper(self, bench_out, npu_out):
@@ -163,9 +252,11 @@ class Comparator:
         shape_total = []
         test_success_total = True
         max_abs_error_success = False
-        for name in self.compare_alg.keys():
-            alg = self.compare_alg[name][0]
-            detailed_result, test_success, bench_dtype, npu_dtype, shape = compare_core(bench_out, npu_out, alg)
+        alg_names = list(self.compare_alg.keys())
+        # outputs are traversed and converted once, all the algorithms share the converted values
+        alg_results = compare_core_multi(bench_out, npu_out, [self.compare_alg[name][0] for name in alg_names])
+        for name, alg_result in zip(alg_names, alg_results):
+            detailed_result, test_success, bench_dtype, npu_dtype, shape = alg_result
             bench_dtype_total = bench_dtype
             npu_dtype_total = npu_dtype
             shape_total = shape
@@ -189,6 +280,11 @@ class Comparator:
             detailed_result_total[i] = tuple(detailed_result)
         return test_success_total, detailed_result_total
     
+    @staticmethod
+    def _parse_success(value):
+        # results are written as str(bool), backward results without grad as CompareConst.NA
+        return value != str(False)
+
     @staticmethod
     def _compare_dropout(bench_out, npu_out):
         tensor_num = bench_out.numel()
@@ -0,0 +1,66 @@
+import json
+import os
+from api_accuracy_checker.common.utils import print_warn_log
+from ptdbg_ascend.src.python.ptdbg_ascend.common.file_check_util import FileCheckConst, FileOpen
+
+
+class ProgressJournal:
+    """
+    Append-only journal of the apis finished by run_ut. Each line records one api, its outcome and the
+    sizes of the result csv files after its rows were written, so that a resumed run can cut off the
+    rows of an api interrupted before its line was committed. A torn last line is dropped on load.
+    """
+    def __init__(self, journal_path):
+        self.journal_path = journal_path
+        self.records = {}
+        self.last_record = None
+        self.pending_lines = []
+
+    def load(self):
+        self.records, self.last_record, self.pending_lines = {}, None, []
+        if not os.path.exists(self.journal_path):
+            return self
+        valid_size = 0
+        with FileOpen(self.journal_path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    break
+                valid_size += len(line)
+                self.records[record["api_name"]] = record
+                self.last_record = record
+        if valid_size != os.path.getsize(self.journal_path):
+            print_warn_log(f"Drop the incomplete record at the end of {self.journal_path}.")
+            os.truncate(self.journal_path, valid_size)
+        return self
+
+    def append(self, api_name, fwd_result, bwd_result, file_sizes):
+        """Buffer a record, it is committed by the next flush, after the csv rows it refers to."""
+        record = {"api_name": api_name, "forward": str(fwd_result), "backward": str(bwd_result),
+                  "file_sizes": file_sizes}
+        self.pending_lines.append(json.dumps(record) + "\n")
+        self.records[api_name] = record
+        self.last_record = record
+
+    def flush(self):
+        if not self.pending_lines:
+            return
+        # a single O_APPEND write followed by fsync, the lines are either fully committed or torn at the end
+        fd = os.open(self.journal_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, FileCheckConst.DATA_FILE_AUTHORITY)
+        try:
+            os.write(fd, "".join(self.pending_lines).encode())
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        self.pending_lines = []
+
+    def remove(self):
+        if os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+        self.records, self.last_record, self.pending_lines = {}, None, []
+
+    def is_completed(self, api_name):
+        return api_name in self.records
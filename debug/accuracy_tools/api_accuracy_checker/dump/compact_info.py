@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+# Copyright (C) 2023-2023. Huawei Technologies Co., Ltd. All rights reserved.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+
+from api_accuracy_checker.common.utils import print_info_log, print_warn_log, print_error_log
+from ptdbg_ascend.src.python.ptdbg_ascend.common.file_check_util import FileOpen, FileCheckConst, FileChecker, \
+    change_mode
+
+INFO_KINDS = ["forward", "backward", "stack"]
+
+
+def get_info_files(dump_path, kind, pids=None):
+    pattern = re.compile(rf"{kind}_info_(\d+)\.json")
+    info_files = []
+    for file_name in os.listdir(dump_path):
+        match = pattern.fullmatch(file_name)
+        if match and (not pids or int(match.group(1)) in pids):
+            info_files.append((int(match.group(1)), os.path.join(dump_path, file_name)))
+    return [file_path for _, file_path in sorted(info_files)]
+
+
+def compact_info_files(info_files, output_file):
+    """
+    Merge the json lines info files dumped by several processes into output_file in process id order.
+    Incomplete lines left by a killed process are dropped, and an api name already merged from an
+    earlier file is skipped.
+    """
+    api_names = set()
+    skip_num = 0
+    with FileOpen(output_file, 'w') as output:
+        for info_file in info_files:
+            with FileOpen(info_file, 'r') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        entries = json.loads(line)
+                    except json.JSONDecodeError:
+                        print_warn_log(f"Skip the incomplete line in {info_file}.")
+                        continue
+                    for api_name, api_info in entries.items():
+                        if api_name in api_names:
+                            skip_num += 1
+                            continue
+                        api_names.add(api_name)
+                        output.write(json.dumps({api_name: api_info}) + '\n')
+    change_mode(output_file, FileCheckConst.DATA_FILE_AUTHORITY)
+    if skip_num:
+        print_warn_log(f"Skip {skip_num} duplicated apis when merging into {output_file}.")
+    return len(api_names)
+
+
+def compact_dump_path(dump_path, output_path, pids=None):
+    for kind in INFO_KINDS:
+        info_files = get_info_files(dump_path, kind, pids)
+        if not info_files:
+            continue
+        output_file = os.path.join(output_path, f"{kind}_info.json")
+        if os.path.exists(output_file):
+            print_error_log(f"file {output_file} already exists, please remove it first.")
+            raise ValueError(f"file {output_file} already exists")
+        api_num = compact_info_files(info_files, output_file)
+        print_info_log(f"Merge {len(info_files)} {kind} info files into {output_file}, {api_num} apis in total.")
+
+
+def _compact_parser(parser):
+    parser.add_argument("-i", "--dump_path", dest="dump_path", type=str, required=True,
+                        help="<Required> The dump path holding forward/backward/stack_info_{pid}.json files.")
+    parser.add_argument("-o", "--out_path", dest="out_path", type=str, default="",
+                        help="<optional> The path to save the merged files, defaults to the dump path.")
+    parser.add_argument("-p", "--pids", dest="pids", type=int, nargs="+", default=None,
+                        help="<optional> Only merge the files dumped by these process ids.")
+
+
+def _compact():
+    parser = argparse.ArgumentParser()
+    _compact_parser(parser)
+    args = parser.parse_args(sys.argv[1:])
+    dump_path = FileChecker(os.path.realpath(args.dump_path), FileCheckConst.DIR,
+                            ability=FileCheckConst.READ_ABLE).common_check()
+    out_path = os.path.realpath(args.out_path) if args.out_path else dump_path
+    out_path = FileChecker(out_path, FileCheckConst.DIR, ability=FileCheckConst.WRITE_ABLE).common_check()
+    compact_dump_path(dump_path, out_path, args.pids)
+
+
+if __name__ == '__main__':
+    _compact()
@@ -16,8 +16,9 @@
 """
 
 from api_accuracy_checker.dump.api_info import ForwardAPIInfo, BackwardAPIInfo
-from api_accuracy_checker.dump.info_dump import write_api_info_json, initialize_output_json
+from api_accuracy_checker.dump.info_dump import write_api_info_json, initialize_output_json, api_info_writer
 from api_accuracy_checker.common.utils import print_error_log, CompareException
+from api_accuracy_checker.common.real_data_writer import real_data_writer
 from api_accuracy_checker.hook_module.register_hook import initialize_hook
 from api_accuracy_checker.common.config import msCheckerConfig
 
@@ -29,6 +30,9 @@ def set_dump_switch(switch):
     if switch == "ON":
         initialize_hook(pretest_hook)
         initialize_output_json()
+    else:
+        api_info_writer.flush()
+        real_data_writer.flush()
     DumpUtil.set_dump_switch(switch)
 
 class DumpUtil(object):
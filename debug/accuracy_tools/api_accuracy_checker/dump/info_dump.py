@@ -1,4 +1,4 @@
-import fcntl
+import atexit
 import json
 import os
 import threading
@@ -6,11 +6,59 @@ import threading
 from .api_info import ForwardAPIInfo, BackwardAPIInfo
 from ..common.utils import check_file_or_directory_path, initialize_save_path
 from ..common.config import msCheckerConfig
+from ..common.real_data_writer import real_data_writer
 
 from ptdbg_ascend.src.python.ptdbg_ascend.common.file_check_util import FileOpen, FileCheckConst, FileChecker
 
 lock = threading.Lock()
 
+
+class ApiInfoWriter:
+    """
+    Buffer the records of every info file in memory and append them to the files in batches.
+    The files are named after the dumping process, so appending needs no file lock; use
+    compact_info.py to merge them into the files run_ut reads.
+    """
+    FLUSH_SIZE = 1000
+
+    def __init__(self):
+        self.buffers = {}
+        self.buffer_size = 0
+        self.pid = os.getpid()
+        # serializes whole flushes, so batches reach the files in order while write keeps buffering
+        self.flush_lock = threading.Lock()
+        atexit.register(self.flush)
+
+    def write(self, file_path, data):
+        # serialization is deferred to flush, the hooked step only pays for an append
+        with lock:
+            self._check_pid()
+            self.buffers.setdefault(file_path, []).append(data)
+            self.buffer_size += 1
+            need_flush = self.buffer_size >= self.FLUSH_SIZE
+        if need_flush:
+            self.flush()
+
+    def flush(self):
+        with self.flush_lock:
+            with lock:
+                self._check_pid()
+                buffers, self.buffers, self.buffer_size = self.buffers, {}, 0
+            # a failed real data save replaces the datapath of its record, wait for the saves before serializing
+            real_data_writer.flush()
+            for file_path, records in buffers.items():
+                check_file_or_directory_path(os.path.dirname(file_path), True)
+                with FileOpen(file_path, 'a') as f:
+                    f.write(''.join(json.dumps(data) + '\n' for data in records))
+
+    def _check_pid(self):
+        # a forked child drops the lines buffered by its parent
+        if os.getpid() != self.pid:
+            self.buffers, self.buffer_size, self.pid = {}, 0, os.getpid()
+
+
+api_info_writer = ApiInfoWriter()
+
 def write_api_info_json(api_info):
     dump_path = msCheckerConfig.dump_path
     rank = api_info.rank
@@ -18,7 +66,7 @@ def write_api_info_json(api_info):
         file_path = os.path.join(dump_path, f'forward_info_{rank}.json')
         stack_file_path = os.path.join(dump_path, f'stack_info_{rank}.json')
         write_json(file_path, api_info.api_info_struct)
-        write_json(stack_file_path, api_info.stack_info_struct, indent=4)
+        write_json(stack_file_path, api_info.stack_info_struct)
 
     elif isinstance(api_info, BackwardAPIInfo):
         file_path = os.path.join(dump_path, f'backward_info_{rank}.json')
@@ -26,28 +74,9 @@ def write_api_info_json(api_info):
     else:
         raise ValueError(f"Invalid api_info type {type(api_info)}")
 
-def write_json(file_path, data, indent=None):
-    check_file_or_directory_path(os.path.dirname(file_path),True)
-    if not os.path.exists(file_path):
-        with FileOpen(file_path, 'w') as f:
-            f.write("{\n}")
-    lock.acquire()
-    with FileOpen(file_path, 'a+') as f:
-        fcntl.flock(f, fcntl.LOCK_EX)
-        try:
-            f.seek(0, os.SEEK_END)
-            f.seek(f.tell() - 1, os.SEEK_SET)
-            f.truncate()
-            if f.tell() > 3:
-                f.seek(f.tell() - 1, os.SEEK_SET)
-                f.truncate()
-                f.write(',\n')
-            f.write(json.dumps(data, indent=indent)[1:-1] + '\n}')
-        except Exception as e:
-            raise ValueError(f"Json save failed:{e}")
-        finally:
-            fcntl.flock(f, fcntl.LOCK_UN)
-            lock.release()
+def write_json(file_path, data):
+    """Append data as one json line, see common/api_info_reader.py for the reader."""
+    api_info_writer.write(file_path, data)
 
 
 def initialize_output_json():
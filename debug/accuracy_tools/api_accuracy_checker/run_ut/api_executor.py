@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+# Copyright (C) 2023-2023. Huawei Technologies Co., Ltd. All rights reserved.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+
+from functools import lru_cache
+import torch
+
+from api_accuracy_checker.common.utils import Const, api_info_preprocess
+from api_accuracy_checker.run_ut.data_generate import gen_api_params, get_torch_dtype
+from api_accuracy_checker.hook_module.wrap_tensor import TensorOPTemplate
+from api_accuracy_checker.hook_module.wrap_functional import FunctionalOPTemplate
+from api_accuracy_checker.hook_module.wrap_torch import TorchOPTemplate
+
+API_TEMPLATES = {
+    "Functional": FunctionalOPTemplate,
+    "Tensor": TensorOPTemplate,
+    "Torch": TorchOPTemplate
+}
+
+
+@lru_cache(maxsize=None)
+def get_api_callable(api_type, api_name):
+    """
+    Function Description:
+        Return the forward of the op template of an api. The template is built once per api name and reused
+        by the cpu and npu runs, the backward run and every dumped call of the same api.
+    """
+    if api_type not in API_TEMPLATES:
+        raise ValueError(f"Api type {api_type} is not supported, it should be one of {list(API_TEMPLATES)}")
+    return API_TEMPLATES[api_type](api_name, str, False).forward
+
+
+def exec_api(api_type, api_name, args, kwargs):
+    return get_api_callable(api_type, api_name)(*args, **kwargs)
+
+
+@lru_cache(maxsize=None)
+def get_raise_precision_dtype(dtype):
+    """
+    Function Description:
+        Return the dtype the cpu benchmark runs a dtype in, or None if its precision is not raised
+    """
+    raise_dtype = Const.RAISE_PRECISION.get(str(dtype))
+    return get_torch_dtype(raise_dtype) if raise_dtype else None
+
+
+def generate_cpu_params(input_args, input_kwargs, need_backward):
+    first_dtype = None
+    def recursive_arg_to_cpu(arg_in):
+        nonlocal first_dtype
+        if isinstance(arg_in, (list, tuple)):
+            return type(arg_in)(recursive_arg_to_cpu(arg) for arg in arg_in)
+        elif isinstance(arg_in, torch.Tensor):
+            raise_dtype = get_raise_precision_dtype(arg_in.dtype)
+            if need_backward and arg_in.requires_grad:
+                if raise_dtype is not None and arg_in.dtype != first_dtype:
+                    arg_in = arg_in.clone().type(raise_dtype).detach().requires_grad_()
+                    if first_dtype is None:
+                        first_dtype = arg_in.dtype
+                else:
+                    arg_in = arg_in.clone().detach().requires_grad_()
+                temp_arg_in = arg_in * 1
+                arg_in = temp_arg_in.type_as(arg_in)
+                arg_in.retain_grad()
+                return arg_in
+            else:
+                if raise_dtype is not None and arg_in.dtype != first_dtype:
+                    arg_in = arg_in.clone().type(raise_dtype).detach()
+                    if first_dtype is None:
+                        first_dtype = arg_in.dtype
+                    return arg_in
+                return arg_in.clone().detach()
+        else:
+            return arg_in
+
+    cpu_args = recursive_arg_to_cpu(input_args)
+    cpu_kwargs = {key: recursive_arg_to_cpu(value) for key, value in input_kwargs.items()}
+    return cpu_args, cpu_kwargs
+
+
+def get_api_info(api_info_dict, api_name, api_full_name=None):
+    convert_type, api_info_dict = api_info_preprocess(api_name, api_info_dict)
+    need_grad = True
+    if api_info_dict.get("kwargs") and "out" in api_info_dict.get("kwargs"):
+        need_grad = False
+    args, kwargs = gen_api_params(api_info_dict, need_grad, convert_type, api_full_name)
+    return args, kwargs, need_grad
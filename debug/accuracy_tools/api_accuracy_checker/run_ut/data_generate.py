@@ -16,19 +16,45 @@
 """
 
 import os
+from functools import lru_cache
 import torch
 import numpy as np
 
 from api_accuracy_checker.common.utils import Const, check_file_or_directory_path, check_object_type, print_warn_log, print_error_log, \
     CompareException
+from api_accuracy_checker.run_ut.input_cache import InputCache
 
 TORCH_TYPE = ["torch.device", "torch.dtype"]
 TENSOR_DATA_LIST = ["torch.Tensor", "torch.nn.parameter.Parameter"]
 FLOAT_TYPE = ['torch.float32', 'torch.float', 'torch.float64', 'torch.double', 'torch.float16',
               'torch.half', 'torch.bfloat16']
+input_cache = None
 
 
-def gen_data(info, need_grad, convert_type):
+def set_input_cache(cache_path, seed=1234):
+    """
+    Function Description:
+        Reuse the generated input tensors saved under cache_path, generate and save them when missing.
+        An empty cache_path disables the cache.
+    """
+    global input_cache
+    input_cache = InputCache(cache_path, seed) if cache_path else None
+
+
+@lru_cache(maxsize=None)
+def get_torch_dtype(dtype_str):
+    """
+    Function Description:
+        Resolve a dtype name such as 'torch.float16' to the torch dtype without eval
+    """
+    dtype = getattr(torch, dtype_str.split('.')[-1], None) if dtype_str.startswith('torch.') else None
+    if not isinstance(dtype, torch.dtype):
+        print_error_log(f"Dtype is not supported: {dtype_str}")
+        raise CompareException(CompareException.INVALID_PARAM_ERROR)
+    return dtype
+
+
+def gen_data(info, need_grad, convert_type, arg_name=None):
     """
     Function Description:
         Based on arg basic information, generate arg data
@@ -36,6 +62,7 @@ def gen_data(info, need_grad, convert_type):
         info: arg basic information. Dict
         need_grad: set Tensor grad for backward
         convert_type: convert ori_type to dist_type flag.
+        arg_name: api full name and position of the arg, part of the input cache key.
     """
     check_object_type(info, dict)
     data_type = info.get('type')
@@ -44,7 +71,7 @@ def gen_data(info, need_grad, convert_type):
         if data_path:
             data = gen_real_tensor(data_path, convert_type)
         else:
-            data = gen_random_tensor(info, convert_type)
+            data = gen_random_tensor(info, convert_type, arg_name)
         if info.get('requires_grad') and need_grad:
             data.requires_grad_(True)
             temp_data = data * 1
@@ -70,6 +97,14 @@ def gen_real_tensor(data_path, convert_type):
     if not data_path.endswith('.pt') and not data_path.endswith('.npy'):
         print_error_log(f"The file: {data_path} is not a pt or numpy file.")
         raise CompareException.INVALID_FILE_ERROR
+    if input_cache:
+        file_stat = os.stat(data_path)
+        key = input_cache.get_key("real", data_path, file_stat.st_size, file_stat.st_mtime_ns, convert_type)
+        return input_cache.get(key, lambda: load_real_tensor(data_path, convert_type))
+    return load_real_tensor(data_path, convert_type)
+
+
+def load_real_tensor(data_path, convert_type):
     if data_path.endswith('.pt'):
         data = torch.load(data_path)
     else:
@@ -79,17 +114,18 @@ def gen_real_tensor(data_path, convert_type):
         ori_dtype = Const.CONVERT.get(convert_type)[0]
         dist_dtype = Const.CONVERT.get(convert_type)[1]
         if str(data.dtype) == ori_dtype:
-            data = data.type(eval(dist_dtype))
+            data = data.type(get_torch_dtype(dist_dtype))
     return data
 
 
-def gen_random_tensor(info, convert_type):
+def gen_random_tensor(info, convert_type, arg_name=None):
     """
     Function Description:
         Based on API MAX and MIN, generate input parameters random data
     Parameter:
         info: API data info
         convert_type: convert ori_type to dist_type flag.
+        arg_name: api full name and position of the arg, so that args with the same info get different data.
     """
     check_object_type(info, dict)
     low, high = info.get('Min'), info.get('Max')
@@ -98,6 +134,13 @@ def gen_random_tensor(info, convert_type):
     if not isinstance(low, (int, float)) or not isinstance(high, (int, float)):
         print_error_log(f'Data info Min: {low} , Max: {high}, info type must be int or float')
         raise CompareException.INVALID_PARAM_ERROR
+    if input_cache:
+        key = input_cache.get_key("random", arg_name, low, high, shape, data_dtype, convert_type)
+        return input_cache.get(key, lambda: gen_random_tensor_data(low, high, shape, data_dtype, convert_type))
+    return gen_random_tensor_data(low, high, shape, data_dtype, convert_type)
+
+
+def gen_random_tensor_data(low, high, shape, data_dtype, convert_type):
     if data_dtype == "torch.bool":
         data = gen_bool_tensor(low, high, shape)
     else:
@@ -122,14 +165,14 @@ def gen_common_tensor(low, high, shape, data_dtype, convert_type):
             data_dtype = Const.CONVERT.get(convert_type)[1]
     if data_dtype in FLOAT_TYPE:
         scale = high - low
-        rand01 = torch.rand(shape, dtype=eval(data_dtype))
+        rand01 = torch.rand(shape, dtype=get_torch_dtype(data_dtype))
         tensor = rand01 * scale + low
         tmp_tensor = tensor.reshape(-1)
         tmp_tensor[0] = low
         tmp_tensor[-1] = high
     elif 'int' in data_dtype or 'long' in data_dtype:
         low, high = int(low), int(high)
-        tensor = torch.randint(low, high + 1, shape, dtype=eval(data_dtype))
+        tensor = torch.randint(low, high + 1, shape, dtype=get_torch_dtype(data_dtype))
     else:
         print_error_log('Dtype is not supported: ' + data_dtype)
         raise NotImplementedError()
@@ -155,7 +198,7 @@ def gen_bool_tensor(low, high, shape):
     return data
 
 
-def gen_args(args_info, need_grad=True, convert_type=None):
+def gen_args(args_info, need_grad=True, convert_type=None, arg_name=None):
     """
     Function Description:
         Based on API basic information, generate input parameters: args, for API forward running
@@ -163,14 +206,16 @@ def gen_args(args_info, need_grad=True, convert_type=None):
         api_info: API basic information. List
         need_grad: set Tensor grad for backward
         convert_type: convert ori_type to dist_type flag.
+        arg_name: api full name and position of the args.
     """
     check_object_type(args_info, list)
     args_result = []
-    for arg in args_info:
+    for index, arg in enumerate(args_info):
+        item_name = f"{arg_name}.{index}" if arg_name else None
         if isinstance(arg, (list, tuple)):
-            data = gen_args(arg, need_grad, convert_type)
+            data = gen_args(arg, need_grad, convert_type, item_name)
         elif isinstance(arg, dict):
-            data = gen_data(arg, need_grad, convert_type)
+            data = gen_data(arg, need_grad, convert_type, item_name)
         else:
             print_warn_log(f'Warning: {arg} is not supported')
             raise NotImplementedError()
@@ -178,21 +223,23 @@ def gen_args(args_info, need_grad=True, convert_type=None):
     return args_result
 
 
-def gen_kwargs(api_info, convert_type=None):
+def gen_kwargs(api_info, convert_type=None, arg_name=None):
     """
     Function Description:
         Based on API basic information, generate input parameters: kwargs, for API forward running
     Parameter:
         api_info: API basic information. Dict
         convert_type: convert ori_type to dist_type flag.
+        arg_name: api full name and position of the kwargs.
     """
     check_object_type(api_info, dict)
     kwargs_params = api_info.get("kwargs")
     for key, value in kwargs_params.items():
+        item_name = f"{arg_name}.{key}" if arg_name else None
         if isinstance(value, (list, tuple)):
-            kwargs_params[key] = gen_list_kwargs(value, convert_type)
+            kwargs_params[key] = gen_list_kwargs(value, convert_type, item_name)
         elif value.get('type') in TENSOR_DATA_LIST:
-            kwargs_params[key] = gen_data(value, False, convert_type)
+            kwargs_params[key] = gen_data(value, False, convert_type, item_name)
         elif value.get('type') in TORCH_TYPE:
             gen_torch_kwargs(kwargs_params, key, value)
         else:
@@ -207,25 +254,26 @@ def gen_torch_kwargs(kwargs_params, key, value):
         kwargs_params[key] = eval(value.get('value'))
 
 
-def gen_list_kwargs(kwargs_item_value, convert_type):
+def gen_list_kwargs(kwargs_item_value, convert_type, arg_name=None):
     """
     Function Description:
         When kwargs value is list, generate the list of kwargs result
     Parameter:
         kwargs_item_value: kwargs value before to generate. List
         convert_type: convert ori_type to dist_type flag.
+        arg_name: api full name and position of the kwargs value.
     """
     kwargs_item_result = []
-    for item in kwargs_item_value:
+    for index, item in enumerate(kwargs_item_value):
         if item.get('type') in TENSOR_DATA_LIST:
-            item_value = gen_data(item, False, convert_type)
+            item_value = gen_data(item, False, convert_type, f"{arg_name}.{index}" if arg_name else None)
         else:
             item_value = item.get('value')
         kwargs_item_result.append(item_value)
     return kwargs_item_result
 
 
-def gen_api_params(api_info, need_grad=True, convert_type=None):
+def gen_api_params(api_info, need_grad=True, convert_type=None, api_full_name=None):
     """
     Function Description:
         Based on API basic information, generate input parameters: args, kwargs, for API forward running
@@ -233,14 +281,16 @@ def gen_api_params(api_info, need_grad=True, convert_type=None):
         api_info: API basic information. Dict
         need_grad: set grad for backward
         convert_type: convert ori_type to dist_type flag.
+        api_full_name: name of the api call, keeps the cached inputs of different args and apis apart.
     """
     check_object_type(api_info, dict)
     if convert_type and convert_type not in Const.CONVERT:
         print_error_log(f"convert_type params not support {convert_type} ")
         raise CompareException.INVALID_PARAM_ERROR
-    kwargs_params = gen_kwargs(api_info, convert_type)
+    kwargs_params = gen_kwargs(api_info, convert_type, f"{api_full_name}.kwargs" if api_full_name else None)
     if api_info.get("args"):
-        args_params = gen_args(api_info.get("args"), need_grad, convert_type)
+        args_params = gen_args(api_info.get("args"), need_grad, convert_type,
+                               f"{api_full_name}.args" if api_full_name else None)
     else:
         print_warn_log(f'Warning: No args in {api_info} ')
         args_params = []
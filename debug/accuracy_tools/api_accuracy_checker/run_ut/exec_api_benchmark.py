@@ -0,0 +1,98 @@
+import argparse
+import csv
+import os
+import statistics
+import sys
+import time
+
+from api_accuracy_checker.common.utils import print_info_log, print_error_log
+from api_accuracy_checker.common.api_info_reader import ApiInfoReader
+from api_accuracy_checker.run_ut.api_executor import generate_cpu_params, get_api_callable, get_api_info
+from ptdbg_ascend.src.python.ptdbg_ascend.common.file_check_util import FileOpen, FileCheckConst, FileChecker, \
+    change_mode, check_file_suffix
+
+PHASES = ["load", "generate", "to_cpu", "dispatch", "op"]
+HARNESS_PHASES = ["load", "generate", "to_cpu", "dispatch"]
+BENCHMARK_HEADER = ["API name"] + [phase + " (ms)" for phase in PHASES] + ["harness (ms)", "harness ratio"]
+
+
+def benchmark_api(api_full_name, forward_content, repeat):
+    """
+    Function Description:
+        Run the forward of an api on cpu the way run_ut does and return the median time in ms of every phase:
+        reading the api info, generating the inputs, copying them to the cpu benchmark dtype, resolving the op
+        and executing it.
+    """
+    api_type, api_name, _ = api_full_name.split("*")
+    timings = {phase: [] for phase in PHASES}
+    for _ in range(repeat):
+        start = time.perf_counter()
+        api_info_dict = forward_content[api_full_name]
+        load_end = time.perf_counter()
+        args, kwargs, _ = get_api_info(api_info_dict, api_name, api_full_name)
+        generate_end = time.perf_counter()
+        cpu_args, cpu_kwargs = generate_cpu_params(args, kwargs, False)
+        to_cpu_end = time.perf_counter()
+        api_callable = get_api_callable(api_type, api_name)
+        dispatch_end = time.perf_counter()
+        api_callable(*cpu_args, **cpu_kwargs)
+        op_end = time.perf_counter()
+        for phase, phase_start, phase_end in zip(PHASES, [start, load_end, generate_end, to_cpu_end, dispatch_end],
+                                                 [load_end, generate_end, to_cpu_end, dispatch_end, op_end]):
+            timings[phase].append((phase_end - phase_start) * 1000)
+    return {phase: statistics.median(values) for phase, values in timings.items()}
+
+
+def run_benchmark(forward_file, result_file, repeat):
+    forward_content = ApiInfoReader(forward_file)
+    rows = []
+    total = {phase: 0 for phase in PHASES}
+    for api_full_name in forward_content.keys():
+        try:
+            result = benchmark_api(api_full_name, forward_content, repeat)
+        except Exception as err:
+            print_error_log(f"Benchmark {api_full_name} failed: {err}")
+            continue
+        harness = sum(result[phase] for phase in HARNESS_PHASES)
+        ratio = harness / result["op"] if result["op"] else float("inf")
+        rows.append([api_full_name] + [f"{result[phase]:.4f}" for phase in PHASES] + [f"{harness:.4f}", f"{ratio:.4f}"])
+        for phase in PHASES:
+            total[phase] += result[phase]
+    with FileOpen(result_file, 'w') as f:
+        writer = csv.writer(f)
+        writer.writerow(BENCHMARK_HEADER)
+        writer.writerows(rows)
+    change_mode(result_file, FileCheckConst.DATA_FILE_AUTHORITY)
+    total_harness = sum(total[phase] for phase in HARNESS_PHASES)
+    print_info_log(f"Benchmark {len(rows)} apis, harness {total_harness:.2f} ms, op {total['op']:.2f} ms, "
+                   + ", ".join(f"{phase} {total[phase]:.2f} ms" for phase in HARNESS_PHASES))
+    print_info_log(f"The benchmark result is saved in {result_file}.")
+    return total
+
+
+def _benchmark_parser(parser):
+    parser.add_argument("-forward", "--forward_input_file", dest="forward_input_file", type=str, required=True,
+                        help="<Required> The api param tool forward result file.")
+    parser.add_argument("-o", "--out_path", dest="out_path", default="", type=str, required=False,
+                        help="<optional> The path to save exec_api_benchmark.csv in.")
+    parser.add_argument("-r", "--repeat", dest="repeat", default=5, type=int, required=False,
+                        help="<optional> The number of runs of each api, the median time is reported.")
+
+
+def _benchmark():
+    parser = argparse.ArgumentParser()
+    _benchmark_parser(parser)
+    args = parser.parse_args(sys.argv[1:])
+    if args.repeat < 1:
+        print_error_log("repeat must be greater than 0.")
+        raise ValueError("Invalid repeat.")
+    forward_file = os.path.realpath(args.forward_input_file)
+    check_file_suffix(forward_file, FileCheckConst.JSON_SUFFIX)
+    FileChecker(forward_file, FileCheckConst.FILE, ability=FileCheckConst.READ_ABLE).common_check()
+    out_path = os.path.realpath(args.out_path) if args.out_path else "./"
+    out_path = FileChecker(out_path, FileCheckConst.DIR, ability=FileCheckConst.WRITE_ABLE).common_check()
+    run_benchmark(forward_file, os.path.join(out_path, "exec_api_benchmark.csv"), args.repeat)
+
+
+if __name__ == '__main__':
+    _benchmark()
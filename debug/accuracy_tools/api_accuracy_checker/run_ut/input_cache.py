@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+# Copyright (C) 2023-2023. Huawei Technologies Co., Ltd. All rights reserved.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+
+import hashlib
+import json
+import os
+import torch
+import numpy as np
+
+from api_accuracy_checker.common.utils import print_warn_log
+from ptdbg_ascend.src.python.ptdbg_ascend.common.file_check_util import FileCheckConst, FileChecker
+
+
+class InputCache:
+    """
+    Content addressed cache of the tensors generated by run_ut. The key is built from the api info of
+    a tensor (shape, dtype, range or real data file) and the seed, random tensors are generated with
+    a generator seeded from the key, so a cached tensor equals a regenerated one. Tensors are stored
+    as npy files and memory mapped copy-on-write when reused.
+    """
+    VERSION = 1
+    BF16_SUFFIX = ".bf16.npy"
+    NPY_SUFFIX = ".npy"
+
+    def __init__(self, cache_path, seed=1234):
+        os.makedirs(cache_path, mode=FileCheckConst.DATA_DIR_AUTHORITY, exist_ok=True)
+        cache_path_checker = FileChecker(cache_path, FileCheckConst.DIR, ability=FileCheckConst.WRITE_ABLE)
+        self.cache_path = cache_path_checker.common_check()
+        self.seed = seed
+        self.hit_count = 0
+        self.miss_count = 0
+
+    def get_key(self, *key_items):
+        key = json.dumps([self.VERSION, self.seed] + list(key_items), default=str)
+        return hashlib.sha256(key.encode()).hexdigest()
+
+    def get(self, key, generate_func):
+        """Return the tensor cached under key, or generate it with a seeded generator and cache it."""
+        data = self._load(key)
+        if data is not None:
+            self.hit_count += 1
+            return data
+        self.miss_count += 1
+        with torch.random.fork_rng(devices=[]):
+            torch.manual_seed(int(key[:15], 16))
+            data = generate_func()
+        self._save(key, data)
+        return data
+
+    def _get_file_path(self, key, suffix):
+        return os.path.join(self.cache_path, key[:2], key + suffix)
+
+    def _load(self, key):
+        for suffix in (self.NPY_SUFFIX, self.BF16_SUFFIX):
+            file_path = self._get_file_path(key, suffix)
+            if not os.path.isfile(file_path):
+                continue
+            try:
+                data = np.load(file_path, mmap_mode='c')
+            except ValueError:
+                # empty arrays can not be memory mapped
+                data = np.load(file_path)
+            data = torch.from_numpy(data)
+            return data.view(torch.bfloat16) if suffix == self.BF16_SUFFIX else data
+        return None
+
+    def _save(self, key, data):
+        if not isinstance(data, torch.Tensor):
+            return
+        if data.dtype == torch.bfloat16:
+            # numpy has no bfloat16, keep the raw bits
+            suffix, data_np = self.BF16_SUFFIX, data.detach().contiguous().view(torch.int16).numpy()
+        else:
+            suffix = self.NPY_SUFFIX
+            try:
+                data_np = data.detach().numpy()
+            except TypeError as err:
+                print_warn_log(f"Input cache does not support {data.dtype}: {err}")
+                return
+        file_path = self._get_file_path(key, suffix)
+        os.makedirs(os.path.dirname(file_path), mode=FileCheckConst.DATA_DIR_AUTHORITY, exist_ok=True)
+        # write to a process private file first, concurrent run_ut shards may generate the same tensor
+        tmp_path = f"{file_path}.{os.getpid()}.tmp"
+        with os.fdopen(os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, FileCheckConst.DATA_FILE_AUTHORITY),
+                       "wb") as f:
+            np.save(f, data_np)
+        os.replace(tmp_path, file_path)
@@ -1,15 +1,22 @@
 import argparse
+import concurrent.futures
+import csv
+import multiprocessing
 import os
 import sys
 import torch_npu
 import torch
+from concurrent.futures.process import BrokenProcessPool
 from tqdm import tqdm
 from api_accuracy_checker.run_ut.run_ut import exec_api, generate_npu_params, run_backward, init_environment, \
-    get_api_info
+    get_api_info, set_npu_device
+from api_accuracy_checker.run_ut.data_generate import set_input_cache
 from api_accuracy_checker.common.utils import print_info_log, print_warn_log, get_json_contents, api_info_preprocess, \
     print_error_log
+from api_accuracy_checker.common.api_info_reader import ApiInfoReader
 
-from ptdbg_ascend.src.python.ptdbg_ascend.common.file_check_util import FileCheckConst, check_file_suffix
+from ptdbg_ascend.src.python.ptdbg_ascend.common.file_check_util import FileOpen, FileCheckConst, FileChecker, \
+    change_mode, check_file_suffix
 
 
 init_environment()
@@ -50,33 +57,144 @@ def check_data_overflow(x):
         return check_tensor_overflow(x)
 
 
-def run_overflow_check(forward_file, backward_file):
+OVERFLOW_RESULT_FILE_NAME = "overflow_check_result.csv"
+OVERFLOW_RESULT_HEADER = ["API name", "CPU overflow", "NPU overflow", "Overflow type", "Message"]
+NORMAL_OVERFLOW = "normal"
+ABNORMAL_OVERFLOW = "abnormal"
+CHECK_ERROR = "error"
+
+# torch_npu can not be re-initialized in a forked process
+WORKER_START_METHOD = "spawn"
+IDLE_WORKER = -1
+
+# api infos and state of a worker process, loaded once and shared by all the apis the worker checks
+worker_content = {}
+
+
+def load_worker_content(forward_file, backward_file):
+    worker_content["forward"] = ApiInfoReader(forward_file)
+    worker_content["backward"] = ApiInfoReader(backward_file) if backward_file else {}
+    worker_content["api_setting"] = get_json_contents("torch_ut_setting.json")
+
+
+def init_overflow_worker(worker_counter, running_apis, device_ids, jit_compile, forward_file, backward_file,
+                         input_cache_path):
+    # every worker takes the next index and the device of that index, without waiting on the other workers
+    with worker_counter.get_lock():
+        worker_index = worker_counter.value
+        worker_counter.value += 1
+    worker_content["worker_index"] = worker_index % len(running_apis)
+    worker_content["running_apis"] = running_apis
+    set_npu_device(device_ids[worker_index % len(device_ids)], jit_compile)
+    set_input_cache(input_cache_path)
+    load_worker_content(forward_file, backward_file)
+
+
+def check_api_overflow(api_full_name, api_index=IDLE_WORKER):
+    """Replay an api in a worker and return its row of the overflow check result."""
+    running_apis = worker_content.get("running_apis")
+    if running_apis is None:
+        return _check_api_overflow(api_full_name)
+    # left set when the worker dies, so the main process can report the api that killed it
+    running_apis[worker_content["worker_index"]] = api_index
+    row = _check_api_overflow(api_full_name)
+    running_apis[worker_content["worker_index"]] = IDLE_WORKER
+    return row
+
+
+def _check_api_overflow(api_full_name):
+    try:
+        checked_api_name, cpu_overflow, npu_overflow = run_torch_api(
+            api_full_name, worker_content["api_setting"], worker_content["backward"],
+            worker_content["forward"][api_full_name])
+    except Exception as err:
+        api_name = api_full_name.split("_", 1)[1].rsplit("_", 2)[0]
+        if "not implemented for 'Half'" in str(err):
+            print_warn_log(f"API {api_name} not support half tensor in CPU, please add {api_name} to CONVERT_API "
+                           f"'fp16_to_fp32' list in accuracy_tools/api_accuracy_check/common/utils.py file.")
+        elif "expected scalar type Long" in str(err):
+            print_warn_log(f"API {api_name} not support int32 tensor in CPU, please add {api_name} to CONVERT_API "
+                           f"'int32_to_int64' list in accuracy_tools/api_accuracy_check/common/utils.py file.")
+        else:
+            print_error_log(f"Run {api_full_name} UT Error: %s" % str(err))
+        return [api_full_name, "", "", CHECK_ERROR, str(err)]
+    if cpu_overflow == npu_overflow:
+        overflow_type = NORMAL_OVERFLOW
+        print_warn_log("The %s overflow is a normal overflow." % checked_api_name)
+    else:
+        overflow_type = ABNORMAL_OVERFLOW
+        print_warn_log("The %s overflow is an abnormal overflow." % checked_api_name)
+    return [checked_api_name, str(cpu_overflow), str(npu_overflow), overflow_type, ""]
+
+
+def run_overflow_check(forward_file, backward_file, out_path, num_workers=1, device_ids=(0,), jit_compile=False,
+                       early_exit=False, input_cache_path=""):
+    """
+    Replay the apis of forward_file and write one result row per api into out_path in dump order. With
+    several workers the apis are replayed in spawned processes spread over device_ids, results are still
+    consumed in dump order, so with early_exit the check stops at the first abnormal overflow once every
+    api dumped before it has been checked. When a worker process dies, the apis being replayed at that
+    time are reported as errors and the check stops with the rows of the apis checked before them.
+    """
     print_info_log("start UT test")
-    forward_content = get_json_contents(forward_file)
-    backward_content = {}
-    if backward_file:
-        backward_content = get_json_contents(backward_file)
-    api_setting_dict = get_json_contents("torch_ut_setting.json")
-    for api_full_name, api_info_dict in tqdm(forward_content.items()):
-        try:
-            run_torch_api(api_full_name, api_setting_dict, backward_content, api_info_dict)
-        except Exception as err:
-            api_name = api_full_name.split("_", 1)[1].rsplit("_", 2)[0]
-            if "not implemented for 'Half'" in str(err):
-                print_warn_log(f"API {api_name} not support half tensor in CPU, please add {api_name} to CONVERT_API "
-                               f"'fp16_to_fp32' list in accuracy_tools/api_accuracy_check/common/utils.py file.")
-            elif "expected scalar type Long" in str(err):
-                print_warn_log(f"API {api_name} not support int32 tensor in CPU, please add {api_name} to CONVERT_API "
-                               f"'int32_to_int64' list in accuracy_tools/api_accuracy_check/common/utils.py file.")
-            else:
-                print_error_log(f"Run {api_full_name} UT Error: %s" % str(err))
+    result_path = os.path.join(out_path, OVERFLOW_RESULT_FILE_NAME)
+    if os.path.exists(result_path):
+        raise ValueError(f"file {result_path} already exists, please remove it first or use a new out path")
+    api_names = ApiInfoReader(forward_file).keys()
+    rows = []
+    executor, futures = None, []
+    if num_workers > 1:
+        context = multiprocessing.get_context(WORKER_START_METHOD)
+        running_apis = context.Array('i', [IDLE_WORKER] * num_workers)
+        # a dead worker breaks the executor and fails the pending futures instead of hanging the check
+        executor = concurrent.futures.ProcessPoolExecutor(
+            num_workers, mp_context=context, initializer=init_overflow_worker,
+            initargs=(context.Value('i', 0), running_apis, device_ids, jit_compile, forward_file, backward_file,
+                      input_cache_path))
+        futures = [executor.submit(check_api_overflow, api_full_name, api_index)
+                   for api_index, api_full_name in enumerate(api_names)]
+        results = (future.result() for future in futures)
+    else:
+        set_input_cache(input_cache_path)
+        load_worker_content(forward_file, backward_file)
+        results = map(check_api_overflow, api_names)
+    try:
+        for _ in tqdm(api_names):
+            try:
+                row = next(results)
+            except BrokenProcessPool as err:
+                failed_apis = sorted(api_index for api_index in running_apis if api_index != IDLE_WORKER) or \
+                    [len(rows)]
+                failed_api_names = [api_names[api_index] for api_index in failed_apis]
+                print_error_log(f"A worker process died while {', '.join(failed_api_names)} were being replayed: "
+                                f"{err} Skip the remaining {len(api_names) - len(rows) - len(failed_apis)} apis.")
+                rows.extend([api_name, "", "", CHECK_ERROR, "worker process died"] for api_name in failed_api_names)
+                break
+            rows.append(row)
+            if early_exit and row[3] == ABNORMAL_OVERFLOW:
+                print_info_log(f"The first abnormal overflow in dump order is {row[0]}, "
+                               f"skip the remaining {len(api_names) - len(rows)} apis.")
+                break
+    finally:
+        for future in futures:
+            future.cancel()
+        if executor is not None:
+            executor.shutdown()
+    with FileOpen(result_path, 'w') as f:
+        writer = csv.writer(f)
+        writer.writerow(OVERFLOW_RESULT_HEADER)
+        writer.writerows(rows)
+    change_mode(result_path, FileCheckConst.DATA_FILE_AUTHORITY)
+    abnormal_num = sum(row[3] == ABNORMAL_OVERFLOW for row in rows)
+    print_info_log(f"Checked {len(rows)} apis, {abnormal_num} abnormal overflow, the result is saved in {result_path}.")
+    return rows
 
 
 def run_torch_api(api_full_name, api_setting_dict, backward_content, api_info_dict):
     torch.npu.clear_npu_overflow_flag()
     api_type = api_full_name.split("_")[0]
     api_name = api_full_name.split("_", 1)[1].rsplit("_", 2)[0]
-    args, kwargs, need_grad = get_api_info(api_info_dict, api_name)
+    args, kwargs, need_grad = get_api_info(api_info_dict, api_name, api_full_name)
     need_backward = api_full_name.replace("forward", "backward") in backward_content
     need_backward = need_backward and need_grad
     if not need_grad:
@@ -89,11 +207,7 @@ def run_torch_api(api_full_name, api_setting_dict, backward_content, api_info_di
     if not need_backward:
         cpu_overflow = check_data_overflow(out)
         npu_overflow = torch_npu.npu.utils.npu_check_overflow(npu_out)
-        if cpu_overflow == npu_overflow:
-            print_warn_log("The %s overflow is a normal overflow." % api_full_name)
-        else:
-            print_warn_log("The %s overflow is an abnormal overflow." % api_full_name)
-        return
+        return api_full_name, cpu_overflow, npu_overflow
     else:
         api_full_name = api_full_name.replace("forward", "backward")
         grad_input_index = api_setting_dict.get(api_name)
@@ -101,15 +215,12 @@ def run_torch_api(api_full_name, api_setting_dict, backward_content, api_info_di
         if grad_input_index is not None:
             grad_index = grad_input_index.get('grad_index')
 
-        grad_out, npu_grad_out = run_backward(api_full_name, args, backward_content, grad_index, npu_args, npu_out, out)
+        grad_out, npu_grad_out, _, _ = run_backward(api_full_name, args, backward_content, grad_index, npu_args,
+                                                    npu_out, out)
 
         cpu_overflow = check_data_overflow(grad_out)
         npu_overflow = torch_npu.npu.utils.npu_check_overflow(npu_grad_out)
-        if cpu_overflow == npu_overflow:
-            print_warn_log("The %s overflow is a normal overflow." % api_full_name)
-        else:
-            print_warn_log("The %s overflow is an abnormal overflow." % api_full_name)
-        return
+        return api_full_name, cpu_overflow, npu_overflow
 
 
 def _run_ut_parser(parser):
@@ -121,30 +232,41 @@ def _run_ut_parser(parser):
                         help="<Required> The api param tool backward result file: generate from api param tool, "
                              "a json file.",
                         required=False)
+    parser.add_argument("-o", "--out_path", dest="out_path", default="", type=str,
+                        help="<optional> The overflow check result out path.", required=False)
     parser.add_argument("-j", "--jit_compile", dest="jit_compile", help="<optional> whether to turn on jit compile",
                         default=False, required=False)
-    parser.add_argument("-d", "--device", dest="device_id", type=int, help="<optional> set NPU device id to run ut",
-                        default=0, required=False)
+    parser.add_argument("-d", "--device", dest="device_id", type=int, nargs="+",
+                        help="<optional> set NPU device ids to run ut, workers are assigned to them in turn",
+                        default=[0], required=False)
+    parser.add_argument("-n", "--num_workers", dest="num_workers", type=int, default=1,
+                        help="<optional> replay the apis in this many worker processes", required=False)
+    parser.add_argument("-e", "--early_exit", dest="early_exit", action="store_true",
+                        help="<optional> stop at the first abnormal overflow api in dump order", required=False)
+    parser.add_argument("-cache", "--input_cache_path", dest="input_cache_path", default="", type=str,
+                        help="<optional> reuse the generated input tensors saved in this path across workers "
+                             "and runs", required=False)
 
 
 def _run_overflow_check():
     parser = argparse.ArgumentParser()
     _run_ut_parser(parser)
     args = parser.parse_args(sys.argv[1:])
-    torch.npu.set_compile_mode(jit_compile=args.jit_compile)
-    npu_device = "npu:" + str(args.device_id)
+    if args.num_workers < 1:
+        print_error_log("num_workers must be greater than 0.")
+        raise ValueError("Invalid num_workers.")
     forward_file = os.path.realpath(args.forward_input_file)
     backward_file = ""
     if args.backward_input_file:
         backward_file = os.path.realpath(args.backward_input_file)
         check_file_suffix(backward_file, FileCheckConst.JSON_SUFFIX)
     check_file_suffix(forward_file, FileCheckConst.JSON_SUFFIX)
-    try:
-        torch.npu.set_device(npu_device)
-    except Exception:
-        print_error_log(f"Set NPU device id failed. device id is: {args.device_id}")
-        raise NotImplementedError
-    run_overflow_check(forward_file, backward_file)
+    out_path = os.path.realpath(args.out_path) if args.out_path else "./"
+    out_path = FileChecker(out_path, FileCheckConst.DIR, ability=FileCheckConst.WRITE_ABLE).common_check()
+    if args.num_workers == 1:
+        set_npu_device(args.device_id[0], args.jit_compile)
+    run_overflow_check(forward_file, backward_file, out_path, args.num_workers, args.device_id, args.jit_compile,
+                       args.early_exit, args.input_cache_path)
 
 
 if __name__ == '__main__':
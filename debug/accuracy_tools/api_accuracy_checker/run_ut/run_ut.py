@@ -1,18 +1,19 @@
 import argparse
 import os
 import copy
+import shutil
 import sys
+import multiprocessing
 import torch_npu
 import yaml
 import torch
 from tqdm import tqdm
-from api_accuracy_checker.run_ut.data_generate import gen_api_params, gen_args
+from api_accuracy_checker.run_ut.data_generate import gen_args, set_input_cache
 from api_accuracy_checker.common.utils import print_info_log, print_warn_log, get_json_contents, api_info_preprocess, \
     print_error_log, check_file_or_directory_path, initialize_save_path, Const
+from api_accuracy_checker.common.api_info_reader import ApiInfoReader
 from api_accuracy_checker.compare.compare import Comparator
-from api_accuracy_checker.hook_module.wrap_tensor import TensorOPTemplate
-from api_accuracy_checker.hook_module.wrap_functional import FunctionalOPTemplate
-from api_accuracy_checker.hook_module.wrap_torch import TorchOPTemplate
+from api_accuracy_checker.run_ut.api_executor import exec_api, generate_cpu_params, get_api_info
 from ut_api_info import UtAPIInfo
 from api_accuracy_checker.common.config import msCheckerConfig
 
@@ -20,6 +21,8 @@ from ptdbg_ascend.src.python.ptdbg_ascend.common.file_check_util import FileOpen
     change_mode, check_file_suffix
 
 
+SHARD_DIR_PREFIX = "run_ut_shard_"
+
 
 def init_environment():
     cur_path = os.path.dirname(os.path.realpath(__file__))
@@ -34,19 +37,6 @@ def init_environment():
 init_environment()
 
 
-def exec_api(api_type, api_name, args, kwargs):
-    if api_type == "Functional":
-        functional_api = FunctionalOPTemplate(api_name, str, False)
-        out = functional_api.forward(*args, **kwargs)
-    if api_type == "Tensor":
-        tensor_api = TensorOPTemplate(api_name, str, False)
-        out = tensor_api.forward(*args, **kwargs)
-    if api_type == "Torch":
-        torch_api = TorchOPTemplate(api_name, str, False)
-        out = torch_api.forward(*args, **kwargs)
-    return out
-
-
 def generate_npu_params(input_args, input_kwargs, need_backward):
     def recursive_arg_to_npu(arg_in):
         if isinstance(arg_in, (list, tuple)):
@@ -67,45 +57,26 @@ def generate_npu_params(input_args, input_kwargs, need_backward):
     npu_kwargs = {key: recursive_arg_to_npu(value) for key, value in input_kwargs.items()}
     return npu_args, npu_kwargs
 
-def generate_cpu_params(input_args, input_kwargs, need_backward):
-    first_dtype = None
-    def recursive_arg_to_cpu(arg_in):
-        nonlocal first_dtype
-        if isinstance(arg_in, (list, tuple)):
-            return type(arg_in)(recursive_arg_to_cpu(arg) for arg in arg_in)
-        elif isinstance(arg_in, torch.Tensor):
-            if need_backward and arg_in.requires_grad:
-                if str(arg_in.dtype) in Const.RAISE_PRECISION.keys() and arg_in.dtype != first_dtype:
-                    arg_in = arg_in.clone().type(eval(Const.RAISE_PRECISION[str(arg_in.dtype)])).detach().requires_grad_()
-                    if first_dtype is None:
-                        first_dtype = arg_in.dtype
-                else:
-                    arg_in = arg_in.clone().detach().requires_grad_()
-                temp_arg_in = arg_in * 1
-                arg_in = temp_arg_in.type_as(arg_in)
-                arg_in.retain_grad()
-                return arg_in
-            else:
-                if str(arg_in.dtype) in Const.RAISE_PRECISION.keys() and arg_in.dtype != first_dtype:
-                    arg_in = arg_in.clone().type(eval(Const.RAISE_PRECISION[str(arg_in.dtype)])).detach()
-                    if first_dtype is None:
-                        first_dtype = arg_in.dtype
-                    return arg_in
-                return arg_in.clone().detach()
-        else:
-            return arg_in
 
-    cpu_args = recursive_arg_to_cpu(input_args)
-    cpu_kwargs = {key: recursive_arg_to_cpu(value) for key, value in input_kwargs.items()}
-    return cpu_args, cpu_kwargs
+def get_shard_api_names(api_names, shard_id, num_shards):
+    # contiguous slices keep the merged result csv in the same order as a single process run
+    shard_size, remainder = divmod(len(api_names), num_shards)
+    start = shard_id * shard_size + min(shard_id, remainder)
+    end = start + shard_size + (1 if shard_id < remainder else 0)
+    return api_names[start:end]
+
 
-def run_ut(forward_file, backward_file, out_path, save_error_data):
+def run_ut(forward_file, backward_file, out_path, save_error_data, shard_id=0, num_shards=1, is_continue_run_ut=False):
     print_info_log("start UT test")
-    forward_content = get_json_contents(forward_file)
-    backward_content = get_json_contents(backward_file)
+    forward_content = ApiInfoReader(forward_file)
+    backward_content = ApiInfoReader(backward_file)
     api_setting_dict = get_json_contents("torch_ut_setting.json")
-    compare = Comparator(out_path)
-    for api_full_name, api_info_dict in tqdm(forward_content.items()):
+    compare = Comparator(out_path, is_continue_run_ut=is_continue_run_ut)
+    api_names = [api_full_name
+                 for api_full_name in get_shard_api_names(forward_content.keys(), shard_id, num_shards)
+                 if not compare.is_api_completed(api_full_name)]
+    for api_full_name in tqdm(api_names, position=shard_id):
+        api_info_dict = forward_content[api_full_name]
         try:
             data_info = run_torch_api(api_full_name, api_setting_dict, backward_content, api_info_dict)
             is_fwd_success, is_bwd_success = compare.compare_output(api_full_name,
@@ -123,6 +94,73 @@ def run_ut(forward_file, backward_file, out_path, save_error_data):
             else:
                 print_error_log(f"Run {api_full_name} UT Error: %s" % str(err))
             compare.write_summary_csv((api_full_name, "SKIP", "SKIP", str(err)))
+            compare.record_progress(api_full_name, "SKIP", "SKIP")
+    compare.flush()
+    change_mode(compare.save_path, FileCheckConst.DATA_FILE_AUTHORITY)
+    change_mode(compare.detail_save_path, FileCheckConst.DATA_FILE_AUTHORITY)
+    if num_shards == 1:
+        compare.print_pretest_result()
+
+
+def run_ut_shard(shard_id, num_shards, device_id, num_threads, jit_compile, forward_file, backward_file, out_path,
+                 save_error_data, is_continue_run_ut, input_cache_path):
+    if num_threads:
+        torch.set_num_threads(num_threads)
+    set_input_cache(input_cache_path)
+    set_npu_device(device_id, jit_compile)
+    shard_path = os.path.join(out_path, SHARD_DIR_PREFIX + str(shard_id))
+    if not os.path.exists(shard_path):
+        os.mkdir(shard_path, mode=FileCheckConst.DATA_DIR_AUTHORITY)
+    run_ut(forward_file, backward_file, shard_path, save_error_data, shard_id, num_shards, is_continue_run_ut)
+
+
+def run_ut_sharded(forward_file, backward_file, out_path, save_error_data, args):
+    """
+    Split the forward api list into args.num_shards contiguous shards, run every shard in its own
+    process bound to one of args.device_id, then merge the shard results into out_path. A continued
+    run resumes every shard from its own progress journal, so the shard count must not change.
+    """
+    num_shards = args.num_shards
+    num_threads = args.num_threads or max(1, (os.cpu_count() or 1) // num_shards)
+    shard_paths = [os.path.join(out_path, SHARD_DIR_PREFIX + str(shard_id)) for shard_id in range(num_shards)]
+    result_paths = [os.path.join(out_path, Comparator.TEST_FILE_NAME),
+                    os.path.join(out_path, Comparator.DETAIL_TEST_FILE_NAME)]
+    for path in shard_paths + result_paths:
+        if os.path.exists(path) and not args.continue_run_ut:
+            raise ValueError(f"file {path} already exists, please remove it first or use a new out path")
+    if args.continue_run_ut and all(os.path.exists(path) for path in result_paths) \
+            and not all(os.path.exists(path) for path in shard_paths):
+        # shard results are removed only after a complete merge
+        print_info_log(f"run_ut results in {out_path} are already merged, nothing to continue.")
+        return
+    stale_shard_path = os.path.join(out_path, SHARD_DIR_PREFIX + str(num_shards))
+    if args.continue_run_ut and os.path.exists(stale_shard_path):
+        raise ValueError(f"file {stale_shard_path} exists, please continue run_ut with the same num_shards")
+    # torch_npu can not be re-initialized in a forked process
+    context = multiprocessing.get_context("spawn")
+    processes = []
+    for shard_id in range(num_shards):
+        device_id = args.device_id[shard_id % len(args.device_id)]
+        process = context.Process(target=run_ut_shard,
+                                  args=(shard_id, num_shards, device_id, num_threads, args.jit_compile, forward_file,
+                                        backward_file, out_path, save_error_data, args.continue_run_ut,
+                                        args.input_cache_path))
+        process.start()
+        processes.append(process)
+    for process in processes:
+        process.join()
+    failed_shards = [shard_id for shard_id, process in enumerate(processes) if process.exitcode != 0]
+    if failed_shards:
+        print_error_log(f"run_ut shards {failed_shards} failed, the shard results are kept in {out_path}.")
+        raise RuntimeError("run_ut sharded execution failed.")
+    # the merged results are rebuilt from the shard results, which are only removed after merging
+    for path in result_paths:
+        if os.path.exists(path):
+            os.remove(path)
+    compare = Comparator(out_path)
+    compare.merge_shard_results(shard_paths)
+    for shard_path in shard_paths:
+        shutil.rmtree(shard_path)
     change_mode(compare.save_path, FileCheckConst.DATA_FILE_AUTHORITY)
     change_mode(compare.detail_save_path, FileCheckConst.DATA_FILE_AUTHORITY)
     compare.print_pretest_result()
@@ -144,7 +182,7 @@ def do_save_error_data(api_full_name, data_info, is_fwd_success, is_bwd_success)
 def run_torch_api(api_full_name, api_setting_dict, backward_content, api_info_dict):
     in_fwd_data_list = []
     [api_type, api_name, _] = api_full_name.split("*")
-    args, kwargs, need_grad = get_api_info(api_info_dict, api_name)
+    args, kwargs, need_grad = get_api_info(api_info_dict, api_name, api_full_name)
     in_fwd_data_list.append(args)
     in_fwd_data_list.append(kwargs)
     need_backward = api_full_name in backward_content
@@ -172,15 +210,6 @@ def run_torch_api(api_full_name, api_setting_dict, backward_content, api_info_di
     return UtDataInfo(grad_out, npu_grad_out, npu_out, out, grad, in_fwd_data_list)
 
 
-def get_api_info(api_info_dict, api_name):
-    convert_type, api_info_dict = api_info_preprocess(api_name, api_info_dict)
-    need_grad = True
-    if api_info_dict.get("kwargs") and "out" in api_info_dict.get("kwargs"):
-        need_grad = False
-    args, kwargs = gen_api_params(api_info_dict, need_grad, convert_type)
-    return args, kwargs, need_grad
-
-
 def run_backward(api_full_name, args, backward_content, grad_index, npu_args, npu_out, out):
     backward_args = backward_content[api_full_name]
     grad = gen_args(backward_args)[0]
@@ -209,10 +238,12 @@ def run_backward(api_full_name, args, backward_content, grad_index, npu_args, np
     return grad_out, npu_grad_out, grad, npu_grad
 
 
-def initialize_save_error_data():
+def initialize_save_error_data(is_continue_run_ut=False):
     error_data_path_checker = FileChecker(msCheckerConfig.error_data_path, FileCheckConst.DIR,
                                           ability=FileCheckConst.WRITE_ABLE)
     error_data_path = error_data_path_checker.common_check()
+    if is_continue_run_ut and os.path.exists(os.path.join(error_data_path, 'ut_error_data')):
+        return
     initialize_save_path(error_data_path, 'ut_error_data')
 
 
@@ -232,21 +263,40 @@ def _run_ut_parser(parser):
                         help="<optional> Save compare failed api output.", required=False)
     parser.add_argument("-j", "--jit_compile", dest="jit_compile", action="store_true",
                         help="<optional> whether to turn on jit compile", required=False)
-    parser.add_argument("-d", "--device", dest="device_id", type=int, help="<optional> set NPU device id to run ut",
-                        default=0, required=False)
+    parser.add_argument("-d", "--device", dest="device_id", type=int, nargs="+",
+                        help="<optional> set NPU device ids to run ut, shards are assigned to them in turn",
+                        default=[0], required=False)
+    parser.add_argument("-n", "--num_shards", dest="num_shards", type=int, default=1,
+                        help="<optional> split the api list into shards and run each shard in its own process",
+                        required=False)
+    parser.add_argument("-t", "--num_threads", dest="num_threads", type=int, default=0,
+                        help="<optional> cpu threads used by each shard, defaults to cpu count divided by shards",
+                        required=False)
+    parser.add_argument("-c", "--continue_run_ut", dest="continue_run_ut", action="store_true",
+                        help="<optional> continue an interrupted run_ut task in the same out path, "
+                             "skip the apis already checked", required=False)
+    parser.add_argument("-cache", "--input_cache_path", dest="input_cache_path", default="", type=str,
+                        help="<optional> reuse the generated input tensors saved in this path across runs, "
+                             "generate and save them when missing", required=False)
 
 
-def _run_ut():
-    parser = argparse.ArgumentParser()
-    _run_ut_parser(parser)
-    args = parser.parse_args(sys.argv[1:])
-    torch.npu.set_compile_mode(jit_compile=args.jit_compile)
-    npu_device = "npu:" + str(args.device_id)
+def set_npu_device(device_id, jit_compile):
+    torch.npu.set_compile_mode(jit_compile=jit_compile)
+    npu_device = "npu:" + str(device_id)
     try:
         torch.npu.set_device(npu_device)
     except Exception:
-        print_error_log(f"Set NPU device id failed. device id is: {args.device_id}")
+        print_error_log(f"Set NPU device id failed. device id is: {device_id}")
         raise NotImplementedError
+
+
+def _run_ut():
+    parser = argparse.ArgumentParser()
+    _run_ut_parser(parser)
+    args = parser.parse_args(sys.argv[1:])
+    if args.num_shards < 1 or args.num_threads < 0:
+        print_error_log("num_shards must be greater than 0 and num_threads must not be negative.")
+        raise ValueError("Invalid num_shards or num_threads.")
     forward_file = os.path.realpath(args.forward_input_file)
     backward_file = os.path.realpath(args.backward_input_file)
     check_file_suffix(forward_file, FileCheckConst.JSON_SUFFIX)
@@ -256,8 +306,15 @@ def _run_ut():
     out_path = out_path_checker.common_check()
     save_error_data = args.save_error_data
     if save_error_data:
-        initialize_save_error_data()
-    run_ut(forward_file, backward_file, out_path, save_error_data)
+        initialize_save_error_data(args.continue_run_ut)
+    if args.num_shards > 1:
+        run_ut_sharded(forward_file, backward_file, out_path, save_error_data, args)
+        return
+    if args.num_threads:
+        torch.set_num_threads(args.num_threads)
+    set_input_cache(args.input_cache_path)
+    set_npu_device(args.device_id[0], args.jit_compile)
+    run_ut(forward_file, backward_file, out_path, save_error_data, is_continue_run_ut=args.continue_run_ut)
 
 
 class UtDataInfo:
@@ -0,0 +1,65 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from api_accuracy_checker.common.api_info_reader import ApiInfoReader, convert_api_info_file
+
+base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+forward_file = os.path.join(base_dir, "../resources/forward.json")
+
+
+class TestApiInfoReader(unittest.TestCase):
+    def setUp(self):
+        self.output_path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.output_path)
+
+    def test_read_json_lines(self):
+        file_path = os.path.join(self.output_path, "forward_info_0.json")
+        with open(file_path, "w") as f:
+            f.write(json.dumps({"Torch*add*0": {"args": [1]}}) + "\n")
+            f.write(json.dumps({"Torch*sub*0": {"args": [2]}, "Torch*mul*0": {"args": [3]}}) + "\n")
+        reader = ApiInfoReader(file_path)
+        self.assertIsNone(reader.content)
+        self.assertEqual(reader.keys(), ["Torch*add*0", "Torch*sub*0", "Torch*mul*0"])
+        self.assertEqual(len(reader), 3)
+        self.assertIn("Torch*mul*0", reader)
+        self.assertNotIn("Torch*div*0", reader)
+        self.assertEqual(reader["Torch*mul*0"], {"args": [3]})
+        reader["Torch*add*0"]["args"].append(4)
+        self.assertEqual(reader["Torch*add*0"], {"args": [1]})
+        self.assertEqual(dict(reader.items())["Torch*sub*0"], {"args": [2]})
+
+    def test_read_single_json_object(self):
+        reader = ApiInfoReader(forward_file)
+        self.assertIsNotNone(reader.content)
+        self.assertEqual(reader.keys(), ["Functional*silu*0"])
+
+    def test_read_json_lines_corrupt_line(self):
+        file_path = os.path.join(self.output_path, "forward_info_0.json")
+        with open(file_path, "w") as f:
+            f.write(json.dumps({"Torch*add*0": {"args": [1]}}) + "\n")
+            f.write('{"Torch*sub*0": {"args": [2\n')
+            f.write(json.dumps({"Torch*mul*0": {"args": [3]}}) + "\n")
+        with self.assertRaisesRegex(ValueError, "line 2 of"):
+            ApiInfoReader(file_path)
+
+    def test_read_json_lines_incomplete_last_line(self):
+        file_path = os.path.join(self.output_path, "forward_info_0.json")
+        with open(file_path, "w") as f:
+            f.write(json.dumps({"Torch*add*0": {"args": [1]}}) + "\n")
+            f.write('{"Torch*sub*0": {"args": [2')
+        reader = ApiInfoReader(file_path)
+        self.assertIsNone(reader.content)
+        self.assertEqual(reader.keys(), ["Torch*add*0"])
+
+    def test_convert_api_info_file(self):
+        output_file = os.path.join(self.output_path, "forward.json")
+        convert_api_info_file(forward_file, output_file)
+        with open(output_file) as f:
+            self.assertEqual(len(f.readlines()), 1)
+        reader = ApiInfoReader(output_file)
+        self.assertIsNone(reader.content)
+        self.assertEqual(reader["Functional*silu*0"], ApiInfoReader(forward_file)["Functional*silu*0"])
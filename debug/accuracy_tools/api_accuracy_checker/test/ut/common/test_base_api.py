@@ -3,6 +3,7 @@ import torch
 import os
 import shutil
 from api_accuracy_checker.common.base_api import BaseAPIInfo
+from api_accuracy_checker.common.real_data_writer import real_data_writer
 
 class TestBaseAPI(unittest.TestCase):
     def setUp(self):
@@ -21,6 +22,7 @@ class TestBaseAPI(unittest.TestCase):
         result = self.api.analyze_tensor(tensor)
         self.assertEqual(result['type'], 'torch.Tensor')
         self.assertEqual(result['requires_grad'], True)
+        real_data_writer.flush()
         self.assertTrue(os.path.exists(result['datapath']))
 
     def test_analyze_builtin(self):
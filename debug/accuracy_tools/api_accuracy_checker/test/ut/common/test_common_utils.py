@@ -22,6 +22,20 @@ class TestUtils(unittest.TestCase):
                 self.assertEqual(row, test_data[i])
         os.remove('test.csv')
 
+    def test_buffered_csv_writer(self):
+        test_data = [["name", "age"], ["Alice", "20"], ["Bob", "30"]]
+        writer = BufferedCsvWriter('test_buffered.csv')
+        writer.write_rows(test_data[:1])
+        writer.write_rows(test_data[1:])
+        self.assertFalse(os.path.exists('test_buffered.csv'))
+        self.assertEqual(writer.row_count, 3)
+        writer.flush()
+        self.assertEqual(writer.size, os.path.getsize('test_buffered.csv'))
+        self.assertEqual(read_csv('test_buffered.csv'), test_data)
+        writer.flush()
+        self.assertEqual(read_csv('test_buffered.csv'), test_data)
+        os.remove('test_buffered.csv')
+
     def test_print_info_log(self):
         try:
             print_info_log("Test message")
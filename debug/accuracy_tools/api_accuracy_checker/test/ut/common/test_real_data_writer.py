@@ -0,0 +1,59 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+import torch
+from api_accuracy_checker.common.real_data_writer import RealDataWriter, real_data_writer
+from api_accuracy_checker.common.base_api import BaseAPIInfo
+from api_accuracy_checker.common.config import msCheckerConfig
+
+
+class TestRealDataWriter(unittest.TestCase):
+    def setUp(self):
+        self.save_path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.save_path)
+
+    def test_submit(self):
+        writer = RealDataWriter()
+        tensor = torch.arange(6, dtype=torch.float32).reshape(2, 3).t()
+        file_path = os.path.join(self.save_path, "Torch*add*0.forward.0.pt")
+        self.assertEqual(writer.submit(file_path, tensor), os.path.realpath(file_path))
+        # the saved data is copied when submitted
+        tensor.add_(1)
+        with self.assertRaises(ValueError):
+            writer.submit(file_path, tensor)
+        writer.flush()
+        self.assertTrue(torch.equal(torch.load(file_path), torch.arange(6, dtype=torch.float32).reshape(2, 3).t()))
+        with self.assertRaises(ValueError):
+            writer.submit(file_path, tensor)
+
+    def test_oversized_real_data(self):
+        api_info = BaseAPIInfo("Torch*add*0", True, True, self.save_path, "forward_real_data", "backward_real_data")
+        os.mkdir(os.path.join(self.save_path, "forward_real_data"))
+        small_tensor = torch.ones(2)
+        original_max_size = msCheckerConfig.config["real_data_max_size"]
+        msCheckerConfig.config["real_data_max_size"] = 1
+        try:
+            huge_tensor = torch.ones(1024 * 1024)
+            out = api_info.analyze_element([huge_tensor, small_tensor])
+            real_data_writer.flush()
+        finally:
+            msCheckerConfig.config["real_data_max_size"] = original_max_size
+        self.assertEqual(out[0]["shape"], torch.Size([1024 * 1024]))
+        self.assertEqual(out[0]["Max"], 1.0)
+        self.assertNotIn("datapath", out[0])
+        self.assertTrue(out[1]["datapath"].endswith("Torch*add*0.1.pt"))
+
+    def test_failed_save_drops_datapath(self):
+        api_info = BaseAPIInfo("Torch*add*0", True, True, self.save_path, "forward_real_data", "backward_real_data")
+        os.mkdir(os.path.join(self.save_path, "forward_real_data"))
+        with patch("api_accuracy_checker.common.real_data_writer.write_pt", side_effect=OSError("disk full")):
+            out = api_info.analyze_element([torch.tensor([1.0, 3.0])])
+            real_data_writer.flush()
+        self.assertNotIn("datapath", out[0])
+        self.assertEqual(out[0]["dtype"], "torch.float32")
+        self.assertEqual(out[0]["Max"], 3.0)
+        self.assertEqual(out[0]["Min"], 1.0)
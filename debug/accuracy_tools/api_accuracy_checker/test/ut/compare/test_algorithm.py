@@ -1,5 +1,6 @@
 import unittest
 import numpy as np
+import torch
 from api_accuracy_checker.compare import algorithm as alg
 
 class TestAlgorithmMethods(unittest.TestCase):
@@ -70,3 +71,49 @@ class TestAlgorithmMethods(unittest.TestCase):
     def test_flatten_compare_result(self):
         result = [[1, 2], [3, 4]]
         self.assertEqual(alg.flatten_compare_result(result), [1, 2, 3, 4])
+
+    def test_get_rel_err_metrics(self):
+        for dtype in [np.float16, np.float32, np.float64]:
+            b_value = np.array([0.0, 1.0, -2.0, 3.0, 4.5], dtype=dtype)
+            n_value = np.array([0.0, 1.001, -2.0, 0.0, 4.5001], dtype=dtype)
+            metrics = alg.get_rel_err_metrics(b_value, n_value)
+            for func, result in metrics.items():
+                self.assertEqual(result, func(b_value.copy(), n_value.copy()))
+            # the inputs are not modified
+            self.assertEqual(b_value[0], 0)
+            self.assertEqual(n_value[3], 0)
+
+    def test_compare_core_multi(self):
+        algs = [alg.cosine_sim, alg.get_max_rel_err, alg.get_max_abs_err, alg.get_rel_err_ratio_thousandth,
+                alg.get_rel_err_ratio_ten_thousandth, alg.compare_builtin_type]
+        bench_out = [torch.tensor([1.0, 0.0, 3.0]), None, 2, (torch.tensor([1, 2]), torch.ones(2, dtype=torch.bfloat16))]
+        npu_out = [torch.tensor([1.0001, 0.0, 2.99]), None, 2, (torch.tensor([1, 3]), torch.ones(2, dtype=torch.bfloat16))]
+        # results of the per algorithm compare_core before the outputs were compared once for all algorithms
+        expected_values = [
+            [1.0, 'N/A', True, 0.5, 1.0],
+            [0.0033333302, 'N/A', True, 0.5, 0.0],
+            [0.00999999, 'N/A', True, 0.5, 0.0],
+            [0.6666666666666666, 'N/A', True, 0.5, 1.0],
+            [0.3333333333333333, 'N/A', True, 0.5, 1.0],
+            ['N/A', 'N/A', True, 0.5, 'N/A']
+        ]
+        expected_dtypes = ['torch.float32', 'N/A', "<class 'int'>", 'torch.int64', 'torch.bfloat16']
+        expected_shapes = [(3,), 'N/A', "<class 'int'>", (2,), (2,)]
+        expected_messages = ['', 'output is None', '', '', '']
+        results = alg.compare_core_multi(bench_out, npu_out, algs)
+        self.assertEqual(len(results), len(algs))
+        for values, result in zip(expected_values, results):
+            compare_result, test_success, bench_dtype, npu_dtype, shape = result
+            self.assertEqual(len(compare_result), len(values))
+            self.assertEqual([message for _, message in compare_result], expected_messages)
+            for value, (result_value, _) in zip(values, compare_result):
+                if isinstance(value, float):
+                    self.assertAlmostEqual(float(result_value), value, places=6)
+                else:
+                    self.assertEqual(result_value, value)
+            self.assertFalse(test_success)
+            self.assertEqual(bench_dtype, expected_dtypes)
+            self.assertEqual(npu_dtype, expected_dtypes)
+            self.assertEqual(shape, expected_shapes)
+        results = alg.compare_core_multi(torch.ones(2), [torch.ones(2)], algs)
+        self.assertIsNot(results[0][0], results[1][0])
@@ -0,0 +1,87 @@
+import os
+import shutil
+import tempfile
+import unittest
+from api_accuracy_checker.common.utils import read_csv
+from api_accuracy_checker.compare.compare import Comparator
+from api_accuracy_checker.compare.compare_utils import CompareConst
+
+
+class TestCompare(unittest.TestCase):
+    def setUp(self):
+        self.out_path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.out_path)
+
+    def _make_shard(self, name, summary_rows, detail_rows):
+        shard_path = os.path.join(self.out_path, name)
+        os.mkdir(shard_path)
+        compare = Comparator(shard_path)
+        for row in summary_rows:
+            compare.write_summary_csv(row)
+        compare.write_detail_csv(detail_rows)
+        compare.flush()
+        return shard_path
+
+    def test_merge_shard_results(self):
+        shard_0 = self._make_shard("shard_0",
+                                   [("Torch*add*0", True, True), ("Torch*sub*0", False, CompareConst.NA)],
+                                   ("Torch*add*0", True, True, [(1.0, True)], None))
+        shard_1 = self._make_shard("shard_1",
+                                   [("Torch*mul*0", "SKIP", "SKIP", "error"), ("Torch*div*0", True, False)],
+                                   ("Torch*div*0", True, False, [(0.5, True)], [(0.1, False)]))
+        compare = Comparator(self.out_path)
+        compare.merge_shard_results([shard_0, shard_1])
+
+        summary_rows = read_csv(compare.save_path)
+        self.assertEqual([row[0] for row in summary_rows[1:]],
+                         ["Torch*add*0", "Torch*sub*0", "Torch*mul*0", "Torch*div*0"])
+        detail_rows = read_csv(compare.detail_save_path)
+        self.assertEqual([row[0] for row in detail_rows[1:]],
+                         ["Torch*add*0.forward.output.0", "Torch*div*0.forward.output.0",
+                          "Torch*div*0.backward.output.0"])
+        self.assertEqual(compare.test_result_cnt, {
+            "forward_fail_num": 1, "backward_fail_num": 1, "forward_and_backward_fail_num": 0, "success_num": 1,
+            "total_num": 3
+        })
+
+    def test_continue_run_ut(self):
+        compare = Comparator(self.out_path)
+        compare.compare_output("Torch*add*0", 1, 1)
+        compare.write_summary_csv(("Torch*sub*0", "SKIP", "SKIP", "error"))
+        compare.record_progress("Torch*sub*0", "SKIP", "SKIP")
+        # rows of an api interrupted before its progress was recorded
+        compare.compare_output("Torch*mul*0", 1, 2)
+        compare.flush()
+        with open(compare.journal.journal_path, "rb+") as f:
+            f.truncate(os.path.getsize(compare.journal.journal_path) - 10)
+
+        compare = Comparator(self.out_path, is_continue_run_ut=True)
+        self.assertTrue(compare.is_api_completed("Torch*add*0"))
+        self.assertTrue(compare.is_api_completed("Torch*sub*0"))
+        self.assertFalse(compare.is_api_completed("Torch*mul*0"))
+        self.assertEqual(compare.test_result_cnt["total_num"], 1)
+        self.assertEqual(compare.test_result_cnt["success_num"], 1)
+        compare.compare_output("Torch*mul*0", 1, 2)
+        compare.flush()
+        summary_rows = read_csv(compare.save_path)
+        self.assertEqual([row[0] for row in summary_rows[1:]], ["Torch*add*0", "Torch*sub*0", "Torch*mul*0"])
+        detail_rows = read_csv(compare.detail_save_path)
+        self.assertEqual([row[0] for row in detail_rows[1:]],
+                         ["Torch*add*0.forward.output.0", "Torch*mul*0.forward.output.0"])
+
+    def test_new_run_ut_with_existing_result(self):
+        Comparator(self.out_path)
+        with self.assertRaises(ValueError):
+            Comparator(self.out_path)
+
+    def test_buffered_result_rows(self):
+        compare = Comparator(self.out_path)
+        compare.compare_output("Torch*add*0", 1, 1)
+        self.assertEqual(len(read_csv(compare.save_path)), 1)
+        self.assertFalse(os.path.exists(compare.journal.journal_path))
+        compare.flush()
+        self.assertEqual(len(read_csv(compare.save_path)), 2)
+        self.assertEqual(compare.journal.last_record["file_sizes"],
+                         [os.path.getsize(compare.save_path), os.path.getsize(compare.detail_save_path)])
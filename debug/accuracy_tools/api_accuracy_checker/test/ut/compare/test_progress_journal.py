@@ -0,0 +1,39 @@
+import os
+import shutil
+import tempfile
+import unittest
+from api_accuracy_checker.compare.progress_journal import ProgressJournal
+
+
+class TestProgressJournal(unittest.TestCase):
+    def setUp(self):
+        self.out_path = tempfile.mkdtemp()
+        self.journal_path = os.path.join(self.out_path, "progress.jsonl")
+
+    def tearDown(self):
+        shutil.rmtree(self.out_path)
+
+    def test_append_and_load(self):
+        journal = ProgressJournal(self.journal_path)
+        journal.append("Torch*add*0", True, "N/A", [10, 20])
+        journal.append("Torch*sub*0", "SKIP", "SKIP", [30, 20])
+        self.assertFalse(os.path.exists(self.journal_path))
+        journal.flush()
+        journal = ProgressJournal(self.journal_path).load()
+        self.assertTrue(journal.is_completed("Torch*add*0"))
+        self.assertEqual(journal.records["Torch*add*0"]["forward"], "True")
+        self.assertEqual(journal.last_record["file_sizes"], [30, 20])
+
+    def test_load_drop_torn_record(self):
+        journal = ProgressJournal(self.journal_path)
+        journal.append("Torch*add*0", True, True, [10, 20])
+        journal.flush()
+        valid_size = os.path.getsize(self.journal_path)
+        with open(self.journal_path, "ab") as f:
+            f.write(b'{"api_name": "Torch*sub')
+        journal = ProgressJournal(self.journal_path).load()
+        self.assertEqual(list(journal.records), ["Torch*add*0"])
+        self.assertEqual(os.path.getsize(self.journal_path), valid_size)
+        journal.append("Torch*sub*0", False, False, [40, 50])
+        journal.flush()
+        self.assertEqual(list(ProgressJournal(self.journal_path).load().records), ["Torch*add*0", "Torch*sub*0"])
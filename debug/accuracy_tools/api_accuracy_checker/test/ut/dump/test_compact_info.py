@@ -0,0 +1,39 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from api_accuracy_checker.common.api_info_reader import ApiInfoReader
+from api_accuracy_checker.dump.compact_info import get_info_files, compact_dump_path
+
+
+class TestCompactInfo(unittest.TestCase):
+    def setUp(self):
+        self.dump_path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dump_path)
+
+    def _write_lines(self, file_name, lines):
+        with open(os.path.join(self.dump_path, file_name), "w") as f:
+            f.write("".join(lines))
+
+    def test_compact_dump_path(self):
+        self._write_lines("forward_info_20.json", [json.dumps({"Torch*mul*0": {"args": [3]}}) + "\n"])
+        self._write_lines("forward_info_3.json", [json.dumps({"Torch*add*0": {"args": [1]}}) + "\n",
+                                                  json.dumps({"Torch*sub*0": {"args": [2]}}) + "\n",
+                                                  '{"Torch*div*0": {"ar'])
+        self._write_lines("backward_info_3.json", [json.dumps({"Torch*add*0": {"grad": [1]}}) + "\n"])
+        self._write_lines("backward_info_20.json", [json.dumps({"Torch*add*0": {"grad": [2]}}) + "\n"])
+        self.assertEqual([os.path.basename(path) for path in get_info_files(self.dump_path, "forward")],
+                         ["forward_info_3.json", "forward_info_20.json"])
+        self.assertEqual(len(get_info_files(self.dump_path, "forward", [20])), 1)
+
+        compact_dump_path(self.dump_path, self.dump_path)
+        forward = ApiInfoReader(os.path.join(self.dump_path, "forward_info.json"))
+        self.assertEqual(forward.keys(), ["Torch*add*0", "Torch*sub*0", "Torch*mul*0"])
+        backward = ApiInfoReader(os.path.join(self.dump_path, "backward_info.json"))
+        self.assertEqual(backward["Torch*add*0"], {"grad": [1]})
+        self.assertFalse(os.path.exists(os.path.join(self.dump_path, "stack_info.json")))
+        with self.assertRaises(ValueError):
+            compact_dump_path(self.dump_path, self.dump_path)
@@ -1,10 +1,12 @@
 import unittest
 import os
 import fcntl
+import threading
 from unittest.mock import patch
 from api_accuracy_checker.dump.api_info import APIInfo, ForwardAPIInfo, BackwardAPIInfo
-from api_accuracy_checker.dump.info_dump import write_api_info_json, write_json, initialize_output_json
+from api_accuracy_checker.dump.info_dump import write_api_info_json, write_json, initialize_output_json, api_info_writer
 from api_accuracy_checker.common.utils import check_file_or_directory_path, initialize_save_path
+from api_accuracy_checker.common.api_info_reader import ApiInfoReader
 
 class TestInfoDump(unittest.TestCase):
 
@@ -15,6 +17,38 @@ class TestInfoDump(unittest.TestCase):
             rank = os.getpid()
             mock_write_json.assert_called_with(f'./backward_info_{rank}.json', api_info.grad_info_struct)
 
+    def test_write_json(self):
+        rank = os.getpid()
+        file_path = f'./backward_info_{rank}.json'
+        write_json(file_path, {"Torch*add*0": {"args": [1]}})
+        write_json(file_path, {"Torch*sub*0": {"args": [2]}})
+        self.assertFalse(os.path.exists(file_path))
+        api_info_writer.flush()
+        reader = ApiInfoReader(file_path)
+        self.assertEqual(reader.keys(), ["Torch*add*0", "Torch*sub*0"])
+        self.assertEqual(reader["Torch*sub*0"], {"args": [2]})
+
+    def test_write_json_concurrent_flush(self):
+        rank = os.getpid()
+        file_path = f'./backward_info_{rank}.json'
+
+        def write_records(thread_id):
+            for index in range(200):
+                write_json(file_path, {f"Torch*add*{thread_id}_{index}": {"args": [index]}})
+
+        with patch.object(api_info_writer, 'FLUSH_SIZE', 7):
+            threads = [threading.Thread(target=write_records, args=(thread_id,)) for thread_id in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            api_info_writer.flush()
+        keys = ApiInfoReader(file_path).keys()
+        self.assertEqual(len(keys), 800)
+        for thread_id in range(4):
+            thread_keys = [key for key in keys if key.startswith(f"Torch*add*{thread_id}_")]
+            self.assertEqual(thread_keys, [f"Torch*add*{thread_id}_{index}" for index in range(200)])
+
     def test_write_api_info_json_invalid_type(self):
         api_info = APIInfo("test_api", True, True, "save_path")
         with self.assertRaises(ValueError):
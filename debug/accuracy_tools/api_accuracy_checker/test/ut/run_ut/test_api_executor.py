@@ -0,0 +1,34 @@
+# coding=utf-8
+import unittest
+import torch
+from api_accuracy_checker.run_ut.api_executor import exec_api, generate_cpu_params, get_api_callable, \
+    get_raise_precision_dtype
+
+
+class TestApiExecutor(unittest.TestCase):
+    def test_get_api_callable(self):
+        self.assertIs(get_api_callable("Torch", "add").__self__, get_api_callable("Torch", "add").__self__)
+        self.assertIsNot(get_api_callable("Torch", "add").__self__, get_api_callable("Tensor", "add").__self__)
+        with self.assertRaises(ValueError):
+            get_api_callable("Aten", "add")
+
+    def test_exec_api(self):
+        x = torch.tensor([-1.0, 2.0])
+        self.assertTrue(torch.equal(exec_api("Functional", "relu", (x,), {}), torch.tensor([0.0, 2.0])))
+        self.assertTrue(torch.equal(exec_api("Tensor", "add", (x, x), {}), x * 2))
+        self.assertTrue(torch.equal(exec_api("Torch", "einsum", ("i,i->", x, x), {}), torch.tensor(5.0)))
+
+    def test_get_raise_precision_dtype(self):
+        self.assertEqual(get_raise_precision_dtype(torch.float16), torch.float32)
+        self.assertEqual(get_raise_precision_dtype(torch.bfloat16), torch.float32)
+        self.assertEqual(get_raise_precision_dtype(torch.float32), torch.float64)
+        self.assertIsNone(get_raise_precision_dtype(torch.int32))
+
+    def test_generate_cpu_params(self):
+        x = torch.ones(2, dtype=torch.float16, requires_grad=True)
+        cpu_args, cpu_kwargs = generate_cpu_params((x, torch.ones(2, dtype=torch.int32)),
+                                                   {"other": torch.ones(2, dtype=torch.float32)}, True)
+        self.assertEqual(cpu_args[0].dtype, torch.float32)
+        self.assertTrue(cpu_args[0].requires_grad)
+        self.assertEqual(cpu_args[1].dtype, torch.int32)
+        self.assertEqual(cpu_kwargs["other"].dtype, torch.float32)
@@ -0,0 +1,52 @@
+# coding=utf-8
+import csv
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+from api_accuracy_checker.run_ut.exec_api_benchmark import BENCHMARK_HEADER, PHASES, benchmark_api, run_benchmark, \
+    _benchmark
+
+
+class TestExecApiBenchmark(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = os.path.realpath(tempfile.mkdtemp())
+        self.forward_file = os.path.join(self.temp_dir, "forward.json")
+        forward_content = {
+            "Functional*relu*0": {"args": [{"type": "torch.Tensor", "dtype": "torch.float32", "shape": [2, 3],
+                                            "Max": 1.0, "Min": -1.0, "requires_grad": False}], "kwargs": {}},
+            "Functional*no_such_api*0": {"args": [], "kwargs": {}},
+        }
+        with open(self.forward_file, "w") as f:
+            json.dump(forward_content, f)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_benchmark_api(self):
+        with open(self.forward_file) as f:
+            forward_content = json.load(f)
+        result = benchmark_api("Functional*relu*0", forward_content, 2)
+        self.assertEqual(list(result), PHASES)
+        self.assertTrue(all(value >= 0 for value in result.values()))
+
+    def test_run_benchmark_skips_failed_api(self):
+        result_file = os.path.join(self.temp_dir, "exec_api_benchmark.csv")
+        total = run_benchmark(self.forward_file, result_file, 1)
+        self.assertEqual(list(total), PHASES)
+        with open(result_file) as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(rows[0], BENCHMARK_HEADER)
+        self.assertEqual([row[0] for row in rows[1:]], ["Functional*relu*0"])
+        self.assertEqual(len(rows[1]), len(BENCHMARK_HEADER))
+
+    def test_benchmark_command(self):
+        with patch("sys.argv", ["exec_api_benchmark.py", "-forward", self.forward_file, "-o", self.temp_dir,
+                                "-r", "1"]):
+            _benchmark()
+        self.assertTrue(os.path.isfile(os.path.join(self.temp_dir, "exec_api_benchmark.csv")))
+        with patch("sys.argv", ["exec_api_benchmark.py", "-forward", self.forward_file, "-r", "0"]):
+            with self.assertRaises(ValueError):
+                _benchmark()
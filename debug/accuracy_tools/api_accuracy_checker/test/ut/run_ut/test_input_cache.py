@@ -0,0 +1,84 @@
+# coding=utf-8
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import torch
+from api_accuracy_checker.run_ut import data_generate
+from api_accuracy_checker.run_ut.input_cache import InputCache
+
+
+class TestInputCache(unittest.TestCase):
+    def setUp(self):
+        self.cache_path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        data_generate.set_input_cache("")
+        shutil.rmtree(self.cache_path)
+
+    def test_get(self):
+        cache = InputCache(self.cache_path)
+        key = cache.get_key("random", -1, 1, (2, 3), "torch.float32", None)
+        data = cache.get(key, lambda: torch.rand(2, 3))
+        cached = InputCache(self.cache_path).get(key, lambda: self.fail("cached tensor is generated again"))
+        self.assertTrue(torch.equal(data, cached))
+        # the cached tensor does not depend on the global random state
+        shutil.rmtree(self.cache_path)
+        torch.rand(10)
+        self.assertTrue(torch.equal(InputCache(self.cache_path).get(key, lambda: torch.rand(2, 3)), data))
+
+    def test_get_bfloat16(self):
+        cache = InputCache(self.cache_path)
+        key = cache.get_key("random", -1, 1, (4,), "torch.bfloat16", None)
+        data = cache.get(key, lambda: torch.rand(4, dtype=torch.bfloat16))
+        cached = cache.get(key, lambda: None)
+        self.assertEqual(cached.dtype, torch.bfloat16)
+        self.assertTrue(torch.equal(data, cached))
+        self.assertEqual(cache.hit_count, 1)
+
+    def test_gen_random_tensor_with_cache(self):
+        data_generate.set_input_cache(self.cache_path)
+        info = {"type": "torch.Tensor", "dtype": "torch.float16", "shape": [3, 4], "Max": 2.0, "Min": -1.0,
+                "requires_grad": True}
+        data = data_generate.gen_data(dict(info), True, None)
+        cached = data_generate.gen_data(dict(info), True, None)
+        self.assertTrue(torch.equal(data, cached))
+        self.assertTrue(cached.requires_grad)
+        self.assertEqual(data_generate.input_cache.hit_count, 1)
+        # the cached tensor is copy-on-write, modifying it leaves the cache file unchanged
+        cached.detach().fill_(0)
+        self.assertTrue(torch.equal(data_generate.gen_data(dict(info), False, None), data.detach()))
+
+    def test_gen_api_params_same_info_args(self):
+        data_generate.set_input_cache(self.cache_path)
+        info = {"type": "torch.Tensor", "dtype": "torch.float32", "shape": [3, 4], "Max": 2.0, "Min": -1.0,
+                "requires_grad": False}
+        api_info = {"args": [dict(info), dict(info)], "kwargs": {"other": dict(info)}}
+        args, kwargs = data_generate.gen_api_params(api_info, False, None, "Torch_sub_0")
+        self.assertFalse(torch.equal(args[0], args[1]))
+        self.assertFalse(torch.equal(args[0], kwargs["other"]))
+        api_info = {"args": [dict(info), dict(info)], "kwargs": {"other": dict(info)}}
+        cached_args, _ = data_generate.gen_api_params(api_info, False, None, "Torch_sub_0")
+        self.assertTrue(torch.equal(args[1], cached_args[1]))
+        self.assertEqual(data_generate.input_cache.hit_count, 3)
+        # the same arg of another api call gets its own data
+        api_info = {"args": [dict(info)], "kwargs": {}}
+        other_args, _ = data_generate.gen_api_params(api_info, False, None, "Torch_sub_1")
+        self.assertFalse(torch.equal(args[0], other_args[0]))
+
+    def test_gen_real_tensor_with_cache(self):
+        data_path = os.path.join(self.cache_path, "real.npy")
+        np.save(data_path, np.arange(6, dtype=np.int32).reshape(2, 3))
+        data_generate.set_input_cache(os.path.join(self.cache_path, "cache"))
+        data = data_generate.gen_real_tensor(data_path, "int32_to_int64")
+        cached = data_generate.gen_real_tensor(data_path, "int32_to_int64")
+        self.assertEqual(cached.dtype, torch.int64)
+        self.assertTrue(torch.equal(data, cached))
+        self.assertEqual(data_generate.input_cache.hit_count, 1)
+
+    def test_get_torch_dtype(self):
+        self.assertEqual(data_generate.get_torch_dtype("torch.float16"), torch.float16)
+        self.assertEqual(data_generate.get_torch_dtype("torch.long"), torch.int64)
+        with self.assertRaises(Exception):
+            data_generate.get_torch_dtype("torch.Tensor")
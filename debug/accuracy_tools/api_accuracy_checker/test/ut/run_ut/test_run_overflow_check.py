@@ -0,0 +1,95 @@
+# coding=utf-8
+import csv
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+from api_accuracy_checker.run_ut import run_overflow_check
+from api_accuracy_checker.run_ut.run_overflow_check import ABNORMAL_OVERFLOW, CHECK_ERROR, NORMAL_OVERFLOW, \
+    OVERFLOW_RESULT_FILE_NAME, OVERFLOW_RESULT_HEADER
+
+API_NUM = 8
+ABNORMAL_API = "Torch_mul_5_forward"
+CRASH_API = "Torch_mul_3_forward"
+
+
+def mock_run_torch_api(api_full_name, api_setting_dict, backward_content, api_info_dict):
+    api_index = int(api_full_name.split("_")[2])
+    # later apis finish first, so the rows are only in dump order if they are consumed in dump order
+    time.sleep(0.01 * (API_NUM - api_index))
+    return api_full_name, False, api_full_name == ABNORMAL_API
+
+
+def mock_crashed_run_torch_api(api_full_name, api_setting_dict, backward_content, api_info_dict):
+    if api_full_name == CRASH_API:
+        os._exit(1)
+    return mock_run_torch_api(api_full_name, api_setting_dict, backward_content, api_info_dict)
+
+
+class TestRunOverflowCheck(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = os.path.realpath(tempfile.mkdtemp())
+        self.forward_file = os.path.join(self.temp_dir, "forward.json")
+        self.api_names = [f"Torch_mul_{api_index}_forward" for api_index in range(API_NUM)]
+        with open(self.forward_file, "w") as f:
+            json.dump({api_name: {"args": [], "kwargs": {}} for api_name in self.api_names}, f)
+        self.run_torch_api_patch = patch.object(run_overflow_check, "run_torch_api", side_effect=mock_run_torch_api)
+        self.patches = [
+            self.run_torch_api_patch,
+            patch.object(run_overflow_check, "set_npu_device"),
+            patch.object(run_overflow_check, "get_json_contents", return_value={}),
+            # forked workers inherit the mocks
+            patch.object(run_overflow_check, "WORKER_START_METHOD", "fork"),
+        ]
+        for mock_patch in self.patches:
+            mock_patch.start()
+
+    def tearDown(self):
+        for mock_patch in self.patches:
+            mock_patch.stop()
+        run_overflow_check.worker_content.clear()
+        shutil.rmtree(self.temp_dir)
+
+    def read_result(self):
+        with open(os.path.join(self.temp_dir, OVERFLOW_RESULT_FILE_NAME)) as f:
+            return list(csv.reader(f))
+
+    def test_rows_in_dump_order_with_workers(self):
+        rows = run_overflow_check.run_overflow_check(self.forward_file, "", self.temp_dir, num_workers=3,
+                                                     device_ids=[0, 1])
+        self.assertEqual([row[0] for row in rows], self.api_names)
+        self.assertEqual([row[3] for row in rows],
+                         [ABNORMAL_OVERFLOW if name == ABNORMAL_API else NORMAL_OVERFLOW for name in self.api_names])
+        result = self.read_result()
+        self.assertEqual(result[0], OVERFLOW_RESULT_HEADER)
+        self.assertEqual([row[0] for row in result[1:]], self.api_names)
+
+    def test_early_exit_at_first_abnormal_overflow(self):
+        for num_workers in [1, 3]:
+            rows = run_overflow_check.run_overflow_check(self.forward_file, "", self.temp_dir, num_workers=num_workers,
+                                                         early_exit=True)
+            abnormal_index = self.api_names.index(ABNORMAL_API)
+            self.assertEqual([row[0] for row in rows], self.api_names[:abnormal_index + 1])
+            self.assertEqual([row[3] for row in rows], [NORMAL_OVERFLOW] * abnormal_index + [ABNORMAL_OVERFLOW])
+            os.remove(os.path.join(self.temp_dir, OVERFLOW_RESULT_FILE_NAME))
+
+    def test_dead_worker_reported(self):
+        self.run_torch_api_patch.stop()
+        with patch.object(run_overflow_check, "run_torch_api", side_effect=mock_crashed_run_torch_api):
+            rows = run_overflow_check.run_overflow_check(self.forward_file, "", self.temp_dir, num_workers=2)
+        self.run_torch_api_patch.start()
+        crash_index = self.api_names.index(CRASH_API)
+        self.assertEqual([row[0] for row in rows[:crash_index]], self.api_names[:crash_index])
+        error_rows = rows[crash_index:]
+        self.assertIn(CRASH_API, [row[0] for row in error_rows])
+        self.assertTrue(all(row[3] == CHECK_ERROR for row in error_rows))
+        self.assertEqual(len(self.read_result()), len(rows) + 1)
+
+    def test_existing_result_file(self):
+        with open(os.path.join(self.temp_dir, OVERFLOW_RESULT_FILE_NAME), "w") as f:
+            f.write("")
+        with self.assertRaises(ValueError):
+            run_overflow_check.run_overflow_check(self.forward_file, "", self.temp_dir)
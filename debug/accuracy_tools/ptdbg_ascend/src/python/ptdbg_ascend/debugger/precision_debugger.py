@@ -6,8 +6,8 @@ from ..dump.dump import DumpUtil, acc_cmp_dump, write_to_disk, get_pkl_file_path
 from ..dump.utils import set_dump_path, set_dump_switch_print_info, generate_dump_path_str, \
         set_dump_switch_config, set_backward_input
 from ..overflow_check.utils import OverFlowUtil
-from ..overflow_check.overflow_check import overflow_check
-from ..hook_module.register_hook import register_hook_core, init_overflow_nums
+from ..overflow_check.overflow_check import overflow_check, flush_overflow_check
+from ..hook_module.register_hook import register_hook_core, init_overflow_nums, init_overflow_sync_interval
 from ..hook_module.hook_module import HOOKModule
 from .debugger_config import DebuggerConfig
 
@@ -57,11 +57,13 @@ class PrecisionDebugger:
             elif 'backward' in scope[0]:
                 set_backward_input(backward_input)
 
-    def configure_overflow_dump(self, mode="api", acl_config=None, overflow_nums=1, filter_switch = Const.OFF):
+    def configure_overflow_dump(self, mode="api", acl_config=None, overflow_nums=1, filter_switch = Const.OFF,
+            overflow_sync_interval=1):
         if mode == "acl":
             DumpUtil.dump_switch_mode = mode
             DumpUtil.set_acl_config(acl_config)
         init_overflow_nums(overflow_nums)
+        init_overflow_sync_interval(overflow_sync_interval)
         check_switch_valid(filter_switch)
         OverFlowUtil.overflow_filter_switch = filter_switch
 
@@ -88,12 +90,16 @@ class PrecisionDebugger:
         OverFlowUtil.overflow_check_switch = "OFF"
         dump_path_str = generate_dump_path_str()
         set_dump_switch_print_info("OFF", DumpUtil.dump_switch_mode, dump_path_str)
+        if cls.hook_func is overflow_check:
+            flush_overflow_check()
         write_to_disk()
         if check_is_npu() and DumpUtil.dump_switch_mode in [Const.ALL, Const.API_STACK, Const.LIST, Const.RANGE]:
             generate_compare_script(DumpUtil.dump_data_dir, get_pkl_file_path(), DumpUtil.dump_switch_mode)
 
     @classmethod
     def step(cls):
+        if cls.hook_func is overflow_check:
+            flush_overflow_check()
         DumpUtil.dump_init_enable = True
         DumpUtil.iter_num += 1
         HOOKModule.module_count = {}
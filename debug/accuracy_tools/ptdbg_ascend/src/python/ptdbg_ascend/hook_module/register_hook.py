@@ -15,6 +15,7 @@
 # limitations under the License.
 """
 
+import atexit
 import functools
 import os
 
@@ -29,6 +30,7 @@ from ..common.utils import check_file_or_directory_path, print_error_log, Compar
     print_info_log, print_warn_log, get_process_rank, torch_without_guard_version
 from ..dump.utils import make_dump_dirs, DumpUtil
 from ..overflow_check.utils import OverFlowUtil
+from ..overflow_check.overflow_check import flush_overflow_check_at_exit
 
 torch_version_above_2 = torch.__version__.split('+')[0] > '2.0'
 
@@ -41,7 +43,7 @@ else:
     from . import wrap_npu_custom
 
 make_dir_flag = True
-REGISTER_HOOK_KWARGS = ["overflow_nums", "dump_mode", "dump_config"]
+REGISTER_HOOK_KWARGS = ["overflow_nums", "overflow_sync_interval", "dump_mode", "dump_config"]
 
 
 def initialize_hook(hook):
@@ -109,6 +111,10 @@ def register_hook(model, hook, **kwargs):
     print_info_log("Please disable dataloader shuffle before running the program.")
     overflow_nums = kwargs.get('overflow_nums', 1)
     init_overflow_nums(overflow_nums)
+    init_overflow_sync_interval(kwargs.get('overflow_sync_interval', 1))
+    if OverFlowUtil.overflow_sync_interval > 1:
+        # there is no stop call on this path, handle the apis of the last unfinished window at exit
+        atexit.register(flush_overflow_check_at_exit)
     dump_mode, dump_config_file = init_dump_config(kwargs)
     if dump_mode == 'acl':
         DumpUtil.dump_switch_mode = dump_mode
@@ -124,6 +130,15 @@ def init_overflow_nums(overflow_nums):
         raise CompareException(CompareException.INVALID_PARAM_ERROR)
 
 
+def init_overflow_sync_interval(overflow_sync_interval):
+    if isinstance(overflow_sync_interval, int) and not isinstance(overflow_sync_interval, bool) \
+            and overflow_sync_interval > 0:
+        OverFlowUtil.overflow_sync_interval = overflow_sync_interval
+    else:
+        print_error_log("overflow_sync_interval must be an integer greater than 0.")
+        raise CompareException(CompareException.INVALID_PARAM_ERROR)
+
+
 def check_register_hook(hook, **kwargs):
     if not isfunction(hook) or hook.__name__ not in ["overflow_check", "acc_cmp_dump"]:
         print_error_log("hook function must be set overflow_check or acc_cmp_dump")
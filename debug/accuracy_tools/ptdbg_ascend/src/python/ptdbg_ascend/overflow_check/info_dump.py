@@ -1,18 +1,19 @@
+import atexit
+import collections
 import inspect
-import fcntl
 import json
 import os
 import torch
-import threading
 
 import numpy as np
 
-from ..common.utils import print_error_log
+from ..common.utils import print_error_log, print_warn_log
 from ..common.file_check_util import FileOpen
 
 
 special_torch_object = ["memory_format"]
-lock = threading.Lock()
+JSON_LINES_SUFFIX = ".jsonl"
+FLUSH_SIZE = 100
 
 
 def write_npy(file_path, tensor):
@@ -188,43 +189,103 @@ class BackwardAPIInfo(APIInfo):
         self.grad_info_struct = {self.api_name: grads_info_list}
 
 
+class JsonLinesWriter:
+    """
+    Buffer api info records in memory and append them as json lines to per-process files.
+    Each dump call is an in-memory append, records reach disk in batches of flush_size and no
+    file lock is taken, since every process owns its own files.
+    """
+    def __init__(self, flush_size=FLUSH_SIZE):
+        self.flush_size = flush_size
+        self.records = collections.deque()
+        self.pid = os.getpid()
+        atexit.register(self.flush)
+
+    def append(self, file_path, data):
+        self.records.append((file_path, json.dumps(data)))
+        if len(self.records) >= self.flush_size:
+            self.flush()
+
+    def flush(self):
+        if self.pid != os.getpid():
+            # records inherited from the parent process are flushed by the parent
+            self.records.clear()
+            self.pid = os.getpid()
+            return
+        file_lines = {}
+        while self.records:
+            try:
+                file_path, line = self.records.popleft()
+            except IndexError:
+                break
+            file_lines.setdefault(file_path, []).append(line)
+        for file_path, lines in file_lines.items():
+            with FileOpen(file_path, 'a') as f:
+                f.write('\n'.join(lines) + '\n')
+
+
+json_lines_writer = JsonLinesWriter()
+
+
+def get_api_info_file_path(dump_path, prefix, rank):
+    return os.path.join(dump_path, f'{prefix}_{rank}{JSON_LINES_SUFFIX}')
+
+
 def write_api_info_json(api_info):
     dump_path = "./"
     rank = api_info.rank
     if isinstance(api_info, ForwardAPIInfo):
-        file_path = os.path.join(dump_path, f'forward_info_{rank}.json')
-        stack_file_path = os.path.join(dump_path, f'stack_info_{rank}.json')
-        write_json(file_path, api_info.api_info_struct)
-        write_json(stack_file_path, api_info.stack_info_struct, indent=4)
+        json_lines_writer.append(get_api_info_file_path(dump_path, 'forward_info', rank), api_info.api_info_struct)
+        json_lines_writer.append(get_api_info_file_path(dump_path, 'stack_info', rank), api_info.stack_info_struct)
 
     elif isinstance(api_info, BackwardAPIInfo):
-        file_path = os.path.join(dump_path, f'backward_info_{rank}.json')
-        write_json(file_path, api_info.grad_info_struct)
+        json_lines_writer.append(get_api_info_file_path(dump_path, 'backward_info', rank), api_info.grad_info_struct)
     else:
         raise ValueError(f"Invalid api_info type {type(api_info)}")
 
 
+def read_json_lines(file_path):
+    """
+    Rebuild the combined json object from a json lines file. A truncated last line left by a
+    killed process is skipped.
+    """
+    data = {}
+    with FileOpen(file_path, 'r') as f:
+        for line_num, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                data.update(json.loads(line))
+            except json.JSONDecodeError:
+                print_warn_log(f"Skip incomplete line {line_num} in {file_path}.")
+    return data
+
+
 def write_json(file_path, data, indent=None):
-    if not os.path.exists(file_path):
+    try:
         with FileOpen(file_path, 'w') as f:
-            f.write("{\n}")
-    lock.acquire()
-    with FileOpen(file_path, 'a+') as f:
-        fcntl.flock(f, fcntl.LOCK_EX)
-        try:
-            f.seek(0, os.SEEK_END)
-            f.seek(f.tell() - 1, os.SEEK_SET)
-            f.truncate()
-            if f.tell() > 3:
-                f.seek(f.tell() - 1, os.SEEK_SET)
-                f.truncate()
-                f.write(',\n')
-            f.write(json.dumps(data, indent=indent)[1:-1] + '\n}')
-        except Exception as e:
-            raise ValueError(f"Json save failed:{e}")
-        finally:
-            fcntl.flock(f, fcntl.LOCK_UN)
-            lock.release()
+            json.dump(data, f, indent=indent)
+    except Exception as e:
+        raise ValueError(f"Json save failed:{e}") from e
+
+
+def merge_api_info_json(rank=None, dump_path="./"):
+    """
+    Flush the buffered records and rebuild forward_info_{rank}.json, backward_info_{rank}.json and
+    stack_info_{rank}.json from their json lines files.
+    """
+    json_lines_writer.flush()
+    rank = os.getpid() if rank is None else rank
+    merged_files = []
+    for prefix, indent in [('forward_info', None), ('backward_info', None), ('stack_info', 4)]:
+        json_lines_path = get_api_info_file_path(dump_path, prefix, rank)
+        if not os.path.exists(json_lines_path):
+            continue
+        file_path = os.path.join(dump_path, f'{prefix}_{rank}.json')
+        write_json(file_path, read_json_lines(json_lines_path), indent=indent)
+        merged_files.append(file_path)
+    return merged_files
 
 
 def initialize_output_json():
@@ -1,11 +1,12 @@
+import functools
 import os
 import torch
 from pathlib import Path
 from ..common.utils import print_warn_log, get_time, print_info_log
 from ..dump.dump import forward_init_status, forward_acl_dump
-from .utils import OverFlowUtil, dump_overflow
+from .utils import OverFlowUtil, OverflowAccumulator, dump_overflow
 from ..dump.utils import DumpUtil, Const, get_tensor_rank, create_dirs_if_not_exist
-from .info_dump import write_api_info_json, ForwardAPIInfo, BackwardAPIInfo
+from .info_dump import write_api_info_json, merge_api_info_json, ForwardAPIInfo, BackwardAPIInfo
 from ..dump import dump
 
 try:
@@ -22,6 +23,7 @@ backward_api_info = {}
 FORWARD_REAL_DATA_PATH = os.path.join('./', 'forward_real_data')
 BACKWARD_REAL_DATA_PATH = os.path.join('./', 'backward_real_data')
 rank = os.getpid()
+overflow_accumulator = OverflowAccumulator()
 
 
 def check_overflow_environment(pid):
@@ -72,6 +74,29 @@ def check_data_overflow(x):
             return False
 
 
+def flush_overflow_check():
+    """
+    Sync the batched overflow flags once and handle the overflowing APIs in call order, as if each
+    of them had been checked in its own hook.
+    """
+    error = None
+    for record in overflow_accumulator.sync():
+        # keep handling the later records after overflow_nums is reached, then raise the first error
+        try:
+            record.payload(record.has_overflow)
+        except ValueError as err:
+            error = error or err
+    if error is not None:
+        raise error
+
+
+def flush_overflow_check_at_exit():
+    try:
+        flush_overflow_check()
+    except ValueError as err:
+        print_warn_log(str(err))
+
+
 def check_path(apis, path):
     return any(api in path for api in apis)
 
@@ -105,9 +130,6 @@ def overflow_check(name, **kwargs):
         global pkl_name
         pkl_name = dump_path
         dump_dir = os.path.split(dump_path)[0]
-        global api_overflow
-        global forward_api_info
-        global backward_api_info
 
         module_name = name
         if hasattr(torch_npu._C, '_npu_is_support_inf_nan') and torch_npu._C._npu_is_support_inf_nan():
@@ -116,9 +138,23 @@ def overflow_check(name, **kwargs):
                 check_feat = in_feat
             else:
                 check_feat = out_feat
-            module.has_overflow = check_data_overflow(check_feat)
+            if OverFlowUtil.overflow_sync_interval > 1:
+                overflow_accumulator.sync_interval = OverFlowUtil.overflow_sync_interval
+                payload = functools.partial(handle_overflow, module, module_name, in_feat, out_feat, dump_dir)
+                if overflow_accumulator.record(module_name, check_feat, payload):
+                    flush_overflow_check()
+                return
+            has_overflow = check_data_overflow(check_feat)
         else:
-            module.has_overflow = torch_npu._C._check_overflow_npu()
+            has_overflow = torch_npu._C._check_overflow_npu()
+        handle_overflow(module, module_name, in_feat, out_feat, dump_dir, has_overflow)
+
+    def handle_overflow(module, module_name, in_feat, out_feat, dump_dir, has_overflow):
+        global api_overflow
+        global forward_api_info
+        global backward_api_info
+
+        module.has_overflow = has_overflow
         if not module.has_overflow:
             if hasattr(module, 'input_args'):
                 del module.input_args
@@ -128,11 +164,12 @@ def overflow_check(name, **kwargs):
             need_replicate = overflow_type_judge(in_feat, out_feat, module_name)
             if need_replicate:
                 if module_name.endswith(Const.FORWARD):
-                    forward_api_info.update({name: ForwardAPIInfo(name, True, module.input_args, module.input_kwargs)})
+                    forward_api_info.update({module_name: ForwardAPIInfo(module_name, True, module.input_args,
+                                                                         module.input_kwargs)})
                     api_overflow.append(module_name)
                 else:
                     api_overflow.append(module_name.replace("backward", "forward"))
-                    backward_api_info.update({name: BackwardAPIInfo(name, out_feat)})
+                    backward_api_info.update({module_name: BackwardAPIInfo(module_name, out_feat)})
             OverFlowUtil.inc_overflow_dump_times()
             dump_file_name = os.path.join(dump_dir,
                 "Overflow_info_{}_{}.pkl".format(get_time(), OverFlowUtil.real_overflow_dump_times))
@@ -152,9 +189,9 @@ def overflow_check(name, **kwargs):
                     write_api_info_json(forward_api_info[key])
                 for key in backward_api_info:
                     write_api_info_json(backward_api_info[key])
+                merge_api_info_json()
                 raise ValueError("[overflow {} times]: dump file is saved in '{}'."
                                  .format(OverFlowUtil.real_overflow_dump_times, os.path.realpath(dump_file_name)))
-                return
 
     def overflow_type_judge(in_feat, out_feat, module_name):
         if module_name.endswith(Const.BACKWARD):
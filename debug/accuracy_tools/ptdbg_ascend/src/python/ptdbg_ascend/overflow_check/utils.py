@@ -11,6 +11,7 @@ class OverFlowUtil(object):
     overflow_filter_switch = None
     real_overflow_dump_times = 0
     overflow_nums = 1
+    overflow_sync_interval = 1
 
     @staticmethod
     def set_overflow_check_switch(switch, filter_switch):
@@ -41,6 +42,98 @@ def set_overflow_check_switch(switch, filter_switch=Const.OFF):
     OverFlowUtil.set_overflow_check_switch(switch, filter_switch)
 
 
+class OverflowRecord(object):
+    def __init__(self, api_name, payload, flag):
+        self.api_name = api_name
+        self.payload = payload
+        self.flag = flag
+        self.has_overflow = False
+
+
+class OverflowAccumulator(object):
+    """
+    Collects per-API overflow flags as device tensors and pulls them to the host in one transfer
+    every sync_interval records, instead of one max/min host sync per API.
+    """
+    HALF_PRECISION_TYPES = [torch.float16, torch.float32, torch.bfloat16]
+
+    def __init__(self, sync_interval=1):
+        self.sync_interval = sync_interval
+        self.records = []
+
+    @staticmethod
+    def _tensor_overflow_flag(x):
+        tensor_max = torch._C._VariableFunctionsClass.max(x)
+        tensor_min = torch._C._VariableFunctionsClass.min(x)
+        extremum = torch._C._VariableFunctionsClass.stack([tensor_max, tensor_min])
+        flag = torch._C._VariableFunctionsClass.logical_not(
+            torch._C._VariableFunctionsClass.all(torch._C._VariableFunctionsClass.isfinite(extremum)))
+        if x.dtype in OverflowAccumulator.HALF_PRECISION_TYPES:
+            finfo = torch.finfo(x.dtype)
+            saturated = torch._C._VariableFunctionsClass.logical_or(
+                torch._C._VariableFunctionsClass.eq(tensor_max, finfo.max),
+                torch._C._VariableFunctionsClass.eq(tensor_min, finfo.min))
+            flag = torch._C._VariableFunctionsClass.logical_or(flag, saturated)
+        return flag
+
+    def overflow_flag(self, x):
+        """
+        Return the overflow flag of x without synchronizing: a 0-dim bool tensor on the device of x,
+        a python bool for scalars, or None when x can not overflow.
+        """
+        if isinstance(x, (tuple, list)):
+            flags = [self.overflow_flag(item) for item in x]
+            host_flag = any(flag is True for flag in flags)
+            device_flags = [flag for flag in flags if isinstance(flag, torch.Tensor)]
+            if host_flag:
+                return True
+            if not device_flags:
+                return None
+            if len(device_flags) == 1:
+                return device_flags[0]
+            return torch._C._VariableFunctionsClass.any(torch._C._VariableFunctionsClass.stack(device_flags))
+        if isinstance(x, torch.Tensor):
+            if x.numel() == 0 or not x.is_floating_point():
+                return None
+            return self._tensor_overflow_flag(x.detach())
+        if isinstance(x, (bool, int, float)):
+            return x == float('inf') or x == float('-inf') or x != x
+        return None
+
+    def record(self, api_name, x, payload=None):
+        """
+        Queue the overflow flag of x for api_name. Return True when sync_interval records are pending
+        and the caller should sync.
+        """
+        self.records.append(OverflowRecord(api_name, payload, self.overflow_flag(x)))
+        return len(self.records) >= self.sync_interval
+
+    def sync(self):
+        """
+        Pull every pending device flag to the host in one transfer and reset the ring.
+        Return the pending records in call order with has_overflow filled in.
+        """
+        records, self.records = self.records, []
+        device_records = [record for record in records if isinstance(record.flag, torch.Tensor)]
+        if device_records:
+            flags = torch._C._VariableFunctionsClass.stack([record.flag for record in device_records])
+            for record, flag in zip(device_records, flags.cpu().tolist()):
+                record.flag = flag
+        for record in records:
+            record.has_overflow = bool(record.flag)
+            record.flag = None
+        return records
+
+    def first_overflow(self):
+        """
+        Sync and return the first overflowing record in call order, or None.
+        """
+        return next((record for record in self.sync() if record.has_overflow), None)
+
+    def pending(self):
+        return len(self.records)
+
+
 def dump_overflow(module_name, in_feat, out_feat, dump_file):
     name_template = f"{module_name}" + "_{}"
     DumpUtil.dump_data_dir = make_dump_data_dir(dump_file)
@@ -20,6 +20,7 @@ import numpy as np
 from .utils import Util
 from .config import Const
 from .parse_exception import ParseException
+from .vector_compare import VectorCompare
 
 
 class Compare:
@@ -27,6 +28,7 @@ class Compare:
         self.util = Util()
         self.log = self.util.log
         self.vector_compare_result = {}
+        self.vector_compare = VectorCompare()
         self.msaccucmp = None
 
     @property
@@ -43,6 +45,9 @@ class Compare:
     def compare_vector(self, my_dump_path, golden_dump_path, result_dir):
         self.util.create_dir(result_dir)
         self.util.check_path_valid(result_dir)
+        # npy data is compared in process, msaccucmp is only needed for raw dump formats
+        if VectorCompare.is_npy_dump(my_dump_path) and VectorCompare.is_npy_dump(golden_dump_path):
+            return self.vector_compare.compare_npy_dirs(my_dump_path, golden_dump_path, result_dir)
         cmd = '%s %s compare -m %s -g %s -out %s' % (
             self.util.python, self.call_msaccucmp, my_dump_path, golden_dump_path, result_dir
         )
@@ -85,8 +90,8 @@ class Compare:
         if left is None or right is None:
             raise ParseException("invalid input or output")
         try:
-            left_data = np.load(left)
-            right_data = np.load(right)
+            left_data = np.load(left, mmap_mode='r')
+            right_data = np.load(right, mmap_mode='r')
         except UnicodeError as e:
             self.log.error("%s %s" % ("UnicodeError", str(e)))
             self.log.warning("Please check the npy file")
@@ -117,39 +122,105 @@ class Compare:
         self.util.print_panel("\n".join(content))
 
     def _do_compare_data(self, left, right, rl=0.001, al=0.001, diff_count=20):
-        data_left = left.astype(np.float32)
-        data_right = right.astype(np.float32)
-        shape_left = data_left.shape
-        shape_right = data_right.shape
-        if shape_left != shape_right:
-            self.log.warning("Data shape not equal: %s vs %s", data_left.shape, data_right.shape)
-        data_left = data_left.reshape(-1)
-        data_right = data_right.reshape(-1)
-        if data_left.shape[0] != data_right.shape[0]:
-            self.log.warning("Data size not equal: %s vs %s", data_left.shape, data_right.shape)
-            if data_left.shape[0] < data_right.shape[0]:
-                data_left = np.pad(data_left, (0, data_right.shape[0] - data_left.shape[0]), 'constant')
-            else:
-                data_right = np.pad(data_right, (0, data_left.shape[0] - data_right.shape[0]), 'constant')
-        all_close = np.allclose(data_left, data_right, atol=al, rtol=rl)
-        cos_sim = np.dot(data_left, data_right) / (
-                np.sqrt(np.dot(data_left, data_left)) * np.sqrt(np.dot(data_right, data_right)))
-        err_cnt = 0
-        total_cnt = data_left.shape[0]
+        stats = self.compute_compare_stats(left, right, rl, al, diff_count)
         diff_table_columns = ['Index', 'Left', 'Right', 'Diff']
         err_table = self.util.create_table("Error Item Table", diff_table_columns)
         top_table = self.util.create_table("Top Item Table", diff_table_columns)
-        for i in range(total_cnt):
-            abs_diff = abs(data_left[i] - data_right[i])
-            if i < diff_count:
-                top_table.add_row(str(i), str(data_left[i]), str(data_right[i]), str(abs_diff))
-            if abs_diff > (al + rl * abs(data_right[i])):
-                if err_cnt < diff_count:
-                    err_table.add_row(str(i), str(data_left[i]), str(data_right[i]), str(abs_diff))
-                err_cnt += 1
-        if total_cnt == 0:
-            err_percent = float(0)
-        else:  
-            err_percent = float(err_cnt / total_cnt)
-        self.util.print(self.util.create_columns([err_table, top_table]))
-        return total_cnt, all_close, cos_sim, err_percent
+        worst_table = self.util.create_table("Worst Item Table", diff_table_columns)
+        hist_table = self.util.create_table("Diff Histogram", ['Diff Range', 'Count'])
+        for table, rows in [(err_table, stats['err_items']), (top_table, stats['top_items']),
+                            (worst_table, stats['worst_items'])]:
+            for index, left_value, right_value, abs_diff in rows:
+                table.add_row(str(index), str(left_value), str(right_value), str(abs_diff))
+        for diff_range, count in stats['histogram']:
+            hist_table.add_row(diff_range, str(count))
+        self.util.print(self.util.create_columns([err_table, top_table, worst_table, hist_table]))
+        return stats['total_cnt'], stats['all_close'], stats['cos_sim'], stats['err_percent']
+
+    def compute_compare_stats(self, left, right, rl=0.001, al=0.001, diff_count=20):
+        """
+        Compute the compare statistics chunk by chunk with numpy, so memory stays bounded by
+        Const.COMPARE_CHUNK_SIZE whatever the tensor size. The shorter tensor is zero padded.
+        """
+        if left.shape != right.shape:
+            self.log.warning("Data shape not equal: %s vs %s", left.shape, right.shape)
+        data_left = left.reshape(-1)
+        data_right = right.reshape(-1)
+        if data_left.shape[0] != data_right.shape[0]:
+            self.log.warning("Data size not equal: %s vs %s", data_left.shape, data_right.shape)
+        total_cnt = max(data_left.shape[0], data_right.shape[0])
+        hist_edges = np.array(Const.COMPARE_HISTOGRAM_EDGES)
+        hist_counts = np.zeros(len(hist_edges), dtype=np.int64)
+        nan_cnt = 0
+        all_close = True
+        dot_left_right, dot_left, dot_right = 0.0, 0.0, 0.0
+        err_cnt = 0
+        err_items, top_items = [], []
+        worst_items = [np.array([], dtype=np.int64)] + [np.array([], dtype=np.float32)] * 3
+        for start in range(0, total_cnt, Const.COMPARE_CHUNK_SIZE):
+            end = min(start + Const.COMPARE_CHUNK_SIZE, total_cnt)
+            chunk_left = self._get_chunk(data_left, start, end)
+            chunk_right = self._get_chunk(data_right, start, end)
+            abs_diff = np.abs(chunk_left - chunk_right)
+            all_close = all_close and bool(np.allclose(chunk_left, chunk_right, atol=al, rtol=rl))
+            dot_left_right += float(np.dot(chunk_left, chunk_right))
+            dot_left += float(np.dot(chunk_left, chunk_left))
+            dot_right += float(np.dot(chunk_right, chunk_right))
+            # nan diffs are never counted as errors, as in the element-wise comparison
+            err_mask = abs_diff > (al + rl * np.abs(chunk_right))
+            err_cnt += int(np.count_nonzero(err_mask))
+            nan_mask = np.isnan(abs_diff)
+            nan_cnt += int(np.count_nonzero(nan_mask))
+            hist_counts += np.bincount(np.searchsorted(hist_edges, abs_diff[~nan_mask], side='right') - 1,
+                                       minlength=len(hist_edges))
+            if len(top_items) < diff_count:
+                top_index = np.arange(min(diff_count - len(top_items), end - start))
+                top_items.extend(self._gen_items(top_index, start, chunk_left, chunk_right, abs_diff))
+            if len(err_items) < diff_count:
+                err_index = np.flatnonzero(err_mask)[:diff_count - len(err_items)]
+                err_items.extend(self._gen_items(err_index, start, chunk_left, chunk_right, abs_diff))
+            if diff_count > 0:
+                worst_items = self._merge_worst_items(worst_items, start, chunk_left, chunk_right, abs_diff,
+                                                      diff_count)
+        cos_sim = dot_left_right / (np.sqrt(dot_left) * np.sqrt(dot_right)) \
+            if dot_left > 0 and dot_right > 0 else float('nan')
+        err_percent = float(err_cnt / total_cnt) if total_cnt else float(0)
+        histogram = [("[%g, %g)" % (low, high), int(count))
+                     for low, high, count in zip(hist_edges, list(hist_edges[1:]) + [np.inf], hist_counts)]
+        histogram.append(("nan", nan_cnt))
+        return {
+            'total_cnt': total_cnt,
+            'all_close': all_close,
+            'cos_sim': cos_sim,
+            'err_cnt': err_cnt,
+            'err_percent': err_percent,
+            'err_items': err_items,
+            'top_items': top_items,
+            'worst_items': list(zip(worst_items[0].tolist(), *worst_items[1:])),
+            'histogram': histogram
+        }
+
+    @staticmethod
+    def _get_chunk(data, start, end):
+        chunk = np.asarray(data[start:end], dtype=np.float32)
+        if chunk.shape[0] < end - start:
+            chunk = np.pad(chunk, (0, end - start - chunk.shape[0]), 'constant')
+        return chunk
+
+    @staticmethod
+    def _gen_items(index, offset, chunk_left, chunk_right, abs_diff):
+        return [(offset + i, chunk_left[i], chunk_right[i], abs_diff[i]) for i in index.tolist()]
+
+    @staticmethod
+    def _merge_worst_items(worst_items, offset, chunk_left, chunk_right, abs_diff, diff_count):
+        """Keep the diff_count largest diffs seen so far, sorted descending, nan counted as largest."""
+        chunk_index = np.arange(offset, offset + abs_diff.shape[0])
+        merged = [np.concatenate([worst, chunk]) for worst, chunk in
+                  zip(worst_items, [chunk_index, chunk_left, chunk_right, abs_diff])]
+        sort_key = -np.nan_to_num(merged[3], nan=np.inf)
+        if sort_key.shape[0] > diff_count:
+            keep = np.argpartition(sort_key, diff_count - 1)[:diff_count]
+            merged = [item[keep] for item in merged]
+            sort_key = sort_key[keep]
+        order = np.lexsort((merged[0], sort_key))
+        return [item[order] for item in merged]
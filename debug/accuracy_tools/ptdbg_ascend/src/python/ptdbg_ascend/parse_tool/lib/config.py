@@ -26,6 +26,7 @@ class Const:
     DATA_ROOT_DIR = os.path.join(ROOT_DIR, 'parse_data')
     DUMP_CONVERT_DIR = os.path.join(DATA_ROOT_DIR, 'dump_convert')
     COMPARE_DIR = os.path.join(DATA_ROOT_DIR, 'compare_result')
+    DUMP_INDEX_DIR = os.path.join(DATA_ROOT_DIR, 'dump_index')
     OFFLINE_DUMP_CONVERT_PATTERN = \
         r"^([A-Za-z0-9_-]+)\.([A-Za-z0-9_-]+)\.([0-9]+)(\.[0-9]+)?\.([0-9]{1,255})" \
         r"\.([a-z]+)\.([0-9]{1,255})(\.[x0-9]+)?\.npy$"
@@ -37,6 +38,12 @@ class Const:
     FILE_PATTERN = r'^[a-zA-Z0-9_./-]+$'
     ONE_GB = 1 * 1024 * 1024 * 1024
     TEN_GB = 10 * 1024 * 1024 * 1024
+    COMPARE_CHUNK_SIZE = 4 * 1024 * 1024
+    COMPARE_HISTOGRAM_EDGES = [0, 1e-6, 1e-5, 1e-4, 1e-3, 1e-2, 1e-1, 1]
+    VECTOR_COMPARE_BATCH_SIZE = 16 * 1024 * 1024
+    VECTOR_COMPARE_FILE_BATCH = 256
+    FLOAT_EPSILON = 1e-7
+    NAN = "NaN"
     HEADER = r"""    ____                     
        / __ \____ ______________ 
       / /_/ / __ `/ ___/ ___/ _ \
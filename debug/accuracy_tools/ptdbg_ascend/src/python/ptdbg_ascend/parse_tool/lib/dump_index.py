@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+# Copyright (C) 2022-2023. Huawei Technologies Co., Ltd. All rights reserved.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+import bisect
+import hashlib
+import itertools
+import json
+import os
+import numpy as np
+
+from .config import Const
+from .utils import Util
+from .parse_exception import ParseException
+
+
+class DumpIndex:
+    """
+    On-disk index of a dump directory: api name to pkl line offset and npy path, with the dtype,
+    shape and statistics recorded in the pkl. It is built once, saved under Const.DUMP_INDEX_DIR
+    and reused while the pkl files are unchanged, so lookups only seek to the matched lines and
+    tensors are memory mapped on demand.
+    """
+    def __init__(self, dump_path):
+        self.util = Util()
+        self.dump_path = os.path.realpath(self.util.path_strip(dump_path))
+        index_name = hashlib.sha256(self.dump_path.encode()).hexdigest()[:16] + ".json"
+        self.index_file = os.path.join(Const.DUMP_INDEX_DIR, index_name)
+        self.pkl_files = {}
+        self.records = {}
+        self.api_names = []
+
+    @staticmethod
+    def _file_stat(path):
+        stat = os.stat(path)
+        return [stat.st_size, stat.st_mtime]
+
+    @staticmethod
+    def get_npy_path(pkl_path, api_name):
+        # npy files are dumped into the directory named after the pkl file
+        return os.path.join(os.path.splitext(pkl_path)[0], api_name + Const.NPY_SUFFIX)
+
+    def load(self, rebuild=False):
+        self.util.check_path_valid(self.dump_path)
+        if rebuild or not self._load_index_file():
+            self.build()
+            self.save()
+        self.api_names = sorted(self.records)
+        return self
+
+    def build(self):
+        self.util.log.info("Build dump index for %s.", self.dump_path)
+        self.pkl_files, self.records = {}, {}
+        for pkl_path in self._list_pkl_files():
+            self.pkl_files[pkl_path] = self._file_stat(pkl_path)
+            self._index_pkl(pkl_path)
+
+    def save(self):
+        self.util.create_dir(Const.DUMP_INDEX_DIR)
+        index = {"dump_path": self.dump_path, "pkl_files": self.pkl_files, "records": self.records}
+        with os.fdopen(os.open(self.index_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o640), "w") as f:
+            json.dump(index, f)
+
+    def is_current(self, pkl_path):
+        """Return whether pkl_path is indexed and unchanged since it was indexed."""
+        pkl_path = os.path.realpath(pkl_path)
+        return pkl_path in self.pkl_files and os.path.isfile(pkl_path) and \
+            self._file_stat(pkl_path) == self.pkl_files[pkl_path]
+
+    def reindex_pkl(self, pkl_path):
+        """Index pkl_path again after it was dumped, appended or rewritten, and save the index."""
+        pkl_path = os.path.realpath(pkl_path)
+        self.util.log.info("Update dump index for %s.", pkl_path)
+        for name in list(self.records):
+            entries = [entry for entry in self.records[name] if entry["pkl"] != pkl_path]
+            if entries:
+                self.records[name] = entries
+            else:
+                del self.records[name]
+        self.pkl_files[pkl_path] = self._file_stat(pkl_path)
+        self._index_pkl(pkl_path)
+        self.api_names = sorted(self.records)
+        self.save()
+
+    def find_records(self, api_name, pkl_path=None):
+        """Return the pkl messages whose name starts with api_name, in pkl file order."""
+        pkl_path = os.path.realpath(pkl_path) if pkl_path else None
+        locations = []
+        start = bisect.bisect_left(self.api_names, api_name)
+        for name in self.api_names[start:]:
+            if not name.startswith(api_name):
+                break
+            locations.extend((entry["pkl"], entry["offset"]) for entry in self.records[name]
+                             if pkl_path is None or entry["pkl"] == pkl_path)
+        messages = []
+        for path, path_locations in itertools.groupby(sorted(locations), key=lambda location: location[0]):
+            with open(path, "rb") as pkl_handle:
+                for _, offset in path_locations:
+                    pkl_handle.seek(offset)
+                    messages.append(json.loads(pkl_handle.readline()))
+        return messages
+
+    def get_npy_info(self, npy_path):
+        """Return the (dtype, shape, [max, min, mean]) recorded in the pkl for npy_path, or None."""
+        npy_path = os.path.realpath(npy_path)
+        api_name = os.path.basename(npy_path)[:-len(Const.NPY_SUFFIX)]
+        for entry in self.records.get(api_name, []):
+            if "stats" in entry and self.get_npy_path(entry["pkl"], api_name) == npy_path and \
+                    self.is_current(entry["pkl"]):
+                return entry["dtype"], entry["shape"], entry["stats"]
+        return None
+
+    def load_npy(self, api_name, pkl_path=None):
+        pkl_path = os.path.realpath(pkl_path) if pkl_path else None
+        for entry in self.records.get(api_name, []):
+            npy_path = self.get_npy_path(entry["pkl"], api_name)
+            if (pkl_path is None or entry["pkl"] == pkl_path) and os.path.isfile(npy_path):
+                return np.load(npy_path, mmap_mode='r')
+        self.util.log.error("No npy file of %s in dump index." % api_name)
+        raise ParseException(ParseException.PARSE_NO_FILE_ERROR)
+
+    def _load_index_file(self):
+        if not os.path.isfile(self.index_file):
+            return False
+        try:
+            with open(self.index_file, "r") as f:
+                index = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return False
+        if index.get("dump_path") != self.dump_path:
+            return False
+        # pkl files dumped or removed since the index was saved also make it stale
+        pkl_files = index.get("pkl_files", {})
+        if sorted(pkl_files) != self._list_pkl_files():
+            return False
+        for pkl_path, file_stat in pkl_files.items():
+            if self._file_stat(pkl_path) != file_stat:
+                return False
+        self.pkl_files = index["pkl_files"]
+        self.records = index["records"]
+        return True
+
+    def _list_pkl_files(self):
+        pkl_paths = []
+        for dir_path, _, file_names in os.walk(self.dump_path):
+            pkl_paths.extend(os.path.join(dir_path, name) for name in file_names if name.endswith(Const.PKL_SUFFIX))
+        return sorted(pkl_paths)
+
+    def _index_pkl(self, pkl_path):
+        offset = 0
+        with open(pkl_path, "rb") as pkl_handle:
+            for pkl_line in pkl_handle:
+                line_offset, offset = offset, offset + len(pkl_line)
+                if not pkl_line.strip():
+                    continue
+                try:
+                    msg = json.loads(pkl_line)
+                except json.JSONDecodeError as e:
+                    self.util.log.error("%s %s in line %s" % ("JSONDecodeError", str(e), pkl_line))
+                    self.util.log.warning("Please check the pkl file")
+                    raise ParseException(ParseException.PARSE_JSONDECODE_ERROR) from e
+                entry = {"pkl": pkl_path, "offset": line_offset}
+                if len(msg) > 5:
+                    entry.update({"dtype": msg[3], "shape": msg[4], "stats": msg[5]})
+                self.records.setdefault(msg[0], []).append(entry)
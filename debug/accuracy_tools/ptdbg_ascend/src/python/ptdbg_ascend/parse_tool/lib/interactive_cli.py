@@ -60,6 +60,9 @@ class InteractiveCli(cmd.Cmd):
     def do_pt(self, line=""):
         self.parse_tool.do_print_data(self._parse_argv(line))
 
+    def do_ix(self, line=""):
+        self.parse_tool.do_build_index(self._parse_argv(line))
+
     def do_pk(self, line=""):
         self.parse_tool.do_parse_pkl(self._parse_argv(line))
 
@@ -114,6 +114,25 @@ class ParseTool:
         args = parser.parse_args(argv)
         self.visual.parse_pkl(args.file_name, args.api_name)
 
+    @catch_exception
+    def do_build_index(self, argv=None):
+        parser = argparse.ArgumentParser()
+        parser.add_argument(
+            '-d', '--dump_path', dest='dump_path', default=None, required=True, help='dump data directory')
+        parser.add_argument(
+            '-r', '--rebuild', dest='rebuild', action='store_true', help='rebuild the index from scratch')
+        args = parser.parse_args(argv)
+        self.util.check_path_valid(args.dump_path)
+        if not os.path.isdir(args.dump_path):
+            self.util.log.error("Please enter a directory not a file")
+            raise ParseException(ParseException.PARSE_INVALID_PATH_ERROR)
+        dump_index = self.visual.load_dump_index(args.dump_path, args.rebuild)
+        self.util.print_panel("\n".join([
+            "DumpPath:  %s" % dump_index.dump_path,
+            "PklFiles:  %s" % len(dump_index.pkl_files),
+            "ApiItems:  %s" % len(dump_index.records),
+            "IndexFile: %s" % dump_index.index_file]))
+
     @catch_exception
     def do_compare_data(self, argv):
         """compare two tensor"""
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+# Copyright (C) 2022-2023. Huawei Technologies Co., Ltd. All rights reserved.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+import csv
+import os
+import time
+import numpy as np
+
+from .config import Const
+from .utils import Util
+
+
+class VectorCompare:
+    """
+    In-process counterpart of the msaccucmp vector comparison for data already in npy format.
+    Tensor pairs are compared in batches: the flattened pairs are concatenated and every metric
+    is reduced per segment, so many small tensors cost a few numpy calls instead of one process.
+    Pairs larger than Const.COMPARE_CHUNK_SIZE are reduced chunk by chunk on their own.
+    """
+    METRICS = ["CosineSimilarity", "MaxAbsoluteError", "AccumulatedRelativeError", "RelativeEuclideanDistance",
+               "StandardDeviation", "MeanAbsoluteError", "RootMeanSquareError", "MaxRelativeError",
+               "MeanRelativeError"]
+    HEADER = ["Index", "MyTensor", "GoldenTensor", "Shape"] + METRICS + ["ErrorMessage"]
+
+    def __init__(self):
+        self.util = Util()
+        self.log = self.util.log
+
+    @staticmethod
+    def _safe_div(numerator, denominator):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(denominator > 0, numerator / np.where(denominator > 0, denominator, 1), np.nan)
+
+    def compare_arrays(self, pairs):
+        """
+        Compare a batch of (my_data, golden_data) arrays. Return one metric dict per pair, with an
+        error message instead of metrics when the pair can not be compared.
+        """
+        results = [None] * len(pairs)
+        batch, batch_size = [], 0
+        for idx, (my_data, golden_data) in enumerate(pairs):
+            error_message = self._check_pair(my_data, golden_data)
+            if error_message:
+                results[idx] = {"ErrorMessage": error_message}
+                continue
+            if my_data.size > Const.COMPARE_CHUNK_SIZE:
+                # an oversized pair would be copied whole into the batch, reduce it chunk by chunk instead
+                results[idx] = self._compare_chunked(my_data, golden_data)
+                continue
+            batch.append(idx)
+            batch_size += my_data.size
+            if batch_size >= Const.VECTOR_COMPARE_BATCH_SIZE:
+                self._compare_batch(pairs, batch, results)
+                batch, batch_size = [], 0
+        if batch:
+            self._compare_batch(pairs, batch, results)
+        return results
+
+    def compare_npy_dirs(self, my_dump_path, golden_dump_path, result_dir):
+        """Compare the npy files found under both paths by relative path and write a csv result."""
+        my_files = self._list_npy_files(my_dump_path)
+        golden_files = self._list_npy_files(golden_dump_path)
+        names = sorted(set(my_files) & set(golden_files))
+        for name in sorted(set(my_files) ^ set(golden_files)):
+            self.log.warning("No matched data for %s, skip it.", name)
+        if not names:
+            self.log.error("No matched npy files in %s and %s." % (my_dump_path, golden_dump_path))
+            return -1
+        rows = []
+        for start in range(0, len(names), Const.VECTOR_COMPARE_FILE_BATCH):
+            batch_names = names[start:start + Const.VECTOR_COMPARE_FILE_BATCH]
+            pairs, pair_names, load_errors = [], [], {}
+            for name in batch_names:
+                try:
+                    pairs.append((np.load(my_files[name], mmap_mode='r'), np.load(golden_files[name], mmap_mode='r')))
+                except (ValueError, OSError) as e:
+                    # object arrays can not be memory mapped, report the pair and go on with the others
+                    self.log.error("Load npy files of %s failed: %s" % (name, str(e)))
+                    load_errors[name] = {"ErrorMessage": "load npy failed"}
+                    continue
+                pair_names.append(name)
+            results = dict(zip(pair_names, zip(pairs, self.compare_arrays(pairs))))
+            for offset, name in enumerate(batch_names):
+                my_data, result = None, load_errors.get(name)
+                if name in results:
+                    (my_data, _), result = results.get(name)
+                rows.append(self._gen_row(start + offset, my_files[name], golden_files[name], my_data, result))
+        result_file = os.path.join(result_dir, "result_%s.csv" % time.strftime("%Y%m%d%H%M%S"))
+        with os.fdopen(os.open(result_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o640), "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(self.HEADER)
+            writer.writerows(rows)
+        self.log.info("The comparison result have been written to \"%s\".", result_file)
+        return 0
+
+    def _check_pair(self, my_data, golden_data):
+        if my_data.shape != golden_data.shape:
+            return "shape unmatched: %s vs %s" % (my_data.shape, golden_data.shape)
+        if my_data.size == 0:
+            return "empty data"
+        if my_data.dtype == object or golden_data.dtype == object:
+            return "unsupported dtype"
+        return ""
+
+    def _compare_batch(self, pairs, batch, results):
+        my_data = np.concatenate([np.asarray(pairs[idx][0], dtype=np.float64).reshape(-1) for idx in batch])
+        golden_data = np.concatenate([np.asarray(pairs[idx][1], dtype=np.float64).reshape(-1) for idx in batch])
+        sizes = np.array([pairs[idx][0].size for idx in batch], dtype=np.float64)
+        starts = np.concatenate([[0], np.cumsum(sizes[:-1])]).astype(np.int64)
+        metrics = self._gen_metrics(self._segment_sums(my_data, golden_data, starts), sizes)
+        for pos, idx in enumerate(batch):
+            results[idx] = self._gen_result(metrics, pos)
+
+    def _compare_chunked(self, my_data, golden_data):
+        """
+        Compare one oversized pair Const.COMPARE_CHUNK_SIZE elements at a time, so only one float64
+        chunk of each tensor is in memory whatever the tensor size.
+        """
+        my_data = my_data.reshape(-1)
+        golden_data = golden_data.reshape(-1)
+        sums = None
+        for start in range(0, my_data.size, Const.COMPARE_CHUNK_SIZE):
+            end = min(start + Const.COMPARE_CHUNK_SIZE, my_data.size)
+            chunk_sums = self._segment_sums(np.asarray(my_data[start:end], dtype=np.float64),
+                                            np.asarray(golden_data[start:end], dtype=np.float64),
+                                            np.zeros(1, dtype=np.int64))
+            if sums is None:
+                sums = chunk_sums
+                continue
+            for name, value in chunk_sums.items():
+                sums[name] = np.maximum(sums[name], value) if name.startswith("max") else sums[name] + value
+        return self._gen_result(self._gen_metrics(sums, np.array([my_data.size], dtype=np.float64)), 0)
+
+    @staticmethod
+    def _segment_sums(my_data, golden_data, starts):
+        """Reduce the flattened data to the per segment sums and maxima every metric is derived from."""
+        abs_diff = np.abs(my_data - golden_data)
+        abs_golden = np.abs(golden_data)
+        rel_diff = abs_diff / np.maximum(abs_golden, Const.FLOAT_EPSILON)
+        return {
+            "sum_my": np.add.reduceat(my_data, starts),
+            "sum_golden": np.add.reduceat(golden_data, starts),
+            "sum_my_square": np.add.reduceat(my_data * my_data, starts),
+            "sum_golden_square": np.add.reduceat(golden_data * golden_data, starts),
+            "sum_my_golden": np.add.reduceat(my_data * golden_data, starts),
+            "sum_diff_square": np.add.reduceat(abs_diff * abs_diff, starts),
+            "sum_abs_diff": np.add.reduceat(abs_diff, starts),
+            "sum_abs_golden": np.add.reduceat(abs_golden, starts),
+            "sum_rel_diff": np.add.reduceat(rel_diff, starts),
+            "max_abs_diff": np.maximum.reduceat(abs_diff, starts),
+            "max_rel_diff": np.maximum.reduceat(rel_diff, starts),
+        }
+
+    def _gen_metrics(self, sums, sizes):
+        my_mean = sums["sum_my"] / sizes
+        golden_mean = sums["sum_golden"] / sizes
+        my_variance = np.maximum(sums["sum_my_square"] / sizes - my_mean * my_mean, 0)
+        golden_variance = np.maximum(sums["sum_golden_square"] / sizes - golden_mean * golden_mean, 0)
+        return {
+            "CosineSimilarity": self._safe_div(sums["sum_my_golden"],
+                                               np.sqrt(sums["sum_my_square"]) * np.sqrt(sums["sum_golden_square"])),
+            "MaxAbsoluteError": sums["max_abs_diff"],
+            "AccumulatedRelativeError": self._safe_div(sums["sum_abs_diff"], sums["sum_abs_golden"]),
+            "RelativeEuclideanDistance": self._safe_div(np.sqrt(sums["sum_diff_square"]),
+                                                        np.sqrt(sums["sum_golden_square"])),
+            "MyStandardDeviation": np.sqrt(my_variance),
+            "GoldenStandardDeviation": np.sqrt(golden_variance),
+            "MeanAbsoluteError": sums["sum_abs_diff"] / sizes,
+            "RootMeanSquareError": np.sqrt(sums["sum_diff_square"] / sizes),
+            "MaxRelativeError": sums["max_rel_diff"],
+            "MeanRelativeError": sums["sum_rel_diff"] / sizes,
+        }
+
+    @staticmethod
+    def _gen_result(metrics, pos):
+        result = {name: float(value[pos]) for name, value in metrics.items()}
+        result["StandardDeviation"] = (result.pop("MyStandardDeviation"), result.pop("GoldenStandardDeviation"))
+        return result
+
+    def _gen_row(self, index, my_file, golden_file, my_data, result):
+        row = [index, my_file, golden_file, str(tuple(my_data.shape)) if my_data is not None else Const.NAN]
+        if "ErrorMessage" in result:
+            return row + [Const.NAN] * len(self.METRICS) + [result["ErrorMessage"]]
+        for name in self.METRICS:
+            if name == "StandardDeviation":
+                row.append("(%.6f;%.6f)" % result[name])
+            else:
+                row.append("%.6f" % result[name])
+        return row + [""]
+
+    @staticmethod
+    def is_npy_dump(path):
+        """Return True when path only holds npy files, which need no msaccucmp conversion."""
+        has_npy = False
+        for _, _, file_names in os.walk(path):
+            for name in file_names:
+                if not name.endswith(Const.NPY_SUFFIX):
+                    return False
+                has_npy = True
+        return has_npy
+
+    @staticmethod
+    def _list_npy_files(path):
+        npy_files = {}
+        for dir_path, _, file_names in os.walk(path):
+            for name in file_names:
+                if name.endswith(Const.NPY_SUFFIX):
+                    file_path = os.path.join(dir_path, name)
+                    npy_files[os.path.relpath(file_path, path)] = file_path
+        return npy_files
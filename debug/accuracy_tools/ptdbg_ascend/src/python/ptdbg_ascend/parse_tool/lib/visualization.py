@@ -14,10 +14,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """
-import json
+import os
 import numpy as np
 
 from .config import Const
+from .dump_index import DumpIndex
 from .utils import Util
 from .parse_exception import ParseException
 
@@ -25,20 +26,43 @@ from .parse_exception import ParseException
 class Visualization:
     def __init__(self):
         self.util = Util()
+        self.dump_indexes = {}
+
+    def load_dump_index(self, dump_path, rebuild=False):
+        dump_path = os.path.realpath(self.util.path_strip(dump_path))
+        if rebuild or dump_path not in self.dump_indexes:
+            self.dump_indexes[dump_path] = DumpIndex(dump_path).load(rebuild)
+        return self.dump_indexes.get(dump_path)
+
+    def find_dump_index(self, file_path):
+        """Return the loaded index whose dump directory contains file_path, if any."""
+        real_path = os.path.realpath(file_path)
+        for dump_path, dump_index in self.dump_indexes.items():
+            if real_path.startswith(dump_path + os.sep):
+                return dump_index
+        return None
 
     def print_npy_summary(self, target_file):
         try:
-            np_data = np.load(target_file, allow_pickle=True)
+            np_data = np.load(target_file, mmap_mode='r')
         except UnicodeError as e:
             self.util.log.error("%s %s" % ("UnicodeError", str(e)))
             self.util.log.warning("Please check the npy file")
-            raise ParseException(ParseException.PARSE_UNICODE_ERROR)
+            raise ParseException(ParseException.PARSE_UNICODE_ERROR) from e
+        except ValueError:
+            # object arrays can not be memory mapped
+            try:
+                np_data = np.load(target_file, allow_pickle=True)
+            except (ValueError, OSError) as e:
+                self.util.log.error("%s %s" % ("Load npy file failed", str(e)))
+                self.util.log.warning("Please check the npy file")
+                raise ParseException(ParseException.PARSE_LOAD_NPY_ERROR) from e
         table = self.util.create_table('', ['Index', 'Data'])
-        flatten_data = np_data.flatten()
+        flatten_data = np_data.reshape(-1)
         for i in range(min(16, int(np.ceil(flatten_data.size / 8)))):
             last_idx = min(flatten_data.size, i * 8 + 8)
-            table.add_row(str(i * 8), ' '.join(flatten_data[i * 8: last_idx].astype('str').tolist()))
-        summary = ['[yellow]%s[/yellow]' % self.util.gen_npy_info_txt(np_data), 'Path: %s' % target_file,
+            table.add_row(str(i * 8), ' '.join(np.asarray(flatten_data[i * 8: last_idx]).astype('str').tolist()))
+        summary = ['[yellow]%s[/yellow]' % self._gen_npy_info_txt(target_file, np_data), 'Path: %s' % target_file,
                    "TextFile: %s.txt" % target_file]
         self.util.print_panel(self.util.create_columns([table, "\n".join(summary)]), target_file)
         self.util.save_npy_to_txt(np_data, target_file + "txt")
@@ -53,35 +77,33 @@ class Visualization:
         path = self.util.path_strip(path)
         self.util.check_path_valid(path)
         self.util.check_path_format(path, Const.PKL_SUFFIX)
-        with open(path, "r") as pkl_handle:
-            title_printed = False
-            while True:
-                pkl_line = pkl_handle.readline()
-                if pkl_line == '\n':
+        dump_index = self.find_dump_index(path) or self.load_dump_index(os.path.dirname(path))
+        # the index is kept for the session, a pkl dumped or changed since then is indexed again
+        if not dump_index.is_current(path):
+            dump_index.reindex_pkl(path)
+        title_printed = False
+        for msg in dump_index.find_records(api_name, path):
+            info_prefix = msg[0]
+            if info_prefix.find("stack_info") != -1 and len(msg) == 2:
+                print("\nTrace back({}):".format(msg[0]))
+                if msg[1] and len(msg[1]) > 4:
+                    for item in reversed(msg[1]):
+                        print("  File \"{}\", line {}, in {}".format(item[0], item[1], item[2]))
+                        print("    {}".format(item[3]))
                     continue
-                if len(pkl_line) == 0:
-                    break
-                try:
-                    msg = json.loads(pkl_line)
-                except json.JSONDecodeError as e:
-                    self.util.log.error("%s %s in line %s" % ("JSONDecodeError", str(e), pkl_line))
-                    self.util.log.warning("Please check the pkl file")
-                    raise ParseException(ParseException.PARSE_JSONDECODE_ERROR)
-                info_prefix = msg[0]
-                if not info_prefix.startswith(api_name):
-                    continue
-                if info_prefix.find("stack_info") != -1 and len(msg) == 2:
-                    print("\nTrace back({}):".format(msg[0]))
-                    if msg[1] and len(msg[1]) > 4:
-                        for item in reversed(msg[1]):
-                            print("  File \"{}\", line {}, in {}".format(item[0], item[1], item[2]))
-                            print("    {}".format(item[3]))
-                        continue
-                if len(msg) > 5:
-                    summery_info = "  [{}][dtype: {}][shape: {}][max: {}][min: {}][mean: {}]" \
-                        .format(msg[0], msg[3], msg[4], msg[5][0], msg[5][1], msg[5][2])
-                    if not title_printed:
-                        print("\nStatistic Info:")
-                        title_printed = True
-                    print(summery_info)
-            pkl_handle.close()
+            if len(msg) > 5:
+                summery_info = "  [{}][dtype: {}][shape: {}][max: {}][min: {}][mean: {}]" \
+                    .format(msg[0], msg[3], msg[4], msg[5][0], msg[5][1], msg[5][2])
+                if not title_printed:
+                    print("\nStatistic Info:")
+                    title_printed = True
+                print(summery_info)
+
+    def _gen_npy_info_txt(self, target_file, np_data):
+        dump_index = self.find_dump_index(target_file)
+        npy_info = dump_index.get_npy_info(target_file) if dump_index else None
+        if not npy_info:
+            return self.util.gen_npy_info_txt(np_data)
+        dtype, shape, stats = npy_info
+        return '[Shape: %s] [Dtype: %s] [Max: %s] [Min: %s] [Mean: %s]' % \
+            (tuple(shape), dtype, stats[0], stats[1], stats[2])
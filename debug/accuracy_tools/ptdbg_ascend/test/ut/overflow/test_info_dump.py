@@ -1,3 +1,4 @@
+import json
 import unittest
 import torch
 import os
@@ -13,10 +14,12 @@ class TestInfoDump(unittest.TestCase):
         self.backward_api_info = info_dump.BackwardAPIInfo('test_api', (1, 2, 3))
         self.dump_path = './'
         self.json_file_path = os.path.join(self.dump_path, 'test.json')
+        self.json_lines_path = os.path.join(self.dump_path, 'test.jsonl')
 
     def tearDown(self):
-        if os.path.exists(self.file_path):
-            os.remove(self.file_path)
+        for file_path in [self.file_path, self.json_lines_path]:
+            if os.path.exists(file_path):
+                os.remove(file_path)
 
     def test_write_npy(self):
         npy_path = info_dump.write_npy(self.file_path, self.tensor)
@@ -78,9 +81,28 @@ class TestInfoDump(unittest.TestCase):
 
     def test_write_api_info_json(self):
         info_dump.write_api_info_json(self.forward_api_info)
-        self.assertTrue(os.path.exists(os.path.join(self.dump_path, f'forward_info_{self.forward_api_info.rank}.json')))
-        if os.path.exists(os.path.join(self.dump_path, f'forward_info_{self.forward_api_info.rank}.json')):
-            os.remove(os.path.join(self.dump_path, f'forward_info_{self.forward_api_info.rank}.json'))
+        merged_files = info_dump.merge_api_info_json(self.forward_api_info.rank)
+        json_path = os.path.join(self.dump_path, f'forward_info_{self.forward_api_info.rank}.json')
+        self.assertIn(json_path, merged_files)
+        with open(json_path) as f:
+            self.assertIn('test_api', json.load(f))
+        for prefix in ['forward_info', 'stack_info']:
+            for suffix in ['.json', '.jsonl']:
+                file_path = os.path.join(self.dump_path, f'{prefix}_{self.forward_api_info.rank}{suffix}')
+                if os.path.exists(file_path):
+                    os.remove(file_path)
+
+    def test_json_lines_writer(self):
+        writer = info_dump.JsonLinesWriter(flush_size=2)
+        writer.append(self.json_lines_path, {'api_1': [1]})
+        self.assertFalse(os.path.exists(self.json_lines_path))
+        writer.append(self.json_lines_path, {'api_2': [2]})
+        self.assertTrue(os.path.exists(self.json_lines_path))
+        writer.append(self.json_lines_path, {'api_1': [3]})
+        writer.flush()
+        with open(self.json_lines_path, 'a') as f:
+            f.write('{"api_3": [')
+        self.assertEqual(info_dump.read_json_lines(self.json_lines_path), {'api_1': [3], 'api_2': [2]})
 
     def test_write_json(self):
         info_dump.write_json(self.json_file_path, {'test': 'data'})
@@ -1,10 +1,14 @@
 # coding=utf-8
+import functools
 import os
 import pytest
 import unittest
+from unittest.mock import MagicMock, patch
+import torch
 from ptdbg_ascend.overflow_check import overflow_check
 from ptdbg_ascend.overflow_check import utils
 from ptdbg_ascend.overflow_check.utils import OverFlowUtil, dump_overflow
+from ptdbg_ascend.dump.utils import DumpUtil
 
 ON = "ON"
 OFF = "OFF"
@@ -51,3 +55,65 @@ class TestUtilsMethods(unittest.TestCase):
         res = overflow_check.check_overflow_environment(pid)
         self.assertEqual(res, True)
 
+
+    def test_flush_overflow_check_handles_every_record(self):
+        handled = []
+
+        def payload(api_name, has_overflow):
+            handled.append((api_name, has_overflow))
+            if has_overflow:
+                raise ValueError("overflow_nums reached")
+
+        accumulator = overflow_check.overflow_accumulator
+        accumulator.record("Torch_add_0_forward", torch.tensor([float('inf')]),
+                           functools.partial(payload, "Torch_add_0_forward"))
+        accumulator.record("Torch_mul_0_forward", torch.tensor([1.0]), functools.partial(payload, "Torch_mul_0_forward"))
+        with pytest.raises(ValueError):
+            overflow_check.flush_overflow_check()
+        self.assertEqual(handled, [("Torch_add_0_forward", True), ("Torch_mul_0_forward", False)])
+        self.assertEqual(accumulator.pending(), 0)
+
+    def test_overflow_hook_with_sync_interval_reports_first_overflow(self):
+        sync_interval = 3
+        api_names = ["Torch_add_0_forward", "Torch_mul_1_forward", "Torch_sub_2_forward"]
+        out_feats = [torch.tensor([1.0]), torch.tensor([float('inf')]), torch.tensor([float('nan')])]
+        mock_npu = MagicMock()
+        mock_npu._C._npu_is_support_inf_nan.return_value = True
+        saved_settings = (OverFlowUtil.overflow_sync_interval, OverFlowUtil.overflow_nums,
+                          OverFlowUtil.real_overflow_dump_times, DumpUtil.dump_path, DumpUtil.dump_switch_mode,
+                          overflow_check.dump.pkl_name)
+        OverFlowUtil.overflow_sync_interval = sync_interval
+        OverFlowUtil.overflow_nums = 1
+        OverFlowUtil.real_overflow_dump_times = 0
+        DumpUtil.dump_path = os.path.join("dump_dir", "dump.pkl")
+        DumpUtil.dump_switch_mode = "all"
+        try:
+            with patch.object(overflow_check, "torch_npu", mock_npu, create=True), \
+                    patch.object(overflow_check, "check_overflow_environment", return_value=True), \
+                    patch.object(overflow_check, "get_tensor_rank", return_value=None), \
+                    patch.object(overflow_check, "create_dirs_if_not_exist",
+                                 return_value=os.path.join("dump_dir", "rank0", "dump.pkl")), \
+                    patch.object(overflow_check, "ForwardAPIInfo"), \
+                    patch.object(overflow_check, "write_api_info_json"), \
+                    patch.object(overflow_check, "merge_api_info_json"), \
+                    patch.object(overflow_check, "dump_overflow") as mock_dump_overflow, \
+                    patch.object(overflow_check.dump, "write_to_disk"):
+                for index, (api_name, out_feat) in enumerate(zip(api_names, out_feats)):
+                    module = MagicMock(input_args=(torch.tensor([1.0]),), input_kwargs={})
+                    hook = overflow_check.overflow_check(api_name, pid=os.getpid())
+                    if index < sync_interval - 1:
+                        hook(module, (torch.tensor([1.0]),), out_feat)
+                        mock_dump_overflow.assert_not_called()
+                    else:
+                        with pytest.raises(ValueError):
+                            hook(module, (torch.tensor([1.0]),), out_feat)
+                mock_dump_overflow.assert_called_once()
+                self.assertEqual(mock_dump_overflow.call_args[0][0], "Torch_mul_1_forward")
+                self.assertEqual(OverFlowUtil.real_overflow_dump_times, 1)
+                self.assertEqual(overflow_check.overflow_accumulator.pending(), 0)
+        finally:
+            OverFlowUtil.overflow_sync_interval, OverFlowUtil.overflow_nums, OverFlowUtil.real_overflow_dump_times, \
+                DumpUtil.dump_path, DumpUtil.dump_switch_mode, overflow_check.dump.pkl_name = saved_settings
+            overflow_check.overflow_accumulator.records = []
+            overflow_check.api_overflow.clear()
+            overflow_check.forward_api_info.clear()
@@ -1,8 +1,9 @@
 # coding=utf-8
 import pytest
 import unittest
+import torch
 from ptdbg_ascend.overflow_check import utils
-from ptdbg_ascend.overflow_check.utils import OverFlowUtil, dump_overflow
+from ptdbg_ascend.overflow_check.utils import OverFlowUtil, OverflowAccumulator, dump_overflow
 
 ON = "ON"
 OFF = "OFF"
@@ -56,3 +57,30 @@ class TestUtilsMethods(unittest.TestCase):
         utils.set_overflow_check_switch(ON, ON)
         self.assertEqual(OverFlowUtil.overflow_check_switch, ON)
         self.assertEqual(OverFlowUtil.overflow_filter_switch, ON)
+
+    def test_overflow_accumulator_sync_interval(self):
+        accumulator = OverflowAccumulator(sync_interval=3)
+        self.assertFalse(accumulator.record("Torch_add_0_forward", torch.tensor([1.0, 2.0])))
+        self.assertFalse(accumulator.record("Torch_mul_0_forward", torch.tensor([1, 2])))
+        self.assertTrue(accumulator.record("Torch_div_0_forward", [torch.tensor([1.0]), 2.0]))
+        records = accumulator.sync()
+        self.assertEqual([record.has_overflow for record in records], [False, False, False])
+        self.assertEqual(accumulator.pending(), 0)
+
+    def test_overflow_accumulator_first_overflow(self):
+        accumulator = OverflowAccumulator(sync_interval=8)
+        accumulator.record("Torch_add_0_forward", torch.tensor([1.0, 2.0]))
+        accumulator.record("Torch_div_0_forward", (torch.tensor([1.0]), torch.tensor([float('nan')])), "payload")
+        accumulator.record("Torch_exp_0_forward", torch.tensor([float('inf')]))
+        record = accumulator.first_overflow()
+        self.assertEqual(record.api_name, "Torch_div_0_forward")
+        self.assertEqual(record.payload, "payload")
+        self.assertIsNone(accumulator.first_overflow())
+
+    def test_overflow_accumulator_overflow_flag(self):
+        accumulator = OverflowAccumulator()
+        self.assertTrue(accumulator.overflow_flag(torch.tensor([65504.0], dtype=torch.float16)).item())
+        self.assertTrue(accumulator.overflow_flag(float('-inf')))
+        self.assertFalse(accumulator.overflow_flag(1))
+        self.assertIsNone(accumulator.overflow_flag(torch.tensor([], dtype=torch.float32)))
+        self.assertIsNone(accumulator.overflow_flag(torch.tensor([True])))
@@ -0,0 +1,104 @@
+# coding=utf-8
+import contextlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from ptdbg_ascend.parse_tool.lib.config import Const
+from ptdbg_ascend.parse_tool.lib.dump_index import DumpIndex
+from ptdbg_ascend.parse_tool.lib.visualization import Visualization
+
+
+class TestDumpIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = os.path.realpath(tempfile.mkdtemp())
+        self.index_dir = Const.DUMP_INDEX_DIR
+        Const.DUMP_INDEX_DIR = os.path.join(self.temp_dir, "dump_index")
+        self.rank_dir = os.path.join(self.temp_dir, "dump", "rank0")
+        os.makedirs(os.path.join(self.rank_dir, "api_stack_dump"))
+        self.pkl_path = os.path.join(self.rank_dir, "api_stack_dump.pkl")
+        lines = [
+            ["Torch_add_0_forward_stack_info", [["a.py", "1", "f", "x = a + b"]]],
+            ["Torch_add_0_forward_input.0", 1, [], "torch.float32", [2, 2], [4.0, 1.0, 2.5]],
+            ["Torch_add_0_forward_output", 1, [], "torch.float32", [2, 2], [8.0, 2.0, 5.0]],
+            ["Torch_add_1_forward_input.0", 1, [], "torch.float32", [2], [1.0, 1.0, 1.0]],
+        ]
+        with open(self.pkl_path, "w") as f:
+            for line in lines:
+                f.write(json.dumps(line) + "\n")
+        self.npy_path = os.path.join(self.rank_dir, "api_stack_dump", "Torch_add_0_forward_output.npy")
+        np.save(self.npy_path, np.array([[2.0, 4.0], [6.0, 8.0]], dtype=np.float32))
+        self.dump_path = os.path.join(self.temp_dir, "dump")
+
+    def tearDown(self):
+        Const.DUMP_INDEX_DIR = self.index_dir
+        shutil.rmtree(self.temp_dir)
+
+    def test_find_records_in_pkl_order(self):
+        dump_index = DumpIndex(self.dump_path).load()
+        names = [msg[0] for msg in dump_index.find_records("Torch_add_0_forward", self.pkl_path)]
+        self.assertEqual(names, ["Torch_add_0_forward_stack_info", "Torch_add_0_forward_input.0",
+                                 "Torch_add_0_forward_output"])
+        self.assertEqual(len(dump_index.find_records("Torch_add_")), 4)
+        self.assertEqual(dump_index.find_records("Torch_mul"), [])
+
+    def test_index_reused_until_pkl_changes(self):
+        DumpIndex(self.dump_path).load()
+        self.assertTrue(os.path.isfile(DumpIndex(self.dump_path).index_file))
+        reloaded = DumpIndex(self.dump_path)
+        self.assertTrue(reloaded._load_index_file())
+        with open(self.pkl_path, "a") as f:
+            f.write(json.dumps(["Torch_mul_0_forward_output", 1, [], "torch.float32", [1], [1.0, 1.0, 1.0]]) + "\n")
+        self.assertFalse(DumpIndex(self.dump_path)._load_index_file())
+        self.assertEqual(len(DumpIndex(self.dump_path).load().find_records("Torch_mul")), 1)
+
+    def test_npy_info_and_lazy_load(self):
+        dump_index = DumpIndex(self.dump_path).load()
+        self.assertEqual(dump_index.get_npy_info(self.npy_path), ("torch.float32", [2, 2], [8.0, 2.0, 5.0]))
+        data = dump_index.load_npy("Torch_add_0_forward_output")
+        self.assertIsInstance(data, np.memmap)
+        self.assertEqual(data.shape, (2, 2))
+
+    def test_index_stale_after_new_pkl(self):
+        DumpIndex(self.dump_path).load()
+        new_rank_dir = os.path.join(self.dump_path, "rank1")
+        os.makedirs(new_rank_dir)
+        with open(os.path.join(new_rank_dir, "api_stack_dump.pkl"), "w") as f:
+            f.write(json.dumps(["Torch_mul_0_forward_output", 1, [], "torch.float32", [1], [1.0, 1.0, 1.0]]) + "\n")
+        self.assertFalse(DumpIndex(self.dump_path)._load_index_file())
+        self.assertEqual(len(DumpIndex(self.dump_path).load().find_records("Torch_mul")), 1)
+
+    def _parse_pkl_output(self, visual, pkl_path, api_name):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            visual.parse_pkl(pkl_path, api_name)
+        return output.getvalue()
+
+    def test_parse_pkl_reindexes_changed_pkl(self):
+        visual = Visualization()
+        visual.load_dump_index(self.dump_path)
+        self.assertIn("[max: 8.0]", self._parse_pkl_output(visual, self.pkl_path, "Torch_add_0_forward_output"))
+        with open(self.pkl_path, "w") as f:
+            f.write(json.dumps(["Torch_sub_0_forward_output", 1, [], "torch.float16", [3], [9.0, 0.0, 3.0]]) + "\n")
+            f.write(json.dumps(["Torch_add_0_forward_output", 1, [], "torch.float16", [3], [7.0, 1.0, 3.0]]) + "\n")
+        self.assertFalse(visual.find_dump_index(self.pkl_path).is_current(self.pkl_path))
+        output = self._parse_pkl_output(visual, self.pkl_path, "Torch_add_0_forward_output")
+        self.assertIn("[max: 7.0]", output)
+        self.assertNotIn("[max: 8.0]", output)
+        self.assertEqual(visual.find_dump_index(self.pkl_path).get_npy_info(self.npy_path),
+                         ("torch.float16", [3], [7.0, 1.0, 3.0]))
+
+    def test_parse_pkl_indexes_new_pkl(self):
+        visual = Visualization()
+        visual.load_dump_index(self.dump_path)
+        new_rank_dir = os.path.join(self.dump_path, "rank1")
+        os.makedirs(new_rank_dir)
+        new_pkl_path = os.path.join(new_rank_dir, "api_stack_dump.pkl")
+        with open(new_pkl_path, "w") as f:
+            f.write(json.dumps(["Torch_mul_0_forward_output", 1, [], "torch.float32", [1], [6.0, 6.0, 6.0]]) + "\n")
+        self.assertIn("[max: 6.0]", self._parse_pkl_output(visual, new_pkl_path, "Torch_mul_0_forward_output"))
+        self.assertTrue(DumpIndex(self.dump_path)._load_index_file())
@@ -0,0 +1,54 @@
+# coding=utf-8
+import unittest
+import numpy as np
+from ptdbg_ascend.parse_tool.lib.compare import Compare
+from ptdbg_ascend.parse_tool.lib.config import Const
+
+
+class TestParseCompare(unittest.TestCase):
+
+    def setUp(self):
+        self.compare = Compare()
+        self.chunk_size = Const.COMPARE_CHUNK_SIZE
+        Const.COMPARE_CHUNK_SIZE = 7
+        np.random.seed(0)
+        self.left = np.random.randn(5, 9).astype(np.float16)
+        self.right = self.left.astype(np.float32) + np.random.randn(5, 9).astype(np.float32) * 0.01
+        self.right[1, 2] = np.nan
+
+    def tearDown(self):
+        Const.COMPARE_CHUNK_SIZE = self.chunk_size
+
+    def _loop_compare(self, left, right, rl, al, diff_count):
+        err_items, top_items = [], []
+        for i in range(left.shape[0]):
+            abs_diff = abs(left[i] - right[i])
+            if i < diff_count:
+                top_items.append((i, left[i], right[i], abs_diff))
+            if abs_diff > (al + rl * abs(right[i])):
+                if len(err_items) < diff_count:
+                    err_items.append((i, left[i], right[i], abs_diff))
+        return err_items, top_items
+
+    def test_compute_compare_stats_same_as_loop(self):
+        stats = self.compare.compute_compare_stats(self.left, self.right, 0.001, 0.001, 10)
+        data_left = self.left.astype(np.float32).reshape(-1)
+        data_right = self.right.astype(np.float32).reshape(-1)
+        err_items, top_items = self._loop_compare(data_left, data_right, 0.001, 0.001, 10)
+        self.assertEqual(stats['total_cnt'], 45)
+        self.assertFalse(stats['all_close'])
+        self.assertEqual([item[0] for item in stats['err_items']], [item[0] for item in err_items])
+        self.assertEqual([item[0] for item in stats['top_items']], [item[0] for item in top_items])
+        np.testing.assert_allclose([item[3] for item in stats['top_items']], [item[3] for item in top_items])
+        self.assertEqual(stats['worst_items'][0][0], 11)
+        self.assertEqual(sum(count for _, count in stats['histogram']), 45)
+        self.assertEqual(stats['histogram'][-1], ("nan", 1))
+
+    def test_compute_compare_stats_pad_and_cos_sim(self):
+        left = np.array([1.0, 2.0, 3.0], dtype=np.float32)
+        right = np.array([1.0, 2.0], dtype=np.float32)
+        stats = self.compare.compute_compare_stats(left, right, 0.001, 0.001, 2)
+        self.assertEqual(stats['total_cnt'], 3)
+        self.assertEqual(stats['err_cnt'], 1)
+        self.assertEqual(stats['worst_items'][0][0], 2)
+        self.assertAlmostEqual(stats['cos_sim'], 5 / np.sqrt(14 * 5))
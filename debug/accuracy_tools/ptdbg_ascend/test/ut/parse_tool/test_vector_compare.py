@@ -0,0 +1,105 @@
+# coding=utf-8
+import csv
+import os
+import shutil
+import tempfile
+import unittest
+import unittest.mock
+import numpy as np
+from ptdbg_ascend.parse_tool.lib.config import Const
+from ptdbg_ascend.parse_tool.lib.vector_compare import VectorCompare
+
+
+class TestVectorCompare(unittest.TestCase):
+
+    def setUp(self):
+        self.vector_compare = VectorCompare()
+        np.random.seed(1)
+        self.pairs = []
+        for shape in [(3, 4), (5,), (2, 2, 2)]:
+            golden = np.random.randn(*shape).astype(np.float32)
+            self.pairs.append((golden + np.random.randn(*shape).astype(np.float32) * 0.01, golden))
+
+    def test_compare_arrays_matches_per_pair(self):
+        results = self.vector_compare.compare_arrays(self.pairs)
+        for (my_data, golden), result in zip(self.pairs, results):
+            my_data = my_data.astype(np.float64).reshape(-1)
+            golden = golden.astype(np.float64).reshape(-1)
+            abs_diff = np.abs(my_data - golden)
+            cos = np.dot(my_data, golden) / np.linalg.norm(my_data) / np.linalg.norm(golden)
+            self.assertAlmostEqual(result["CosineSimilarity"], cos)
+            self.assertAlmostEqual(result["MaxAbsoluteError"], abs_diff.max())
+            self.assertAlmostEqual(result["RootMeanSquareError"], np.sqrt(np.mean(abs_diff ** 2)))
+            self.assertAlmostEqual(result["MaxRelativeError"], (abs_diff / np.abs(golden)).max())
+            self.assertAlmostEqual(result["StandardDeviation"][1], golden.std())
+
+    def test_compare_arrays_small_batch(self):
+        batch_size = Const.VECTOR_COMPARE_BATCH_SIZE
+        Const.VECTOR_COMPARE_BATCH_SIZE = 4
+        try:
+            results = self.vector_compare.compare_arrays(self.pairs)
+        finally:
+            Const.VECTOR_COMPARE_BATCH_SIZE = batch_size
+        self.assertEqual(results, self.vector_compare.compare_arrays(self.pairs))
+
+    def test_compare_arrays_chunked_pair(self):
+        expected = self.vector_compare.compare_arrays(self.pairs)
+        chunk_size = Const.COMPARE_CHUNK_SIZE
+        Const.COMPARE_CHUNK_SIZE = 5
+        try:
+            with unittest.mock.patch.object(self.vector_compare, "_compare_batch",
+                                            wraps=self.vector_compare._compare_batch) as mock_batch:
+                results = self.vector_compare.compare_arrays(self.pairs)
+        finally:
+            Const.COMPARE_CHUNK_SIZE = chunk_size
+        # only the pair of 5 elements fits in one chunk and is batched
+        self.assertEqual(mock_batch.call_args[0][1], [1])
+        for result, expected_result in zip(results, expected):
+            for name in VectorCompare.METRICS:
+                np.testing.assert_allclose(result[name], expected_result[name], rtol=1e-10, atol=1e-12)
+
+    def test_compare_arrays_error(self):
+        results = self.vector_compare.compare_arrays([(np.zeros(3), np.zeros(4)), (np.zeros(0), np.zeros(0))])
+        self.assertTrue(results[0]["ErrorMessage"].startswith("shape unmatched"))
+        self.assertEqual(results[1]["ErrorMessage"], "empty data")
+
+    def test_compare_npy_dirs(self):
+        temp_dir = os.path.realpath(tempfile.mkdtemp())
+        try:
+            for dir_name, pair_idx in [("my", 0), ("golden", 1)]:
+                os.makedirs(os.path.join(temp_dir, dir_name))
+                for idx, pair in enumerate(self.pairs):
+                    np.save(os.path.join(temp_dir, dir_name, "data_%d.npy" % idx), pair[pair_idx])
+            result_dir = os.path.join(temp_dir, "result")
+            os.makedirs(result_dir)
+            self.assertTrue(VectorCompare.is_npy_dump(os.path.join(temp_dir, "my")))
+            ret = self.vector_compare.compare_npy_dirs(os.path.join(temp_dir, "my"), os.path.join(temp_dir, "golden"),
+                                                       result_dir)
+            self.assertEqual(ret, 0)
+            result_file = os.path.join(result_dir, os.listdir(result_dir)[0])
+            with open(result_file) as f:
+                rows = list(csv.reader(f))
+            self.assertEqual(rows[0], VectorCompare.HEADER)
+            self.assertEqual(len(rows), 4)
+        finally:
+            shutil.rmtree(temp_dir)
+
+    def test_compare_npy_dirs_object_array(self):
+        temp_dir = os.path.realpath(tempfile.mkdtemp())
+        try:
+            for dir_name, pair_idx in [("my", 0), ("golden", 1)]:
+                os.makedirs(os.path.join(temp_dir, dir_name))
+                np.save(os.path.join(temp_dir, dir_name, "data_0.npy"), self.pairs[0][pair_idx])
+                np.save(os.path.join(temp_dir, dir_name, "data_1.npy"), np.array([{"a": 1}], dtype=object))
+            result_dir = os.path.join(temp_dir, "result")
+            os.makedirs(result_dir)
+            ret = self.vector_compare.compare_npy_dirs(os.path.join(temp_dir, "my"), os.path.join(temp_dir, "golden"),
+                                                       result_dir)
+            self.assertEqual(ret, 0)
+            with open(os.path.join(result_dir, os.listdir(result_dir)[0])) as f:
+                rows = list(csv.reader(f))
+            self.assertEqual(len(rows), 3)
+            self.assertEqual(rows[1][-1], "")
+            self.assertEqual(rows[2][-1], "load npy failed")
+        finally:
+            shutil.rmtree(temp_dir)
@@ -13,21 +13,59 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import multiprocessing
+import os
+import time
+
 from analysis.communication_analysis import CommunicationAnalysis
 from analysis.step_trace_time_analysis import StepTraceTimeAnalysis
 from analysis.communication_analysis import CommMatrixAnalysis
+from common_func.constant import Constant
+
+
+def run_analysis(analysis, param: dict):
+    start_time = time.time()
+    try:
+        analysis(param).run()
+    except Exception:
+        print(f"{analysis.__name__} failed.")
+        return
+    print(f"{analysis.__name__} finished in {time.time() - start_time:.2f}s.")
 
 
 class AnalysisFacade:
-    analysis_module = {CommunicationAnalysis, StepTraceTimeAnalysis, CommMatrixAnalysis}
+    analysis_module = [CommunicationAnalysis, StepTraceTimeAnalysis, CommMatrixAnalysis]
 
     def __init__(self, param: dict):
         self.param = param
 
     def cluster_analyze(self):
-        for analysis in self.analysis_module:
-            try:
-                analysis(self.param).run()
-            except Exception:
-                print(f"{analysis.__name__} failed.")
+        """
+        run the analyses, which read disjoint data and write separate files, in forked processes with at most
+        param workers of them at a time. forked processes share the loaded rank data without copying it.
+        """
+        start_time = time.time()
+        workers = self.param.get(Constant.WORKERS, Constant.DEFAULT_WORKERS) or os.cpu_count() or 1
+        workers = min(workers, len(self.analysis_module))
+        if workers <= 1 or "fork" not in multiprocessing.get_all_start_methods():
+            for analysis in self.analysis_module:
+                run_analysis(analysis, self.param)
+        else:
+            context = multiprocessing.get_context("fork")
+            processes = []
+            for analysis in self.analysis_module:
+                if len(processes) >= workers:
+                    self.join_analysis(*processes.pop(0))
+                process = context.Process(target=run_analysis, args=(analysis, self.param))
+                process.start()
+                processes.append((analysis, process))
+            for analysis, process in processes:
+                self.join_analysis(analysis, process)
+        print(f"Cluster analysis finished in {time.time() - start_time:.2f}s.")
 
+    @staticmethod
+    def join_analysis(analysis, process):
+        process.join()
+        # a process killed by a signal or the oom killer prints nothing itself
+        if process.exitcode != 0:
+            print(f"{analysis.__name__} failed, the process exited with code {process.exitcode}.")
@@ -13,11 +13,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import os
 from abc import abstractmethod
 
 from common_func.constant import Constant
 from collections import defaultdict
+from common_func.db_manager import DBManager
 from common_func.file_manager import FileManager
 
 
@@ -27,6 +27,8 @@ class BaseCommAnalysis:
         self.collection_path = param.get(Constant.COLLECTION_PATH)
         self.data_map = param.get(Constant.DATA_MAP)
         self.collective_group_dict = param.get(Constant.COLLECTIVE_GROUP)
+        self.rank_data_store = param.get(Constant.RANK_DATA_STORE)
+        self.output_type = param.get(Constant.OUTPUT_TYPE, Constant.TEXT)
         self.comm_ops_struct = {}
 
     @staticmethod
@@ -40,10 +42,17 @@ class BaseCommAnalysis:
     def run(self):
         pass
 
+    @abstractmethod
+    def get_db_rows(self):
+        pass
+
     def dump_data(self):
         if not self.comm_ops_struct:
             print("There is no final comm ops data generated")
             return
+        if self.output_type == Constant.DB:
+            DBManager.insert_data(self.collection_path, self.DB_TABLE, self.get_db_rows())
+            return
         output_comm_data = {}
         for key in self.comm_ops_struct:
             output_comm_data[str(key)] = self.comm_ops_struct.get(key)
@@ -51,7 +60,10 @@ class BaseCommAnalysis:
 
     def split_op_by_group(self):
         for single_op in self.communication_ops:
-            if single_op.get(Constant.COMM_OP_TYPE) == Constant.P2P:
+            if self.output_type == Constant.DB:
+                # the tables key the ops by their group name, described by the groups table
+                rank_tup = single_op.get(Constant.GROUP_NAME)
+            elif single_op.get(Constant.COMM_OP_TYPE) == Constant.P2P:
                 rank_tup = Constant.P2P
             else:
                 rank_tup = tuple(self.collective_group_dict.get(single_op.get(Constant.GROUP_NAME), []))
@@ -70,6 +82,7 @@ class BaseCommAnalysis:
 
 class CommunicationAnalysis(BaseCommAnalysis):
     SAVED_JSON = "cluster_communication.json"
+    DB_TABLE = Constant.TABLE_OPS
 
     def __init__(self, param: dict):
         super().__init__(param)
@@ -86,6 +99,20 @@ class CommunicationAnalysis(BaseCommAnalysis):
         self.combine_ops_total_info()
         self.dump_data()
 
+    def get_db_rows(self):
+        for group_name, group_dict in self.comm_ops_struct.items():
+            for step_id, step_dict in group_dict.items():
+                for op_name, rank_dict in step_dict.items():
+                    is_total = int(op_name == Constant.TOTAL_OP_INFO)
+                    for rank_id, op_info in rank_dict.items():
+                        time_info = op_info.get(Constant.COMMUNICATION_TIME_INFO, {})
+                        yield (group_name, step_id, op_name, is_total, int(rank_id),
+                               time_info.get(Constant.START_TIMESTAMP),
+                               time_info.get(Constant.ELAPSE_TIME_MS), time_info.get(Constant.TRANSIT_TIME_MS),
+                               time_info.get(Constant.WAIT_TIME_MS), time_info.get(Constant.SYNCHRONIZATION_TIME_MS),
+                               time_info.get(Constant.WAIT_TIME_RATIO),
+                               time_info.get(Constant.SYNCHRONIZATION_TIME_RATIO))
+
     def compute_total_info(self, comm_ops: dict):
         if not comm_ops:
             return
@@ -146,6 +173,7 @@ class CommunicationAnalysis(BaseCommAnalysis):
 
 class CommMatrixAnalysis(BaseCommAnalysis):
     SAVED_JSON = "cluster_communication_matrix.json"
+    DB_TABLE = Constant.TABLE_LINKS
 
     def __init__(self, param: dict):
         super().__init__(param)
@@ -164,37 +192,37 @@ class CommMatrixAnalysis(BaseCommAnalysis):
         self.dump_data()
 
     def load_communication_matrix_data(self):
-        rank_comm_dict = {}
-        for rank_id, profiling_dir_path in self.data_map.items():
-            comm_dir = os.path.join(profiling_dir_path, Constant.SINGLE_OUTPUT, Constant.COMM_MATRIX_JSON)
-            rank_comm_dict[rank_id] = FileManager.read_json_file(comm_dir)
-            if not rank_comm_dict.get(rank_id):
+        rank_comm_dict = self.rank_data_store.get_data(Constant.COMM_MATRIX_JSON)
+        for rank_id in self.data_map:
+            if rank_comm_dict[rank_id].is_empty():
                 print(f"Rank {rank_id} does not have a valid communication_matrix.json.")
         self.construct_matrix_data(rank_comm_dict)
 
     def construct_matrix_data(self, rank_comm_dict: dict):
-        for rank_id, rank_id_dict in rank_comm_dict.items():
-            for step_id, step_id_dict in rank_id_dict.items():
-                self.add_comm_ops(rank_id, step_id, step_id_dict)
-
-    def add_comm_ops(self, rank_id: int, step_id: int, step_id_dict: dict):
-        for comm_op_type, comm_dict in step_id_dict.items():
-            if comm_op_type != Constant.COLLECTIVE and comm_op_type != Constant.P2P:
+        for rank_id, matrix_summary in rank_comm_dict.items():
+            for _ in range(matrix_summary.unknown_type_num):
                 print(f"Unknown communication opertors type!")
-                continue
-            for op_name, op_link_info in comm_dict.items():
-                if op_name.startswith('Total'):
-                    continue
-                group_name = op_name.split('@')[-1]
+            for step_id, comm_op_type, op_name, op_link_info in matrix_summary.ops:
                 self.communication_ops.append({
                     Constant.RANK_ID: rank_id,
                     Constant.STEP_ID: step_id,
                     Constant.COMM_OP_TYPE: comm_op_type,
                     Constant.COMM_OP_NAME: op_name,
-                    Constant.GROUP_NAME: group_name,
+                    Constant.GROUP_NAME: op_name.split('@')[-1],
                     Constant.COMM_OP_INFO: op_link_info
                 })
 
+    def get_db_rows(self):
+        for group_name, group_dict in self.comm_ops_struct.items():
+            for step_id, step_dict in group_dict.items():
+                for op_name, link_dict in step_dict.items():
+                    is_total = int(op_name == Constant.TOTAL_OP_INFO)
+                    for link_key, link_info in link_dict.items():
+                        src_rank, _, dst_rank = str(link_key).partition('-')
+                        yield (group_name, step_id, op_name, is_total, int(src_rank), int(dst_rank),
+                               link_info.get(Constant.TRANSPORT_TYPE), link_info.get(Constant.TRANSIT_TIME_MS),
+                               link_info.get(Constant.TRANSIT_SIZE_MB), link_info.get(Constant.BANDWIDTH_GB_S))
+
     def compute_total_info(self, step_dict: dict):
         self.merge_same_links(step_dict)
         self.combine_link_info(step_dict)
@@ -13,10 +13,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import os
 from collections import defaultdict
 
 from common_func.constant import Constant
+from common_func.db_manager import DBManager
 from common_func.file_manager import FileManager
 from prof_bean.step_trace_time_bean import StepTraceTimeBean
 
@@ -28,6 +28,8 @@ class StepTraceTimeAnalysis:
         self.collection_path = param.get(Constant.COLLECTION_PATH)
         self.data_map = param.get(Constant.DATA_MAP)
         self.communication_group = param.get(Constant.COMMUNICATION_GROUP)
+        self.rank_data_store = param.get(Constant.RANK_DATA_STORE)
+        self.output_type = param.get(Constant.OUTPUT_TYPE, Constant.TEXT)
         self.step_time_dict = {}
         self.step_data_list = []
 
@@ -52,13 +54,25 @@ class StepTraceTimeAnalysis:
         if not self.step_data_list:
             print("Can't get step time info!")
         headers = self.get_headers()
+        if self.output_type == Constant.DB:
+            DBManager.insert_data(self.collection_path, Constant.TABLE_STEPS, self.get_db_rows(headers))
+            return
         FileManager.create_csv_file(self.collection_path, self.step_data_list, self.CLUSTER_TRACE_TIME_CSV, headers)
 
+    def get_db_rows(self, headers: list):
+        """a rank row refers to its rank id, a stage row to the stage name of the groups table"""
+        metrics = headers[len(StepTraceTimeBean.COMPLEMENT_HEADER):]
+        stage_names = {tuple(stage): DBManager.get_stage_name(stage_id)
+                       for stage_id, stage in enumerate(self.communication_group.get(Constant.P2P, []))}
+        for data_list in self.step_data_list:
+            step_id, data_type, index = data_list[:len(StepTraceTimeBean.COMPLEMENT_HEADER)]
+            rank_id, group_name = (index, None) if data_type == Constant.RANK else (None, stage_names.get(index))
+            for metric, value in zip(metrics, data_list[len(StepTraceTimeBean.COMPLEMENT_HEADER):]):
+                yield str(step_id), data_type, rank_id, group_name, metric, value
+
     def load_step_trace_time_data(self):
-        for rank_id, profiling_dir_path in self.data_map.items():
-            step_time_file = os.path.join(profiling_dir_path, Constant.SINGLE_OUTPUT, Constant.STEP_TIME_CSV)
-            if step_time_file:
-                self.step_time_dict[rank_id] = FileManager.read_csv_file(step_time_file, StepTraceTimeBean)
+        self.step_time_dict = self.rank_data_store.get_data(Constant.STEP_TIME_CSV)
+        for rank_id in self.data_map:
             if not self.step_time_dict.get(rank_id):
                 print(f"rank {rank_id} does not have a valid step_trace_time.json.")
 
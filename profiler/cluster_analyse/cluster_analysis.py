@@ -14,10 +14,13 @@
 # limitations under the License.
 
 import argparse
+import os
 
 from cluster_data_preprocess.pytorch_data_preprocessor import PytorchDataPreprocessor
+from cluster_data_preprocess.rank_data_loader import RankDataStore
 from communication_group.communication_group_generator import CommunicationGroupGenerator
 from common_func.constant import Constant
+from common_func.db_manager import DBManager
 from common_func.file_manager import FileManager
 from common_func.path_manager import PathManager
 from analysis.analysis_facade import AnalysisFacade
@@ -28,35 +31,89 @@ class Interface:
         self.collection_path = PathManager.get_realpath(args.collection_path)
         self.data_map = {}
         self.communication_group = {}
+        self.workers = args.workers
+        self.use_cache = args.use_cache
+        self.output_type = args.output_type
 
     def run(self):
-        PathManager.check_input_directory_path(self.collection_path)
-        PathManager.check_path_owner_consistent(self.collection_path)
-        FileManager.create_output_dir(self.collection_path)
-        data_map = PytorchDataPreprocessor(self.collection_path).get_data_map()
+        cache_path = self.prepare_output_dir()
+        data_map = self.get_data_map()
         if not data_map:
             print("Can not get rank info or profiling data.")
             return
+        rank_data_store = self.load_rank_data(data_map, cache_path)
+        communication_group, collective_group_dict, communication_ops = \
+            self.generate_communication_group(data_map, rank_data_store)
+        if self.output_type == Constant.DB:
+            self.dump_db(data_map, communication_group, collective_group_dict, communication_ops)
+        params = self.get_analysis_params(data_map, rank_data_store, communication_group, collective_group_dict,
+                                          communication_ops)
+        AnalysisFacade(params).cluster_analyze()
+
+    def prepare_output_dir(self) -> str:
+        """check the collection path and create the output dir, return the rank data cache path if it is used"""
+        PathManager.check_input_directory_path(self.collection_path)
+        PathManager.check_path_owner_consistent(self.collection_path)
+        if not self.use_cache:
+            FileManager.create_output_dir(self.collection_path)
+            return None
+        cache_path = os.path.join(self.collection_path, Constant.CLUSTER_ANALYSIS_OUTPUT, Constant.RANK_DATA_CACHE)
+        FileManager.create_output_dir(self.collection_path, keep_names=[Constant.RANK_DATA_CACHE])
+        PathManager.make_dir_safety(cache_path)
+        PathManager.check_path_writeable(cache_path)
+        return cache_path
+
+    def get_data_map(self) -> dict:
+        return PytorchDataPreprocessor(self.collection_path).get_data_map()
+
+    def load_rank_data(self, data_map: dict, cache_path: str = None) -> RankDataStore:
+        return RankDataStore(data_map, self.workers, cache_path)
+
+    def generate_communication_group(self, data_map: dict, rank_data_store: RankDataStore) -> tuple:
+        """return the communication group, the collective group dict and the communication ops"""
         try:
-            communication_group, collective_group_dict, communication_ops = \
-                CommunicationGroupGenerator(self.collection_path, data_map).generate()
+            return CommunicationGroupGenerator(self.collection_path, data_map, rank_data_store).generate()
         except RuntimeError:
             print("Can not get communication info from ranks")
-            communication_group = {}
-            communication_ops = []
-            collective_group_dict = {}
-        params = {
+            return {}, {}, []
+
+    def get_analysis_params(self, data_map: dict, rank_data_store: RankDataStore, communication_group: dict,
+                            collective_group_dict: dict, communication_ops: list) -> dict:
+        return {
             Constant.COLLECTION_PATH: self.collection_path,
             Constant.DATA_MAP: data_map,
             Constant.COLLECTIVE_GROUP: collective_group_dict,
             Constant.COMMUNICATION_OPS: communication_ops,
-            Constant.COMMUNICATION_GROUP: communication_group
+            Constant.COMMUNICATION_GROUP: communication_group,
+            Constant.RANK_DATA_STORE: rank_data_store,
+            Constant.WORKERS: self.workers,
+            Constant.OUTPUT_TYPE: self.output_type
         }
-        AnalysisFacade(params).cluster_analyze()
 
+    def dump_db(self, data_map: dict, communication_group: dict, collective_group_dict: dict,
+                communication_ops: list):
+        DBManager.create_tables(self.collection_path)
+        DBManager.insert_data(self.collection_path, Constant.TABLE_RANKS, sorted(data_map.items()))
+        groups = {group_name: (Constant.COLLECTIVE, rank_set) for group_name, rank_set in collective_group_dict.items()}
+        for op in communication_ops:
+            if op.get(Constant.COMM_OP_TYPE) == Constant.P2P:
+                groups.setdefault(op.get(Constant.GROUP_NAME), (Constant.P2P, set()))[1].add(op.get(Constant.RANK_ID))
+        for stage_id, stage in enumerate(communication_group.get(Constant.P2P, [])):
+            groups[DBManager.get_stage_name(stage_id)] = (Constant.STAGE, stage)
+        DBManager.insert_data(self.collection_path, Constant.TABLE_GROUPS,
+                              [(group_name, group_type) for group_name, (group_type, _) in groups.items()])
+        DBManager.insert_data(self.collection_path, Constant.TABLE_GROUP_MEMBERS,
+                              [(group_name, rank_id) for group_name, (_, rank_set) in groups.items()
+                               for rank_id in sorted(rank_set)])
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="cluster analysis module")
     parser.add_argument('-d', '--collection_path', type=str, required=True, help="profiling data path")
+    parser.add_argument('-w', '--workers', type=int, default=Constant.DEFAULT_WORKERS,
+                        help="processes to parse the rank data with, defaults to the cpu count")
+    parser.add_argument('-c', '--use_cache', action='store_true',
+                        help="keep the parsed rank data under the output dir and reuse the unchanged files next time")
+    parser.add_argument('-o', '--output_type', choices=[Constant.TEXT, Constant.DB], default=Constant.TEXT,
+                        help="write the results as json and csv files, or as tables of a sqlite file")
     args_parsed = parser.parse_args()
     Interface(args_parsed).run()
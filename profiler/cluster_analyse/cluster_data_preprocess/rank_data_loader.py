@@ -0,0 +1,216 @@
+# Copyright (c) 2023, Huawei Technologies Co., Ltd.
+# All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0  (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+from functools import partial
+from multiprocessing import Pool
+
+from common_func.constant import Constant
+from common_func.file_manager import FileManager
+from common_func.path_manager import PathManager
+from prof_bean.communication_summary_bean import CommunicationSummaryBean, CommMatrixSummaryBean
+from prof_bean.step_trace_time_bean import StepTraceTimeBean
+
+
+def read_communication_summary(file_path: str) -> CommunicationSummaryBean:
+    return CommunicationSummaryBean(FileManager.iter_json_items(file_path, check_path=False))
+
+
+def read_comm_matrix_summary(file_path: str) -> CommMatrixSummaryBean:
+    return CommMatrixSummaryBean(FileManager.iter_json_items(file_path, check_path=False))
+
+
+def read_step_trace_time(file_path: str) -> list:
+    return FileManager.read_csv_file(file_path, StepTraceTimeBean, check_path=False)
+
+
+# the loader processes return these compact summaries to the main process instead of the parsed files
+RANK_FILE_READERS = {
+    Constant.COMM_JSON: read_communication_summary,
+    Constant.COMM_MATRIX_JSON: read_comm_matrix_summary,
+    Constant.STEP_TIME_CSV: read_step_trace_time
+}
+
+
+def get_rank_file_path(profiling_dir_path: str, file_name: str) -> str:
+    return os.path.join(profiling_dir_path, Constant.SINGLE_OUTPUT, file_name)
+
+
+def check_rank_files(data_map: dict) -> dict:
+    """
+    check the existing rank files in the main process, as the owner check may ask the user to confirm.
+    return {file path: error} of the files that must not be read.
+    """
+    check_errors = {}
+    for profiling_dir_path in data_map.values():
+        for file_name in RANK_FILE_READERS:
+            file_path = get_rank_file_path(profiling_dir_path, file_name)
+            if not os.path.exists(file_path):
+                continue
+            try:
+                PathManager.check_path_readable(file_path)
+            except RuntimeError as err:
+                check_errors[file_path] = err
+    return check_errors
+
+
+def get_file_fingerprint(file_path: str):
+    if not os.path.isfile(file_path):
+        return None
+    file_stat = os.stat(file_path)
+    return [file_path, file_stat.st_size, file_stat.st_mtime_ns]
+
+
+def load_rank_data(rank_id: int, profiling_dir_path: str, cache_path: str = None, check_errors: dict = None) -> tuple:
+    """
+    read every file of a rank once into its summary, a file that can not be read is kept as its error
+    so that only the analyses using it fail. the files were checked by check_rank_files, those in
+    check_errors are not read. with cache_path, the files whose path, size and mtime did not change
+    since the cached run, and the files still absent, are taken from the cache of the rank instead.
+    return the rank data and the number of files parsed.
+    """
+    cache_file = os.path.join(cache_path, f"rank_{rank_id}.json") if cache_path else None
+    cache = RankDataCache.load(cache_file) if cache_file else {}
+    check_errors = check_errors or {}
+    rank_data = {}
+    new_cache = {}
+    cache_changed = False
+    parsed_num = 0
+    for file_name, read_func in RANK_FILE_READERS.items():
+        file_path = get_rank_file_path(profiling_dir_path, file_name)
+        if file_path in check_errors:
+            rank_data[file_name] = check_errors[file_path]
+            continue
+        # an absent file has the fingerprint None and is cached with its error, a rerun does not count it as changed
+        fingerprint = get_file_fingerprint(file_path)
+        if file_name in cache and cache.get(file_name)[0] == fingerprint:
+            rank_data[file_name] = cache.get(file_name)[1]
+            new_cache[file_name] = cache.get(file_name)
+            continue
+        cache_changed = True
+        if fingerprint is None:
+            rank_data[file_name] = RuntimeError(f"Invalid path: {file_name}")
+            new_cache[file_name] = (fingerprint, rank_data[file_name])
+            continue
+        parsed_num += 1
+        try:
+            rank_data[file_name] = read_func(file_path)
+        except RuntimeError as err:
+            rank_data[file_name] = err
+            continue
+        new_cache[file_name] = (fingerprint, rank_data[file_name])
+    if cache_file and cache_changed:
+        RankDataCache.save(cache_file, new_cache)
+    return rank_data, parsed_num
+
+
+class RankDataCache:
+    """
+    Summaries of the files of one rank saved by a previous run, {file_name: (fingerprint, data)}. The cache
+    holds plain json data, an absent file is saved with its error message. Only files owned by the current
+    user are loaded, a cache that can not be loaded is ignored.
+    """
+    VERSION = 3
+    DATA_CONVERTERS = {
+        Constant.COMM_JSON: (CommunicationSummaryBean.to_dict, CommunicationSummaryBean.from_dict),
+        Constant.COMM_MATRIX_JSON: (CommMatrixSummaryBean.to_dict, CommMatrixSummaryBean.from_dict),
+        Constant.STEP_TIME_CSV: (lambda beans: [bean.data for bean in beans],
+                                 lambda rows: [StepTraceTimeBean(row) for row in rows])
+    }
+
+    @classmethod
+    def load(cls, cache_file: str) -> dict:
+        if not os.path.isfile(cache_file) or os.path.islink(cache_file):
+            return {}
+        if hasattr(os, "getuid") and os.stat(cache_file).st_uid != os.getuid():
+            print(f"[WARNING] {os.path.basename(cache_file)} does not belong to you, ignore it.")
+            return {}
+        try:
+            with open(cache_file, "r") as file:
+                cache_data = json.load(file)
+            if cache_data.get("version") != cls.VERSION:
+                return {}
+            cache = {}
+            for file_name, file_cache in cache_data.get("files").items():
+                if "error" in file_cache:
+                    data = RuntimeError(file_cache.get("error"))
+                else:
+                    data = cls.DATA_CONVERTERS[file_name][1](file_cache.get("data"))
+                cache[file_name] = (file_cache.get("fingerprint"), data)
+        except Exception:
+            return {}
+        return cache
+
+    @classmethod
+    def save(cls, cache_file: str, cache: dict):
+        files = {}
+        for file_name, (fingerprint, data) in cache.items():
+            if isinstance(data, Exception):
+                files[file_name] = {"fingerprint": fingerprint, "error": str(data)}
+            else:
+                files[file_name] = {"fingerprint": fingerprint, "data": cls.DATA_CONVERTERS[file_name][0](data)}
+        tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+        with os.fdopen(os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, Constant.FILE_AUTHORITY),
+                       "w") as file:
+            json.dump({"version": cls.VERSION, "files": files}, file)
+        os.replace(tmp_file, cache_file)
+
+
+class RankDataLoader:
+    """
+    Parse the files of every rank with a module level load function, called with the rank id and the
+    profiling directory, in a process pool when there are several ranks and workers. Results are returned
+    in the order of data_map, so the analyses see the same data as with a sequential load.
+    """
+
+    def __init__(self, data_map: dict, workers: int = Constant.DEFAULT_WORKERS):
+        self.data_map = data_map
+        self.workers = max(1, min(workers or os.cpu_count() or 1, len(data_map)))
+
+    def load(self, load_func) -> dict:
+        rank_items = list(self.data_map.items())
+        if self.workers <= 1:
+            return {rank_id: load_func(rank_id, dir_path) for rank_id, dir_path in rank_items}
+        chunk_size = max(1, len(rank_items) // (self.workers * Constant.CHUNKS_PER_WORKER))
+        with Pool(self.workers) as pool:
+            results = pool.starmap(load_func, rank_items, chunksize=chunk_size)
+        return {rank_id: result for (rank_id, _), result in zip(rank_items, results)}
+
+
+class RankDataStore:
+    """
+    Summaries of the files of every rank, loaded once by Interface.run and shared by the communication
+    group generator and every analysis. With cache_path, unchanged files are reused from a previous run.
+    """
+
+    def __init__(self, data_map: dict, workers: int = Constant.DEFAULT_WORKERS, cache_path: str = None):
+        load_func = partial(load_rank_data, cache_path=cache_path, check_errors=check_rank_files(data_map))
+        results = RankDataLoader(data_map, workers).load(load_func)
+        self.rank_data = {rank_id: rank_data for rank_id, (rank_data, _) in results.items()}
+        if cache_path:
+            parsed_ranks = sum(1 for _, parsed_num in results.values() if parsed_num)
+            print(f"Parse the data of {parsed_ranks} ranks, reuse the cached data of "
+                  f"{len(results) - parsed_ranks} ranks.")
+
+    def get_data(self, file_name: str) -> dict:
+        """return {rank_id: parsed file}, raise the error of the first rank whose file could not be read"""
+        file_data = {}
+        for rank_id, rank_data in self.rank_data.items():
+            data = rank_data.get(file_name)
+            if isinstance(data, Exception):
+                raise data
+            file_data[rank_id] = data
+        return file_data
@@ -21,6 +21,8 @@ import os
 import stat
 import shutil
 import warnings
+from functools import partial
+from multiprocessing import Pool
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 from plotly.offline import plot
@@ -31,6 +33,22 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from common_func.path_manager import PathManager
 
 MAX_READ_FILE_BYTES = 64 * 1024 * 1024
+DEVICE_ID_PATTERN = re.compile(r'device_(\d+)')
+NODE_ID_PATTERN = re.compile(r'node(\d+)')
+
+
+def read_summary_file(file_info, columns_to_keep, string_columns):
+    # 只读取需要的列，算子属性列按字符串读取，指标列按浮点数读取，避免逐列类型推断
+    file_path, device_id, node_id = file_info
+    dtypes = {column: str if column in string_columns else "float64" for column in columns_to_keep}
+    try:
+        df = pd.read_csv(file_path, usecols=columns_to_keep, dtype=dtypes)
+    except ValueError:
+        print(f"{file_path}文件没有所需的列，请确认profiling数据的正确性:\n,以下列可能不存在{columns_to_keep}\n")
+        return None
+    df['device_id'] = device_id
+    df['node_id'] = node_id
+    return df
 
 
 class FormDataProcessor:
@@ -45,51 +63,56 @@ class FormDataProcessor:
             raise RuntimeError(msg)
         return [str(item) for item in matched_ir_files]
 
-    def readSummaryData(self, columns_to_keep):
-        # 存储所有合并后的数据
-        all_data = pd.DataFrame()
+    def readSummaryData(self, columns_to_keep, string_columns=(), workers=0):
+        file_infos = []
         for f in self.files:
             if "mindstudio_profiler_output" in f:
                 continue
-            # 判断csv文件大小
             PathManager.check_path_readable(f)
-            # 读取CSV文件
-            df = pd.read_csv(f)
-            # 保留需要的列
-            try:
-                df = df[columns_to_keep]
-            except KeyError:
-                print(f"{f}文件没有所需的列，请确认profiling数据的正确性:\n,以下列可能不存在{columns_to_keep}\n")
-                continue
-            # 从文件名提取设备ID
+            # 从文件路径提取设备ID和节点ID
             try:
-                df['device_id'] = self.getDeviceId(f)
+                device_id = self.getDeviceId(f)
             except Exception:
                 print(f"文件 \"{f}\" 的路径或者是文件夹名没有按照要求，请确保存在[device_]这一级文件夹,具体操作指导见readme\n")
                 continue
-            # 添加新列 "device_id"
             try:
-                df['node_id'] = self.getNodeId(f)
+                node_id = self.getNodeId(f)
             except Exception:
                 print(f"文件 \"{f}\" 的路径或者是文件夹名没有按照要求，请确保存在[node*]这一级文件夹,具体操作指导见readme\n")
                 continue
-            # 将数据添加到最终的数据框中
-            all_data = all_data._append(df, ignore_index=True)
+            file_infos.append((f, device_id, node_id))
+        # 多进程读取csv文件，按文件顺序返回结果，最后一次性合并
+        read_func = partial(read_summary_file, columns_to_keep=columns_to_keep, string_columns=string_columns)
+        workers = max(1, min(workers or os.cpu_count() or 1, len(file_infos)))
+        if workers > 1:
+            with Pool(workers) as pool:
+                data_frames = pool.map(read_func, file_infos)
+        else:
+            data_frames = [read_func(file_info) for file_info in file_infos]
+        data_frames = [df for df in data_frames if df is not None]
+        if not data_frames:
+            return pd.DataFrame()
+        all_data = pd.concat(data_frames, ignore_index=True)
+        # 算子属性和设备ID重复度高，转换为category减少内存
+        for column in list(string_columns) + ['device_id']:
+            if column in all_data.columns:
+                all_data[column] = all_data[column].astype("category")
+        all_data['node_id'] = all_data['node_id'].astype("int32")
         return all_data
 
     def getChipType(self):
         file = self.files[0]
-        df = pd.read_csv(file)
+        df = pd.read_csv(file, nrows=0)
         if 'aiv_time(us)' in df.columns:
             return "ASCEND_NEW"
         return "ASCEND_OTHER"
 
     def getDeviceId(self, dir_path):
-        device_id = re.search(r'device_(\d+)', dir_path).group(1)
+        device_id = DEVICE_ID_PATTERN.search(dir_path).group(1)
         return device_id
 
     def getNodeId(self, dir_path):
-        node_id = re.search(r'node(\d+)', dir_path).group(1)
+        node_id = NODE_ID_PATTERN.search(dir_path).group(1)
         return int(node_id)
 
     def getRankNum(self):
@@ -171,7 +194,7 @@ class OpSummaryAnalyzerBase:
     def calculateViewData(self, summary_data):
         # 存储所有合并后的数据
         calculate_dict = {self.columns_to_view[i]: self.calculate_fun for i in range(len(self.columns_to_view))}
-        view_data = summary_data.groupby(self.attrs_to_group).agg(calculate_dict).reset_index()
+        view_data = summary_data.groupby(self.attrs_to_group, observed=True).agg(calculate_dict).reset_index()
         return view_data
 
     def on_rm_error(self, func, path, exc_info):
@@ -202,6 +225,72 @@ class TimeToCsvAnalyzer(OpSummaryAnalyzerBase):
         return view_data
 
 
+class BoxStatsAggregator:
+    """
+    按算子和卡聚合箱线图统计值（四分位数、须、均值），html中只保存统计值而不是每个数据点。
+    卡数超过MAX_BOX_NUM时，相邻的卡合并为一个箱子，保证html大小与卡数、算子执行次数无关。
+    """
+    MAX_BOX_NUM = 64
+    STATS = ['q1', 'median', 'q3', 'lowerfence', 'upperfence', 'mean']
+
+    def __init__(self, summary_data, op_keys):
+        self.op_keys = op_keys
+        self.box_labels = self.getBoxLabels(summary_data)
+
+    def getBoxLabels(self, summary_data):
+        # 每个(node_id, device_id)对应的箱子名，按节点和卡号排序
+        devices = summary_data[['node_id', 'device_id']].drop_duplicates()
+        devices = devices.assign(device_num=devices['device_id'].astype(int))
+        devices = devices.sort_values(by=['node_id', 'device_num']).reset_index(drop=True)
+        names = [f'{node_id}_{device_id}' for node_id, device_id in zip(devices['node_id'], devices['device_id'])]
+        bucket_size = -(-len(names) // self.MAX_BOX_NUM)
+        labels = []
+        for i in range(len(names)):
+            start = i - i % bucket_size
+            end = min(start + bucket_size, len(names)) - 1
+            labels.append(names[i] if start == end else f'{names[start]}~{names[end]}')
+        box = pd.Categorical(labels, categories=list(dict.fromkeys(labels)), ordered=True)
+        return devices[['node_id', 'device_id']].assign(box=box)
+
+    def getBoxNum(self):
+        return len(self.box_labels['box'].cat.categories)
+
+    def aggregate(self, summary_data, top_n_data, columns):
+        """返回{算子key: {列名: {统计项: 每个箱子的值}}}, 只统计top_n的算子"""
+        top_keys = pd.MultiIndex.from_frame(top_n_data[self.op_keys].astype(str))
+        mask = pd.MultiIndex.from_frame(summary_data[self.op_keys].astype(str)).isin(top_keys)
+        op_data = summary_data.loc[mask, self.op_keys + ['node_id', 'device_id'] + columns]
+        op_data = op_data.merge(self.box_labels, on=['node_id', 'device_id'])
+        group_keys = [op_data[key] for key in self.op_keys + ['box']]
+        grouped = op_data[columns].groupby(group_keys, observed=True, sort=True)
+        # 与plotly一致，须取四分位数1.5倍四分位距以内最远的数据点
+        row_q1 = grouped.transform('quantile', 0.25)
+        row_q3 = grouped.transform('quantile', 0.75)
+        row_iqr = row_q3 - row_q1
+        values = op_data[columns]
+        inside = values.where((values >= row_q1 - 1.5 * row_iqr) & (values <= row_q3 + 1.5 * row_iqr))
+        inside_grouped = inside.groupby(group_keys, observed=True, sort=True)
+        q1 = grouped.quantile(0.25)
+        stats = {
+            'q1': q1,
+            'median': grouped.median(),
+            'q3': grouped.quantile(0.75),
+            'lowerfence': inside_grouped.min(),
+            'upperfence': inside_grouped.max(),
+            'mean': grouped.mean()
+        }
+        result = {}
+        for op_key, op_q1 in q1.groupby(level=list(range(len(self.op_keys))), observed=True, sort=False):
+            index = op_q1.index
+            key = tuple(str(value) for value in op_key)
+            result[key] = {
+                column: dict(box=list(index.get_level_values('box')),
+                             **{stat: stats[stat].loc[index, column].tolist() for stat in self.STATS})
+                for column in columns
+            }
+        return result
+
+
 class StatisticalInfoToHtmlAnalyzer(OpSummaryAnalyzerBase):
     def __init__(self, chip_type, top_n, dir_path):
         super().__init__(chip_type, "StatisticalInfoToHtmlAnalyzer", dir_path)
@@ -217,34 +306,32 @@ class StatisticalInfoToHtmlAnalyzer(OpSummaryAnalyzerBase):
         self.top_n = min(max(self.top_n, 1), len(view_data))
         top_n_data = view_data.sort_values(("Task Duration(us)", 'var'), ascending=False).head(self.top_n)
 
+        # 先按算子和卡聚合出箱线图统计值，画图只使用聚合结果
+        aggregator = BoxStatsAggregator(summary_data, self.columns_to_group)
+        box_stats = aggregator.aggregate(summary_data, top_n_data, self.columns_to_view)
         for column in self.columns_to_view:
             # 分别给每一种特性画图
-            self.drawPloty(column, summary_data, top_n_data, rank_num)
+            self.drawPloty(column, box_stats, top_n_data, aggregator.getBoxNum())
 
-    def drawPloty(self, column, summary_data, top_n_data, rank_num):
-        col_num = self.getCalNum(rank_num)
+    def drawPloty(self, column, box_stats, top_n_data, box_num):
+        col_num = self.getCalNum(box_num)
         row_num = self.top_n // col_num if self.top_n % col_num == 0 else (self.top_n + 1) // col_num
         fig = make_subplots(rows=row_num, cols=col_num, vertical_spacing=0.03)
         for i, (_, operation) in enumerate(top_n_data.iterrows()):
-            op_data = summary_data[(summary_data["Op Name"] == operation["Op Name"]) &
-                                   (summary_data["Input Shapes"] == operation["Input Shapes"]) &
-                                   (summary_data["Input Data Types"] == operation["Input Data Types"])]
-            op_data = op_data.sort_values(by=["node_id", "device_id"])
-            node_ids = op_data['node_id'].unique()
-            device_ids = op_data['device_id'].unique()
-
-            for node_id in node_ids:
-                for device_id in device_ids:
-                    draw_data = op_data[(op_data['node_id'] == node_id) & (op_data['device_id'] == device_id)]
-                    fig.add_trace(go.Box(y=draw_data[column],
-                                         name=f'{node_id}_{device_id}',
-                                         marker_color='green', showlegend=False), (i // col_num) + 1, (i % col_num) + 1)
+            op_key = tuple(str(operation[key]) for key in self.columns_to_group)
+            column_stats = box_stats.get(op_key, {}).get(column)
+            if column_stats:
+                fig.add_trace(go.Box(x=column_stats['box'],
+                                     q1=column_stats['q1'], median=column_stats['median'], q3=column_stats['q3'],
+                                     lowerfence=column_stats['lowerfence'], upperfence=column_stats['upperfence'],
+                                     mean=column_stats['mean'],
+                                     marker_color='green', showlegend=False), (i // col_num) + 1, (i % col_num) + 1)
 
             fig.update_xaxes(title_text=f'{operation["Op Name"]}-{operation["Input Shapes"]}', row=(i // col_num) + 1,
                              col=(i % col_num) + 1)
         fig.update_layout(margin=dict(l=20, r=20, t=20, b=20),
                           height=int(500 * row_num),
-                          width=int(rank_num * 100 * col_num),
+                          width=int(box_num * 100 * col_num),
                           title_text="Op Performance Comparison")
         save_plot_path = os.path.join(self.result_dir, column + "_Info.html")
         PathManager.check_path_length(save_plot_path)
@@ -252,9 +339,9 @@ class StatisticalInfoToHtmlAnalyzer(OpSummaryAnalyzerBase):
         # 该文件权限设置为只读权限，不允许修改
         os.chmod(save_plot_path, stat.S_IROTH)
 
-    def getCalNum(self, rank_num):
+    def getCalNum(self, box_num):
         # 计算每行应该画多少个子图
-        if rank_num <= 16:
+        if box_num <= 16:
             return 2
         else:
             return 1
@@ -266,11 +353,12 @@ class DeliverableGenerator:
         self.formProcess = FormDataProcessor(args.dir, 'op_summary*.csv')
         self.analyzers = []
         self.columns_to_keep = []
+        self.columns_to_group = []
         self.setAnalyzers(args)
         self.setColumnsToKeep()
 
     def run(self):
-        summary_data = self.formProcess.readSummaryData(self.columns_to_keep)
+        summary_data = self.formProcess.readSummaryData(self.columns_to_keep, self.columns_to_group, self.args.workers)
         # 判断summarydata 数据是否为空，如果是空， 说明所有csv读取数据都失败了
         if summary_data.empty:
             print("没有符合要求的csv表格数据，请排查您的PROFILING数据")
@@ -299,10 +387,13 @@ class DeliverableGenerator:
 
     def setColumnsToKeep(self):
         columns_to_keep = []
+        columns_to_group = []
         for analyzer in self.analyzers:
+            columns_to_group.extend(analyzer.getColumnsToGroup())
             columns_to_keep.extend(analyzer.getColumnsToGroup())
             columns_to_keep.extend(analyzer.getColumnsToView())
         self.columns_to_keep = list(set(columns_to_keep))
+        self.columns_to_group = list(set(columns_to_group))
 
 
 def main():
@@ -311,6 +402,8 @@ def main():
     parser.add_argument("--dir", "-d", default=None, help="root dir of PROF_* data")
     parser.add_argument("--top_n", "-n", default=10, help="how many operators to show", type=int)
     parser.add_argument("--type", "-t", default='html', help="compare ratio or aicore-time", type=str)
+    parser.add_argument("--workers", "-w", default=0, help="number of processes to read the csv files, "
+                        "0 means the number of cpus", type=int)
     args = parser.parse_args()
 
     deviverable_gen = DeliverableGenerator(args)
@@ -18,6 +18,7 @@ class Constant(object):
     # dir name
     FRAMEWORK_DIR = "FRAMEWORK"
     CLUSTER_ANALYSIS_OUTPUT = "cluster_analysis_output"
+    RANK_DATA_CACHE = "rank_data_cache"
     SINGLE_OUTPUT = "ASCEND_PROFILER_OUTPUT"
     COMM_JSON = "communication.json"
     COMM_MATRIX_JSON = "communication_matrix.json"
@@ -27,6 +28,9 @@ class Constant(object):
     FILE_AUTHORITY = 0o640
     DIR_AUTHORITY = 0o750
     MAX_JSON_SIZE = 1024 * 1024 * 1024 * 10
+    # json files above this size are parsed incrementally, record by record at the stream depth
+    STREAM_JSON_SIZE = 1024 * 1024 * 512
+    JSON_STREAM_DEPTH = 3
     MAX_CSV_SIZE = 1024 * 1024 * 1024 * 5
     MAX_PATH_LENGTH = 4096
 
@@ -52,6 +56,7 @@ class Constant(object):
     TRANSIT_SIZE_MB = "Transit Size(MB)"
     SIZE_DISTRIBUTION = "Size Distribution"
     WAIT_TIME_MS = "Wait Time(ms)"
+    ELAPSE_TIME_MS = "Elapse Time(ms)"
     BANDWIDTH_GB_S = "Bandwidth(GB/s)"
     COMMUNICATION = "communication.json"
 
@@ -62,6 +67,12 @@ class Constant(object):
     COLLECTION_PATH = "collection_path"
     COMMUNICATION_GROUP = "communication_group"
     TRANSPORT_TYPE = "Transport Type"
+    RANK_DATA_STORE = "rank_data_store"
+    WORKERS = "workers"
+
+    # parallel loading, 0 workers means one per cpu
+    DEFAULT_WORKERS = 0
+    CHUNKS_PER_WORKER = 4
 
     # step time
     RANK = 'rank'
@@ -70,6 +81,19 @@ class Constant(object):
     # epsilon
     EPS = 1e-15
 
+    # db output
+    TEXT = "text"
+    DB = "db"
+    OUTPUT_TYPE = "output_type"
+    DB_FILE_NAME = "cluster_analysis.db"
+    DB_BATCH_SIZE = 10000
+    TABLE_RANKS = "ranks"
+    TABLE_GROUPS = "groups"
+    TABLE_GROUP_MEMBERS = "group_members"
+    TABLE_OPS = "ops"
+    TABLE_LINKS = "links"
+    TABLE_STEPS = "steps"
+
     # file suffix
     JSON_SUFFIX = ".json"
     CSV_SUFFIX = ".csv"
@@ -0,0 +1,117 @@
+# Copyright (c) 2023, Huawei Technologies Co., Ltd.
+# All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0  (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import sqlite3
+from contextlib import contextmanager
+
+from common_func.constant import Constant
+from common_func.path_manager import PathManager
+
+
+class DBManager:
+    """
+    Optional sqlite output of the cluster analysis, with one normalized table per entity instead of nested
+    json and wide csv files:
+        ranks:         rank id and profiling directory
+        groups:        name and type of every collective group, p2p group and pipeline stage
+        group_members: one row per rank of every group
+        ops:           communication time info of every op, per group, step and rank, with a flag on the total
+                       op info rows of each group and step
+        links:         transit info of every link of every op, per group and step, with the same total flag
+        steps:         step trace time of every rank and stage, one row per metric
+    Ops and links are keyed by the group name of the op, unlike the json output which merges the groups
+    of the same ranks.
+    """
+    RANK_ID = "INTEGER REFERENCES ranks(rank_id)"
+    GROUP_NAME = "TEXT REFERENCES groups(group_name)"
+    TABLES = {
+        Constant.TABLE_RANKS: [("rank_id", "INTEGER PRIMARY KEY"), ("profiling_path", "TEXT")],
+        Constant.TABLE_GROUPS: [("group_name", "TEXT PRIMARY KEY"), ("group_type", "TEXT")],
+        Constant.TABLE_GROUP_MEMBERS: [("group_name", GROUP_NAME), ("rank_id", RANK_ID)],
+        Constant.TABLE_OPS: [("group_name", GROUP_NAME), ("step_id", "TEXT"), ("op_name", "TEXT"),
+                             ("is_total", "INTEGER"), ("rank_id", RANK_ID), ("start_timestamp_us", "REAL"),
+                             ("elapse_time_ms", "REAL"), ("transit_time_ms", "REAL"), ("wait_time_ms", "REAL"),
+                             ("synchronization_time_ms", "REAL"), ("wait_time_ratio", "REAL"),
+                             ("synchronization_time_ratio", "REAL")],
+        Constant.TABLE_LINKS: [("group_name", GROUP_NAME), ("step_id", "TEXT"), ("op_name", "TEXT"),
+                               ("is_total", "INTEGER"), ("src_rank", RANK_ID), ("dst_rank", RANK_ID),
+                               ("transport_type", "TEXT"), ("transit_time_ms", "REAL"), ("transit_size_mb", "REAL"),
+                               ("bandwidth_gb_s", "REAL")],
+        Constant.TABLE_STEPS: [("step_id", "TEXT"), ("type", "TEXT"), ("rank_id", RANK_ID), ("group_name", GROUP_NAME),
+                               ("metric", "TEXT"), ("value", "REAL")]
+    }
+    INDEXES = {
+        Constant.TABLE_GROUP_MEMBERS: [("group_name",), ("rank_id",)],
+        Constant.TABLE_OPS: [("group_name", "step_id", "op_name"), ("rank_id",)],
+        Constant.TABLE_LINKS: [("group_name", "step_id", "op_name"), ("bandwidth_gb_s",)],
+        Constant.TABLE_STEPS: [("step_id", "type"), ("rank_id",), ("group_name",)]
+    }
+    # concurrent analyses write to the same database file, wait for each other's transactions
+    TIMEOUT = 600
+
+    @staticmethod
+    def get_stage_name(stage_id: int) -> str:
+        return f"{Constant.STAGE}{stage_id}"
+
+    @classmethod
+    def get_db_path(cls, collection_path: str) -> str:
+        return os.path.join(collection_path, Constant.CLUSTER_ANALYSIS_OUTPUT, Constant.DB_FILE_NAME)
+
+    @classmethod
+    def create_tables(cls, collection_path: str) -> None:
+        db_path = cls.get_db_path(collection_path)
+        PathManager.check_path_writeable(os.path.dirname(db_path))
+        PathManager.create_file_safety(db_path)
+        try:
+            with cls._connect(db_path) as conn:
+                for table_name, columns in cls.TABLES.items():
+                    column_defs = ", ".join(f"{name} {column_type}" for name, column_type in columns)
+                    conn.execute(f"CREATE TABLE IF NOT EXISTS {table_name} ({column_defs})")
+                    for index_columns in cls.INDEXES.get(table_name, []):
+                        index_name = f"idx_{table_name}_{'_'.join(index_columns)}"
+                        conn.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON {table_name} "
+                                     f"({', '.join(index_columns)})")
+        except sqlite3.Error as e:
+            raise RuntimeError(f"Can't create the tables of {Constant.DB_FILE_NAME}") from e
+
+    @classmethod
+    def insert_data(cls, collection_path: str, table_name: str, rows) -> None:
+        """insert the rows, an iterable of tuples in the column order of the table, in one transaction"""
+        columns = cls.TABLES.get(table_name)
+        sql = f"INSERT INTO {table_name} VALUES ({', '.join('?' * len(columns))})"
+        batch = []
+        try:
+            with cls._connect(cls.get_db_path(collection_path)) as conn:
+                for row in rows:
+                    batch.append(row)
+                    if len(batch) >= Constant.DB_BATCH_SIZE:
+                        conn.executemany(sql, batch)
+                        batch = []
+                if batch:
+                    conn.executemany(sql, batch)
+        except sqlite3.Error as e:
+            raise RuntimeError(f"Can't insert data into table {table_name}") from e
+
+    @classmethod
+    @contextmanager
+    def _connect(cls, db_path: str):
+        """connection whose statements are committed together on success and rolled back on error"""
+        conn = sqlite3.connect(db_path, timeout=cls.TIMEOUT)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
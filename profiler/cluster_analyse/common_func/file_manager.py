@@ -18,6 +18,7 @@ import csv
 import json
 
 from common_func.constant import Constant
+from common_func.json_stream_reader import JsonStreamReader
 from common_func.path_manager import PathManager
 
 
@@ -26,8 +27,9 @@ class FileManager:
     DATA_DIR_AUTHORITY = 0o750
 
     @classmethod
-    def read_csv_file(cls, file_path: str, class_bean: any) -> list:
-        PathManager.check_path_readable(file_path)
+    def read_csv_file(cls, file_path: str, class_bean: any, check_path: bool = True) -> list:
+        if check_path:
+            PathManager.check_path_readable(file_path)
         base_name = os.path.basename(file_path)
         file_size = os.path.getsize(file_path)
         if file_size <= 0:
@@ -45,8 +47,10 @@ class FileManager:
         return result_data
 
     @classmethod
-    def read_json_file(cls, file_path: str) -> dict:
-        PathManager.check_path_readable(file_path)
+    def read_json_file(cls, file_path: str, check_path: bool = True) -> dict:
+        """check_path is False when the caller already checked the file, such as in the rank data loader processes"""
+        if check_path:
+            PathManager.check_path_readable(file_path)
         base_name = os.path.basename(file_path)
         file_size = os.path.getsize(file_path)
         if file_size <= 0:
@@ -60,6 +64,40 @@ class FileManager:
             raise RuntimeError(f"Failed to read the file: {base_name}") from e
         return result_data
 
+    @classmethod
+    def iter_json_items(cls, file_path: str, depth: int = Constant.JSON_STREAM_DEPTH, check_path: bool = True):
+        """
+        yield (key path, value) records of a json object file, such as (step, op type, op name) and the op info
+        of communication.json. values above the depth that are not objects or are empty objects are yielded
+        with their shorter key path. files above STREAM_JSON_SIZE are parsed incrementally, holding only the
+        current record and a read buffer in memory, so they have no size limit.
+        """
+        if check_path:
+            PathManager.check_path_readable(file_path)
+        base_name = os.path.basename(file_path)
+        file_size = os.path.getsize(file_path)
+        if file_size <= 0:
+            return
+        try:
+            with open(file_path, "r") as json_file:
+                if file_size > Constant.STREAM_JSON_SIZE:
+                    yield from JsonStreamReader(json_file).iter_items(depth)
+                    return
+                result_data = json.load(json_file)
+            if not isinstance(result_data, dict):
+                raise ValueError("The json document is not an object.")
+            yield from cls._iter_dict_items(result_data, (), depth)
+        except Exception as e:
+            raise RuntimeError(f"Failed to read the file: {base_name}") from e
+
+    @classmethod
+    def _iter_dict_items(cls, data: dict, key_path: tuple, depth: int):
+        for key, value in data.items():
+            if depth > 1 and isinstance(value, dict) and value:
+                yield from cls._iter_dict_items(value, key_path + (key,), depth - 1)
+            else:
+                yield key_path + (key,), value
+
     @classmethod
     def create_csv_file(cls, profiler_path: str, data: list, file_name: str, headers: list = None) -> None:
         if not data:
@@ -98,10 +136,15 @@ class FileManager:
             raise RuntimeError(f"Can't create the file: {base_name}") from e
 
     @classmethod
-    def create_output_dir(cls, collection_path: str) -> None:
+    def create_output_dir(cls, collection_path: str, keep_names: list = None) -> None:
         output_path = os.path.join(
             collection_path, Constant.CLUSTER_ANALYSIS_OUTPUT)
-        PathManager.remove_path_safety(output_path)
+        if not keep_names or not os.path.isdir(output_path) or os.path.islink(output_path):
+            PathManager.remove_path_safety(output_path)
+        else:
+            for name in os.listdir(output_path):
+                if name not in keep_names:
+                    PathManager.remove_path_safety(os.path.join(output_path, name))
         PathManager.make_dir_safety(output_path)
 
     @classmethod
@@ -0,0 +1,119 @@
+# Copyright (c) 2023, Huawei Technologies Co., Ltd.
+# All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0  (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import re
+
+
+class JsonStreamReader:
+    """
+    Incremental reader of a json document made of nested objects, such as communication.json
+    {step: {op type: {op name: op info}}}. The file is read in chunks and every value below the
+    given depth is decoded on its own with json.JSONDecoder.raw_decode, so the text of the whole
+    document is never held in memory.
+    """
+    CHUNK_SIZE = 1024 * 1024
+    NUMBER_CUT_SIZE = 2
+    WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+    def __init__(self, json_file, chunk_size: int = CHUNK_SIZE):
+        self.json_file = json_file
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def iter_items(self, depth: int):
+        """
+        yield (key path, value) for every value at the given depth of the top level object, and for values
+        of a smaller depth that are not objects or are empty objects
+        """
+        if self._next_char() != "{":
+            raise ValueError("The json document is not an object.")
+        yield from self._iter_object((), depth)
+        if self._skip_whitespace():
+            raise ValueError("Extra data after the json document.")
+
+    def _iter_object(self, key_path: tuple, depth: int):
+        if self._peek_char() == "}":
+            self.pos += 1
+            if key_path:
+                yield key_path, {}
+            return
+        while True:
+            key = self._decode()
+            if not isinstance(key, str) or self._next_char() != ":":
+                raise ValueError("Invalid json object key.")
+            if depth > 1 and self._peek_char() == "{":
+                self.pos += 1
+                yield from self._iter_object(key_path + (key,), depth - 1)
+            else:
+                yield key_path + (key,), self._decode()
+            separator = self._next_char()
+            if separator == "}":
+                return
+            if separator != ",":
+                raise ValueError("Invalid json object separator.")
+
+    def _fill(self, size: int = None) -> bool:
+        if self.eof:
+            return False
+        chunk = self.json_file.read(size or self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def _skip_whitespace(self) -> bool:
+        """skip whitespace, return False at the end of the file"""
+        while True:
+            self.pos = self.WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return True
+            if not self._fill():
+                return False
+
+    def _peek_char(self) -> str:
+        if not self._skip_whitespace():
+            raise ValueError("Unexpected end of the json document.")
+        return self.buffer[self.pos]
+
+    def _next_char(self) -> str:
+        char = self._peek_char()
+        self.pos += 1
+        return char
+
+    def _decode(self):
+        self._skip_whitespace()
+        # a value larger than the buffer is decoded again after every read, grow the reads to keep it linear
+        read_size = self.chunk_size
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self._fill(read_size):
+                    read_size *= 2
+                    continue
+                raise
+            # a number near the end of the buffer may continue in the next chunk, after a cut such as "1." or "2e-"
+            # it is decoded up to the cut
+            if isinstance(value, (int, float)) and len(self.buffer) - end <= self.NUMBER_CUT_SIZE and \
+                    self._fill(read_size):
+                continue
+            self.pos = end
+            return value
@@ -162,7 +162,10 @@ class PathManager:
             raise RuntimeError(msg)
         if os.path.exists(path):
             try:
-                shutil.rmtree(path)
+                if os.path.isdir(path):
+                    shutil.rmtree(path)
+                else:
+                    os.remove(path)
             except Exception as err:
                 raise RuntimeError(msg) from err
 
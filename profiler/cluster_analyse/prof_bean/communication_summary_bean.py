@@ -0,0 +1,118 @@
+# Copyright (c) 2023, Huawei Technologies Co., Ltd.
+# All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0  (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from common_func.constant import Constant
+
+
+class CommunicationSummaryBean:
+    """
+    Compact form of the communication.json of a rank, built in the loader processes from the
+    ((step, op type, op name), op info) records of FileManager.iter_json_items:
+        ops: [(step id, op type, op name, op info)] of every op except the Total Op Info of each op type
+        step_ids: steps whose data is an object, in file order
+        invalid_step_num: steps whose data is not an object
+    """
+
+    def __init__(self, records):
+        self.ops = []
+        self.invalid_step_num = 0
+        step_ids = {}
+        for key_path, value in records:
+            step_id = key_path[0]
+            if len(key_path) == 1 and not isinstance(value, dict):
+                self.invalid_step_num += 1
+                continue
+            step_ids.setdefault(step_id)
+            if len(key_path) == 3 and not key_path[2].startswith('Total'):
+                self.ops.append((step_id, key_path[1], key_path[2], value))
+        self.step_ids = list(step_ids)
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        bean = cls([])
+        bean.ops = [tuple(op) for op in data.get("ops")]
+        bean.step_ids = data.get("step_ids")
+        bean.invalid_step_num = data.get("invalid_step_num")
+        return bean
+
+    def to_dict(self) -> dict:
+        return {"ops": self.ops, "step_ids": self.step_ids, "invalid_step_num": self.invalid_step_num}
+
+
+class CommMatrixSummaryBean:
+    """
+    Compact form of the communication_matrix.json of a rank, built in the loader processes from the
+    ((step, op type, op name), link info) records of FileManager.iter_json_items:
+        ops: [(step id, op type, op name, link info)] of the collective and p2p ops except the Total Op Info
+        p2p_links: {step id: {(smaller rank, larger rank)}} of the p2p links between two ranks, for every step
+            that has ops data
+        unknown_type_num: op types other than collective and p2p, their ops are skipped
+    """
+
+    def __init__(self, records):
+        self.ops = []
+        self.p2p_links = {}
+        unknown_types = set()
+        step_ids = set()
+        for key_path, value in records:
+            step_id = key_path[0]
+            step_ids.add(step_id)
+            if len(key_path) == 1:
+                continue
+            op_type = key_path[1]
+            step_links = self.p2p_links.setdefault(step_id, set())
+            if op_type != Constant.COLLECTIVE and op_type != Constant.P2P:
+                unknown_types.add((step_id, op_type))
+                continue
+            if len(key_path) == 2:
+                continue
+            op_name = key_path[2]
+            if op_type == Constant.P2P:
+                self.add_p2p_links(step_links, op_name, value)
+            if not op_name.startswith('Total'):
+                self.ops.append((step_id, op_type, op_name, value))
+        self.step_num = len(step_ids)
+        self.unknown_type_num = len(unknown_types)
+
+    @staticmethod
+    def add_p2p_links(p2p_links: set, op_name: str, link_dict: dict):
+        for link in link_dict:
+            if '-' not in link:
+                print(f"{op_name} has an invalid link key {link}!")
+                break
+            src_rank = int(link.split('-')[0])
+            dst_rank = int(link.split('-')[1])
+            if src_rank != dst_rank:
+                p2p_links.add((min(src_rank, dst_rank), max(src_rank, dst_rank)))
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        bean = cls([])
+        bean.ops = [tuple(op) for op in data.get("ops")]
+        bean.p2p_links = {step_id: {tuple(link) for link in links} for step_id, links in data.get("p2p_links").items()}
+        bean.unknown_type_num = data.get("unknown_type_num")
+        bean.step_num = data.get("step_num")
+        return bean
+
+    def to_dict(self) -> dict:
+        return {
+            "ops": self.ops,
+            "p2p_links": {step_id: sorted(links) for step_id, links in self.p2p_links.items()},
+            "unknown_type_num": self.unknown_type_num,
+            "step_num": self.step_num
+        }
+
+    def is_empty(self) -> bool:
+        return not self.step_num
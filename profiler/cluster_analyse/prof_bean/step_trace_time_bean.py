@@ -21,6 +21,10 @@ class StepTraceTimeBean:
     def __init__(self, data: list):
         self._data = data
 
+    @property
+    def data(self) -> dict:
+        return self._data
+
     @property
     def row(self) -> list:
         row = []
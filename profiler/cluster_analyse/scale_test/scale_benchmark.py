@@ -0,0 +1,210 @@
+# Copyright (c) 2023, Huawei Technologies Co., Ltd.
+# All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0  (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import argparse
+import csv
+import multiprocessing
+import os
+import queue
+import sys
+import time
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analysis.analysis_facade import AnalysisFacade, run_analysis
+from cluster_analysis import Interface
+from common_func.constant import Constant
+from common_func.path_manager import PathManager
+from scale_test.synthetic_data_generator import add_generator_arguments, generate_cluster_data, get_config
+
+BENCHMARK_CSV = "scale_benchmark.csv"
+BENCHMARK_HEADERS = ["Ranks", "Phase", "Time(s)", "Peak RSS(MB)", "Children Peak RSS(MB)"]
+POLL_INTERVAL = 5
+FAILED_PHASE = "failed"
+
+
+def get_peak_rss_mb(children: bool = False) -> float:
+    """peak resident set size of the process, or of its largest terminated child process, -1 if unknown"""
+    if resource is None:
+        return -1
+    max_rss = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in KB elsewhere
+    return max_rss / 1024 / 1024 if sys.platform == "darwin" else max_rss / 1024
+
+
+class PhaseRecorder:
+    def __init__(self):
+        self.records = []
+
+    @contextmanager
+    def phase(self, name: str):
+        start_time = time.perf_counter()
+        yield
+        self.records.append([name, round(time.perf_counter() - start_time, 3),
+                             round(get_peak_rss_mb(), 1), round(get_peak_rss_mb(children=True), 1)])
+
+
+def run_phases(collection_path: str, workers: int, output_type: str) -> tuple:
+    """
+    run the stages of Interface.run one after another on the data of collection_path, with every analysis
+    in the current process so that its time and memory are recorded on their own.
+    return the rank num and [phase, time, peak rss, children peak rss] of every phase.
+    """
+    interface = Interface(argparse.Namespace(collection_path=collection_path, workers=workers, use_cache=False,
+                                             output_type=output_type))
+    recorder = PhaseRecorder()
+    start_time = time.perf_counter()
+    with recorder.phase("data_map"):
+        interface.prepare_output_dir()
+        data_map = interface.get_data_map()
+    if not data_map:
+        raise RuntimeError("Can not get rank info or profiling data.")
+    with recorder.phase("load_rank_data"):
+        rank_data_store = interface.load_rank_data(data_map)
+    with recorder.phase("communication_group"):
+        communication_group, collective_group_dict, communication_ops = \
+            interface.generate_communication_group(data_map, rank_data_store)
+    if output_type == Constant.DB:
+        with recorder.phase("dump_db"):
+            interface.dump_db(data_map, communication_group, collective_group_dict, communication_ops)
+    params = interface.get_analysis_params(data_map, rank_data_store, communication_group, collective_group_dict,
+                                           communication_ops)
+    for analysis in AnalysisFacade.analysis_module:
+        with recorder.phase(analysis.__name__):
+            run_analysis(analysis, params)
+    recorder.records.append(["total", round(time.perf_counter() - start_time, 3)] + recorder.records[-1][2:])
+    return len(data_map), recorder.records
+
+
+def run_phases_in_process(result_queue, collection_path: str, workers: int, output_type: str):
+    try:
+        result_queue.put(run_phases(collection_path, workers, output_type))
+    except Exception as err:
+        result_queue.put(err)
+
+
+def benchmark(collection_path: str, workers: int, output_type: str) -> tuple:
+    """run the phases in a new process, so the peak rss belongs to this run only"""
+    context = multiprocessing.get_context("spawn")
+    result_queue = context.Queue()
+    process = context.Process(target=run_phases_in_process, args=(result_queue, collection_path, workers, output_type))
+    process.start()
+    try:
+        result = wait_result(result_queue, process)
+    finally:
+        process.join()
+    if isinstance(result, Exception):
+        raise RuntimeError(f"The benchmark process failed: {result}") from result
+    return result
+
+
+def wait_result(result_queue, process):
+    """get the result of the process, raise RuntimeError if it exits without one, e.g. killed for out of memory"""
+    while True:
+        try:
+            return result_queue.get(timeout=POLL_INTERVAL)
+        except queue.Empty:
+            if process.exitcode is None:
+                continue
+        # the result may arrive between the last poll and the exit
+        try:
+            return result_queue.get(timeout=POLL_INTERVAL)
+        except queue.Empty:
+            raise RuntimeError(f"The benchmark process exited with code {process.exitcode} and no result.") from None
+
+
+def dump_results(output_path: str, rows: list):
+    result_file = os.path.join(output_path, BENCHMARK_CSV)
+    with os.fdopen(os.open(result_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, Constant.FILE_AUTHORITY), "w",
+                   newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(BENCHMARK_HEADERS)
+        writer.writerows(rows)
+    print(f"The benchmark result is saved in {result_file}.")
+
+
+def print_records(rank_num: int, records: list):
+    print(f"Benchmark of {rank_num} ranks:")
+    print("".join(f"{header:>24}" for header in BENCHMARK_HEADERS[1:]))
+    for record in records:
+        print("".join(f"{value:>24}" for value in record))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="time and peak memory of every phase of the cluster analysis")
+    data_group = parser.add_mutually_exclusive_group(required=True)
+    data_group.add_argument('-d', '--collection_path', type=str, help="benchmark existing profiling data")
+    data_group.add_argument('-r', '--ranks', type=int, nargs='+', help="benchmark synthetic data of these rank nums")
+    parser.add_argument('-p', '--output_path', type=str, required=True,
+                        help="path of the synthetic data and of scale_benchmark.csv")
+    parser.add_argument('-w', '--workers', type=int, default=Constant.DEFAULT_WORKERS,
+                        help="processes to generate and parse the rank data with, defaults to the cpu count")
+    parser.add_argument('-o', '--output_type', choices=[Constant.TEXT, Constant.DB], default=Constant.TEXT,
+                        help="output type of the analysis")
+    parser.add_argument('-k', '--keep_data', action='store_true', help="keep the synthetic data after the run")
+    add_generator_arguments(parser)
+    args = parser.parse_args()
+
+    output_path = os.path.realpath(args.output_path)
+    PathManager.make_dir_safety(output_path)
+    PathManager.check_path_writeable(output_path)
+    rows = []
+    failed = False
+    if args.collection_path:
+        collection_path = PathManager.get_realpath(args.collection_path)
+        try:
+            rank_num, records = benchmark(collection_path, args.workers, args.output_type)
+        except RuntimeError as err:
+            print(f"[ERROR] Benchmark of {collection_path} failed. {err}")
+            failed = True
+        else:
+            print_records(rank_num, records)
+            rows.extend([rank_num] + record for record in records)
+    for rank_num in args.ranks or []:
+        try:
+            config = get_config(args, rank_num)
+        except ValueError as err:
+            parser.error(str(err))
+        data_path = os.path.join(output_path, f"synthetic_{rank_num}_ranks")
+        if os.path.exists(data_path):
+            PathManager.remove_path_safety(data_path)
+        start_time = time.perf_counter()
+        generate_cluster_data(config, data_path, args.workers)
+        print(f"Generate the synthetic data of {rank_num} ranks in {time.perf_counter() - start_time:.2f}s.")
+        try:
+            _, records = benchmark(data_path, args.workers, args.output_type)
+        except RuntimeError as err:
+            print(f"[ERROR] Benchmark of {rank_num} ranks failed. {err}")
+            rows.append([rank_num, FAILED_PHASE] + ["N/A"] * (len(BENCHMARK_HEADERS) - 2))
+            failed = True
+            continue
+        finally:
+            if not args.keep_data:
+                PathManager.remove_path_safety(data_path)
+        print_records(rank_num, records)
+        rows.extend([rank_num] + record for record in records)
+    dump_results(output_path, rows)
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
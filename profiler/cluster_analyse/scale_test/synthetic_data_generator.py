@@ -0,0 +1,220 @@
+# Copyright (c) 2023, Huawei Technologies Co., Ltd.
+# All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0  (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import argparse
+import csv
+import json
+import os
+import random
+import sys
+from functools import partial
+from multiprocessing import Pool
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common_func.constant import Constant
+from common_func.path_manager import PathManager
+
+
+class SyntheticClusterConfig:
+    """
+    Layout of a synthetic cluster, rank = pp_index * stage_size + dp_index * tp_size + tp_index:
+        tp groups: tp_size consecutive ranks
+        dp groups: ranks of a stage with the same tp index
+        pp groups: ranks with the same index in every stage, linked by send and receive ops
+    """
+    STEP_TRACE_HEADERS = ["Step", "Computing", "Communication(Not Overlapped)", "Overlapped", "Communication",
+                          "Free", "Stage", "Bubble", "Communication(Not Overlapped and Exclude Receive)"]
+    TIMESTAMP = "20231010101010000"
+
+    def __init__(self, rank_num: int, tp_size: int = 8, pp_size: int = 1, step_num: int = 1,
+                 collective_op_num: int = 20, p2p_op_num: int = 4, ranks_per_node: int = 8, seed: int = 0):
+        if min(rank_num, tp_size, pp_size, step_num, ranks_per_node) < 1 or min(collective_op_num, p2p_op_num) < 0:
+            raise ValueError("The rank, group, step and node sizes should be positive, the op counts not negative.")
+        if rank_num % (tp_size * pp_size):
+            raise ValueError(f"The rank num {rank_num} is not a multiple of tp size * pp size {tp_size * pp_size}.")
+        self.rank_num = rank_num
+        self.tp_size = tp_size
+        self.pp_size = pp_size
+        self.stage_size = rank_num // pp_size
+        self.step_num = step_num
+        self.collective_op_num = collective_op_num
+        self.p2p_op_num = p2p_op_num
+        self.ranks_per_node = ranks_per_node
+        self.seed = seed
+
+    def get_groups(self, rank_id: int) -> list:
+        """return [(group name, ranks of the group)] of the tp and dp groups of a rank"""
+        pp_index, stage_rank = divmod(rank_id, self.stage_size)
+        tp_start = rank_id - rank_id % self.tp_size
+        tp_group = (f"tp{tp_start // self.tp_size}", list(range(tp_start, tp_start + self.tp_size)))
+        dp_start = pp_index * self.stage_size + stage_rank % self.tp_size
+        dp_group = (f"dp{pp_index * self.tp_size + stage_rank % self.tp_size}",
+                    list(range(dp_start, (pp_index + 1) * self.stage_size, self.tp_size)))
+        return [tp_group, dp_group]
+
+    def get_pp_peers(self, rank_id: int) -> tuple:
+        """return the ranks of the previous and the next stage linked to a rank, None at the first and last stage"""
+        prev_rank = rank_id - self.stage_size if rank_id >= self.stage_size else None
+        next_rank = rank_id + self.stage_size if rank_id + self.stage_size < self.rank_num else None
+        return prev_rank, next_rank
+
+    def get_rank_dir_name(self, rank_id: int) -> str:
+        return f"node{rank_id // self.ranks_per_node}_{rank_id}_{self.TIMESTAMP}_ascend_pt"
+
+
+def make_op_info(rand: random.Random, transport_type: str) -> dict:
+    elapse_time = rand.uniform(0.1, 10)
+    transit_time = rand.uniform(0.05, elapse_time)
+    wait_time = rand.uniform(0, elapse_time - transit_time)
+    synchronization_time = rand.uniform(0, wait_time)
+    transit_size = rand.uniform(0.1, 64)
+    return {
+        Constant.COMMUNICATION_TIME_INFO: {
+            Constant.START_TIMESTAMP: rand.uniform(1.6e15, 1.7e15),
+            Constant.ELAPSE_TIME_MS: elapse_time,
+            Constant.TRANSIT_TIME_MS: transit_time,
+            Constant.WAIT_TIME_MS: wait_time,
+            Constant.SYNCHRONIZATION_TIME_MS: synchronization_time,
+            Constant.WAIT_TIME_RATIO: wait_time / (wait_time + transit_time),
+            Constant.SYNCHRONIZATION_TIME_RATIO: synchronization_time / (synchronization_time + transit_time)
+        },
+        Constant.COMMUNICATION_BANDWIDTH_INFO: {
+            transport_type: {
+                Constant.TRANSIT_SIZE_MB: transit_size,
+                Constant.TRANSIT_TIME_MS: transit_time,
+                Constant.BANDWIDTH_GB_S: transit_size / transit_time,
+                "Large Packet Ratio": 0,
+                Constant.SIZE_DISTRIBUTION: {f"{transit_size:.4f}": [1, transit_time]}
+            }
+        }
+    }
+
+
+def make_link_info(rand: random.Random, transport_type: str) -> dict:
+    transit_size = rand.uniform(0.1, 64)
+    transit_time = rand.uniform(0.05, 10)
+    return {
+        Constant.TRANSPORT_TYPE: transport_type,
+        Constant.TRANSIT_SIZE_MB: transit_size,
+        Constant.TRANSIT_TIME_MS: transit_time,
+        Constant.BANDWIDTH_GB_S: transit_size / transit_time
+    }
+
+
+def generate_rank_data(config: SyntheticClusterConfig, rank_id: int) -> tuple:
+    """return the communication.json and communication_matrix.json data of a rank"""
+    rand = random.Random(config.seed * config.rank_num + rank_id)
+    groups = config.get_groups(rank_id)
+    prev_rank, next_rank = config.get_pp_peers(rank_id)
+    pp_group = f"pp{rank_id % config.stage_size}"
+    communication = {}
+    matrix = {}
+    for step in range(1, config.step_num + 1):
+        collective_ops, collective_links, p2p_ops, p2p_links = {}, {}, {}, {}
+        for op_index in range(config.collective_op_num):
+            group_name, group_ranks = groups[op_index % len(groups)]
+            op_name = f"hcom_allReduce__{op_index}_{step}_1@{group_name}"
+            # links of collective ops use the local rank in the group, the local self link maps it to the global rank
+            local_rank = group_ranks.index(rank_id)
+            next_local_rank = (local_rank + 1) % len(group_ranks)
+            collective_ops[op_name] = make_op_info(rand, "HCCS")
+            collective_links[op_name] = {f"{local_rank}-{local_rank}": make_link_info(rand, "LOCAL")}
+            if next_local_rank != local_rank:
+                collective_links[op_name][f"{local_rank}-{next_local_rank}"] = make_link_info(rand, "HCCS")
+        for op_index in range(config.p2p_op_num):
+            for op_type, peer_rank in ((Constant.HCOM_SEND, next_rank), (Constant.HCOM_RECEIVE, prev_rank)):
+                if peer_rank is None:
+                    continue
+                op_name = f"{op_type}__{op_index}_{step}_1@{pp_group}"
+                src_rank, dst_rank = (rank_id, peer_rank) if op_type == Constant.HCOM_SEND else (peer_rank, rank_id)
+                p2p_ops[op_name] = make_op_info(rand, "RDMA")
+                p2p_links[op_name] = {f"{src_rank}-{dst_rank}": make_link_info(rand, "RDMA")}
+        communication[f"step{step}"] = {Constant.COLLECTIVE: collective_ops, Constant.P2P: p2p_ops}
+        matrix[f"step{step}"] = {Constant.COLLECTIVE: collective_links, Constant.P2P: p2p_links}
+    return communication, matrix
+
+
+def write_json(file_path: str, data: dict):
+    with os.fdopen(os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, Constant.FILE_AUTHORITY), "w") as file:
+        json.dump(data, file)
+
+
+def write_rank(config: SyntheticClusterConfig, output_path: str, rank_id: int):
+    rank_dir = os.path.join(output_path, config.get_rank_dir_name(rank_id))
+    single_output = os.path.join(rank_dir, Constant.SINGLE_OUTPUT)
+    os.makedirs(single_output, mode=Constant.DIR_AUTHORITY, exist_ok=True)
+    write_json(os.path.join(rank_dir, f"profiler_info_{rank_id}.json"), {"rank_id": rank_id})
+    communication, matrix = generate_rank_data(config, rank_id)
+    write_json(os.path.join(single_output, Constant.COMM_JSON), communication)
+    write_json(os.path.join(single_output, Constant.COMM_MATRIX_JSON), matrix)
+    rand = random.Random(config.seed * config.rank_num + rank_id)
+    step_file = os.path.join(single_output, Constant.STEP_TIME_CSV)
+    with os.fdopen(os.open(step_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, Constant.FILE_AUTHORITY), "w",
+                   newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(config.STEP_TRACE_HEADERS)
+        for step in range(1, config.step_num + 1):
+            writer.writerow([step] + [round(rand.uniform(0, 1e5), 3) for _ in config.STEP_TRACE_HEADERS[1:]])
+
+
+def generate_cluster_data(config: SyntheticClusterConfig, output_path: str,
+                          workers: int = Constant.DEFAULT_WORKERS) -> str:
+    """write one *_ascend_pt directory per rank under output_path, return the real output path"""
+    output_path = os.path.realpath(output_path)
+    PathManager.make_dir_safety(output_path)
+    PathManager.check_path_writeable(output_path)
+    write_func = partial(write_rank, config, output_path)
+    workers = max(1, min(workers or os.cpu_count() or 1, config.rank_num))
+    if workers <= 1:
+        for rank_id in range(config.rank_num):
+            write_func(rank_id)
+    else:
+        chunk_size = max(1, config.rank_num // (workers * Constant.CHUNKS_PER_WORKER))
+        with Pool(workers) as pool:
+            for _ in pool.imap_unordered(write_func, range(config.rank_num), chunksize=chunk_size):
+                pass
+    return output_path
+
+
+def add_generator_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument('--tp', type=int, default=8, help="ranks of each tp group")
+    parser.add_argument('--pp', type=int, default=1, help="number of pipeline stages")
+    parser.add_argument('--steps', type=int, default=1, help="steps of each rank")
+    parser.add_argument('--collective_ops', type=int, default=20, help="collective ops of each rank and step")
+    parser.add_argument('--p2p_ops', type=int, default=4, help="send and receive ops of each rank and step")
+    parser.add_argument('--ranks_per_node', type=int, default=8, help="ranks of each node")
+    parser.add_argument('--seed', type=int, default=0, help="random seed of the generated data")
+
+
+def get_config(args: argparse.Namespace, rank_num: int) -> SyntheticClusterConfig:
+    return SyntheticClusterConfig(rank_num, args.tp, args.pp, args.steps, args.collective_ops, args.p2p_ops,
+                                  args.ranks_per_node, args.seed)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="generate synthetic cluster profiling data")
+    parser.add_argument('-p', '--output_path', type=str, required=True, help="path to write the rank dirs in")
+    parser.add_argument('-r', '--ranks', type=int, required=True, help="number of ranks")
+    parser.add_argument('-w', '--workers', type=int, default=Constant.DEFAULT_WORKERS,
+                        help="processes to write the rank data with, defaults to the cpu count")
+    add_generator_arguments(parser)
+    args_parsed = parser.parse_args()
+    try:
+        cluster_config = get_config(args_parsed, args_parsed.ranks)
+    except ValueError as err:
+        parser.error(str(err))
+    print(f"Synthetic data of {args_parsed.ranks} ranks is written in "
+          f"{generate_cluster_data(cluster_config, args_parsed.output_path, args_parsed.workers)}.")
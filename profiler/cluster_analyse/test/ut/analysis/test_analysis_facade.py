@@ -0,0 +1,52 @@
+# Copyright (c) 2023, Huawei Technologies Co., Ltd.
+# All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0  (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import contextlib
+import io
+import os
+import unittest
+from unittest.mock import patch
+
+from analysis.analysis_facade import AnalysisFacade
+from common_func.constant import Constant
+
+
+class FinishedAnalysis:
+    def __init__(self, param: dict):
+        self.param = param
+
+    def run(self):
+        pass
+
+
+class KilledAnalysis(FinishedAnalysis):
+    def run(self):
+        os._exit(9)
+
+
+class TestAnalysisFacade(unittest.TestCase):
+
+    def run_facade(self, workers):
+        output = io.StringIO()
+        with patch.object(AnalysisFacade, "analysis_module", [KilledAnalysis, FinishedAnalysis, KilledAnalysis]), \
+                contextlib.redirect_stdout(output):
+            AnalysisFacade({Constant.WORKERS: workers}).cluster_analyze()
+        return output.getvalue()
+
+    def test_killed_analysis_process_reported(self):
+        for workers in [2, 3]:
+            output = self.run_facade(workers)
+            self.assertEqual(output.count("KilledAnalysis failed, the process exited with code 9."), 2)
+            self.assertNotIn("FinishedAnalysis failed", output)
@@ -0,0 +1,121 @@
+# Copyright (c) 2023, Huawei Technologies Co., Ltd.
+# All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0  (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from functools import partial
+from unittest.mock import patch
+
+from cluster_data_preprocess.rank_data_loader import RankDataCache, RankDataLoader, check_rank_files, \
+    get_rank_file_path, load_rank_data
+from common_func.constant import Constant
+from scale_test.synthetic_data_generator import SyntheticClusterConfig, generate_cluster_data
+
+
+class TestRankDataLoader(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = os.path.realpath(tempfile.mkdtemp())
+        self.config = SyntheticClusterConfig(4, tp_size=2, pp_size=2, collective_op_num=4, p2p_op_num=1)
+        data_path = generate_cluster_data(self.config, os.path.join(self.temp_dir, "data"), workers=1)
+        self.data_map = {rank_id: os.path.join(data_path, self.config.get_rank_dir_name(rank_id))
+                         for rank_id in range(self.config.rank_num)}
+        self.cache_path = os.path.join(self.temp_dir, Constant.RANK_DATA_CACHE)
+        os.mkdir(self.cache_path)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def load_all(self) -> dict:
+        """return {rank_id: number of files parsed}"""
+        load_func = partial(load_rank_data, cache_path=self.cache_path, check_errors=check_rank_files(self.data_map))
+        results = RankDataLoader(self.data_map, workers=1).load(load_func)
+        return {rank_id: parsed_num for rank_id, (_, parsed_num) in results.items()}
+
+    def test_fingerprint_reuse(self):
+        rank_data, parsed_num = load_rank_data(0, self.data_map[0], self.cache_path)
+        self.assertEqual(parsed_num, len(rank_data))
+        cached_data, parsed_num = load_rank_data(0, self.data_map[0], self.cache_path)
+        self.assertEqual(parsed_num, 0)
+        self.assertEqual(cached_data[Constant.COMM_JSON].ops, rank_data[Constant.COMM_JSON].ops)
+        self.assertEqual(cached_data[Constant.COMM_MATRIX_JSON].p2p_links,
+                         rank_data[Constant.COMM_MATRIX_JSON].p2p_links)
+        self.assertEqual([bean.row for bean in cached_data[Constant.STEP_TIME_CSV]],
+                         [bean.row for bean in rank_data[Constant.STEP_TIME_CSV]])
+
+    def test_cache_version_mismatch(self):
+        load_rank_data(0, self.data_map[0], self.cache_path)
+        cache_file = os.path.join(self.cache_path, "rank_0.json")
+        with open(cache_file, "r") as file:
+            cache_data = json.load(file)
+        cache_data["version"] = RankDataCache.VERSION - 1
+        with open(cache_file, "w") as file:
+            json.dump(cache_data, file)
+        self.assertEqual(RankDataCache.load(cache_file), {})
+        _, parsed_num = load_rank_data(0, self.data_map[0], self.cache_path)
+        self.assertEqual(parsed_num, len(cache_data["files"]))
+
+    def test_cache_is_plain_json(self):
+        rank_data, _ = load_rank_data(0, self.data_map[0], self.cache_path)
+        with open(os.path.join(self.cache_path, "rank_0.json"), "r") as file:
+            cache_data = json.load(file)
+        self.assertEqual(cache_data["version"], RankDataCache.VERSION)
+        self.assertEqual(cache_data["files"][Constant.COMM_JSON]["data"]["step_ids"],
+                         rank_data[Constant.COMM_JSON].step_ids)
+        cached_data, _ = load_rank_data(0, self.data_map[0], self.cache_path)
+        self.assertEqual(cached_data[Constant.COMM_JSON].to_dict(), rank_data[Constant.COMM_JSON].to_dict())
+        self.assertEqual(cached_data[Constant.COMM_MATRIX_JSON].to_dict(),
+                         rank_data[Constant.COMM_MATRIX_JSON].to_dict())
+        self.assertEqual([bean.data for bean in cached_data[Constant.STEP_TIME_CSV]],
+                         [bean.data for bean in rank_data[Constant.STEP_TIME_CSV]])
+
+    def test_cache_of_other_user_ignored(self):
+        load_rank_data(0, self.data_map[0], self.cache_path)
+        cache_file = os.path.join(self.cache_path, "rank_0.json")
+        self.assertTrue(RankDataCache.load(cache_file))
+        with patch("os.getuid", return_value=os.getuid() + 1):
+            self.assertEqual(RankDataCache.load(cache_file), {})
+
+    def test_owner_check_in_main_process(self):
+        file_path = get_rank_file_path(self.data_map[1], Constant.COMM_JSON)
+        with patch("os.getuid", return_value=os.getuid() + 1), patch("builtins.input", return_value="n") as input_mock:
+            check_errors = check_rank_files(self.data_map)
+        self.assertEqual(input_mock.call_count, self.config.rank_num * 3)
+        self.assertIn(file_path, check_errors)
+        rank_data, parsed_num = load_rank_data(1, self.data_map[1], check_errors=check_errors)
+        self.assertEqual(parsed_num, 0)
+        self.assertIsInstance(rank_data[Constant.COMM_JSON], RuntimeError)
+
+    def test_absent_file_cached(self):
+        os.remove(get_rank_file_path(self.data_map[2], Constant.STEP_TIME_CSV))
+        self.assertEqual(self.load_all(), {0: 3, 1: 3, 2: 2, 3: 3})
+        self.assertEqual(self.load_all(), {0: 0, 1: 0, 2: 0, 3: 0})
+        rank_data, _ = load_rank_data(2, self.data_map[2], self.cache_path)
+        self.assertIsInstance(rank_data[Constant.STEP_TIME_CSV], RuntimeError)
+
+    def test_only_changed_rank_reparsed(self):
+        self.load_all()
+        file_path = get_rank_file_path(self.data_map[2], Constant.COMM_MATRIX_JSON)
+        file_stat = os.stat(file_path)
+        os.utime(file_path, ns=(file_stat.st_atime_ns, file_stat.st_mtime_ns + 10 ** 9))
+        self.assertEqual(self.load_all(), {0: 0, 1: 0, 2: 1, 3: 0})
+        self.assertEqual(self.load_all(), {0: 0, 1: 0, 2: 0, 3: 0})
+
+
+if __name__ == '__main__':
+    unittest.main()
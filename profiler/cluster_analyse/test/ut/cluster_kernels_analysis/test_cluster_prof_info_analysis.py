@@ -0,0 +1,155 @@
+# Copyright (c) 2023, Huawei Technologies Co., Ltd.
+# All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0  (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+from cluster_kernels_analysis import cluster_prof_Info_analysis
+from cluster_kernels_analysis.cluster_prof_Info_analysis import BoxStatsAggregator, FormDataProcessor, \
+    StatisticalInfoToHtmlAnalyzer
+
+GROUP_COLUMNS = ["Op Name", "Input Shapes", "Input Data Types", "Output Shapes"]
+VIEW_COLUMNS = ["Task Duration(us)"]
+
+
+def write_op_summary(dir_path: str, node_id: int, device_id: int, durations: dict, columns: list = None) -> str:
+    """write the op_summary csv of a device, durations is {op name: [task durations]}"""
+    device_dir = os.path.join(dir_path, f"node{node_id}", f"device_{device_id}")
+    os.makedirs(device_dir, exist_ok=True)
+    rows = [{"Op Name": op_name, "Input Shapes": "\"8,16\"", "Input Data Types": "FLOAT16",
+             "Output Shapes": "\"8,16\"", "Task Duration(us)": duration}
+            for op_name, op_durations in durations.items() for duration in op_durations]
+    file_path = os.path.join(device_dir, f"op_summary_{device_id}.csv")
+    pd.DataFrame(rows, columns=columns or GROUP_COLUMNS + VIEW_COLUMNS).to_csv(file_path, index=False)
+    return file_path
+
+
+class TestFormDataProcessor(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = os.path.realpath(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_read_summary_data_parallel_equals_serial(self):
+        for node_id in range(2):
+            for device_id in range(3):
+                write_op_summary(self.temp_dir, node_id, device_id,
+                                 {"MatMul": [10.0 + device_id, 12.5], "Add": [1.0 * node_id, 2.0, 3.0]})
+        processor = FormDataProcessor(self.temp_dir, "op_summary*.csv")
+        serial_data = processor.readSummaryData(GROUP_COLUMNS + VIEW_COLUMNS, GROUP_COLUMNS, workers=1)
+        parallel_data = processor.readSummaryData(GROUP_COLUMNS + VIEW_COLUMNS, GROUP_COLUMNS, workers=2)
+        pd.testing.assert_frame_equal(serial_data, parallel_data)
+        self.assertEqual(len(serial_data), 2 * 3 * 5)
+        self.assertEqual(serial_data["Task Duration(us)"].dtype, "float64")
+        self.assertEqual(serial_data["Op Name"].dtype, "category")
+        self.assertEqual(serial_data["node_id"].dtype, "int32")
+
+    def test_file_with_missing_columns_skipped(self):
+        write_op_summary(self.temp_dir, 0, 0, {"MatMul": [10.0, 11.0]})
+        write_op_summary(self.temp_dir, 0, 1, {"MatMul": [10.0, 11.0]}, columns=GROUP_COLUMNS)
+        processor = FormDataProcessor(self.temp_dir, "op_summary*.csv")
+        for workers in [1, 2]:
+            summary_data = processor.readSummaryData(GROUP_COLUMNS + VIEW_COLUMNS, GROUP_COLUMNS, workers=workers)
+            self.assertEqual(len(summary_data), 2)
+            self.assertEqual(summary_data["device_id"].unique().tolist(), ["0"])
+
+
+class TestBoxStatsAggregator(unittest.TestCase):
+    DEVICE_NUM = 130
+    DEVICES_PER_NODE = 16
+    RECORDS_PER_DEVICE = 6
+
+    def setUp(self):
+        self.temp_dir = os.path.realpath(tempfile.mkdtemp())
+        random_state = np.random.RandomState(1)
+        rows = []
+        for device in range(self.DEVICE_NUM):
+            node_id, device_id = divmod(device, self.DEVICES_PER_NODE)
+            for op_name, scale in [("MatMul", 100.0), ("Add", 10.0)]:
+                durations = random_state.normal(scale, scale / 10, self.RECORDS_PER_DEVICE)
+                # an outlier in every device, the whiskers must not reach it
+                durations[0] = scale * 5
+                rows.extend({"Op Name": op_name, "Input Shapes": "8,16", "Input Data Types": "FLOAT16",
+                             "Output Shapes": "8,16", "Task Duration(us)": duration, "device_id": str(device_id),
+                             "node_id": node_id} for duration in durations)
+        self.summary_data = pd.DataFrame(rows)
+        for column in GROUP_COLUMNS + ["device_id"]:
+            self.summary_data[column] = self.summary_data[column].astype("category")
+        self.summary_data["node_id"] = self.summary_data["node_id"].astype("int32")
+        names = [f"{node_id}_{device_id}" for node_id, device_id in
+                 (divmod(device, self.DEVICES_PER_NODE) for device in range(self.DEVICE_NUM))]
+        bucket_size = 3
+        self.expected_labels = [names[start] if start == min(start + bucket_size, len(names)) - 1 else
+                                f"{names[start]}~{names[min(start + bucket_size, len(names)) - 1]}"
+                                for start in range(0, len(names), bucket_size)]
+        self.summary_data["box"] = [self.expected_labels[names.index(f"{node_id}_{device_id}") // bucket_size]
+                                    for node_id, device_id in
+                                    zip(self.summary_data["node_id"], self.summary_data["device_id"])]
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_box_labels(self):
+        aggregator = BoxStatsAggregator(self.summary_data, GROUP_COLUMNS)
+        self.assertEqual(aggregator.getBoxNum(), 44)
+        self.assertEqual(list(aggregator.box_labels["box"].cat.categories), self.expected_labels)
+        self.assertEqual(self.expected_labels[:2], ["0_0~0_2", "0_3~0_5"])
+        # a box may span two nodes, the last box holds the remaining device
+        self.assertEqual(self.expected_labels[-2:], ["7_14~8_0", "8_1"])
+
+    def test_aggregate_matches_groupby(self):
+        aggregator = BoxStatsAggregator(self.summary_data, GROUP_COLUMNS)
+        top_n_data = self.summary_data[GROUP_COLUMNS].drop_duplicates()
+        box_stats = aggregator.aggregate(self.summary_data, top_n_data, VIEW_COLUMNS)
+        self.assertEqual(sorted(box_stats), [("Add", "8,16", "FLOAT16", "8,16"), ("MatMul", "8,16", "FLOAT16", "8,16")])
+        for (op_name, *_), op_stats in box_stats.items():
+            column_stats = op_stats["Task Duration(us)"]
+            op_data = self.summary_data[self.summary_data["Op Name"] == op_name]
+            grouped = op_data.groupby("box", sort=False)["Task Duration(us)"]
+            self.assertEqual(column_stats["box"], self.expected_labels)
+            expected_q1 = grouped.quantile(0.25)[self.expected_labels]
+            expected_q3 = grouped.quantile(0.75)[self.expected_labels]
+            np.testing.assert_allclose(column_stats["q1"], expected_q1)
+            np.testing.assert_allclose(column_stats["median"], grouped.quantile(0.5)[self.expected_labels])
+            np.testing.assert_allclose(column_stats["q3"], expected_q3)
+            np.testing.assert_allclose(column_stats["mean"], grouped.mean()[self.expected_labels])
+            for label, lowerfence, upperfence in zip(self.expected_labels, column_stats["lowerfence"],
+                                                     column_stats["upperfence"]):
+                values = grouped.get_group(label).to_numpy()
+                iqr = expected_q3[label] - expected_q1[label]
+                inside = values[(values >= expected_q1[label] - 1.5 * iqr) & (values <= expected_q3[label] + 1.5 * iqr)]
+                # the whiskers end at data points inside 1.5 times the iqr, as plotly draws them
+                self.assertEqual(lowerfence, inside.min())
+                self.assertEqual(upperfence, inside.max())
+                self.assertLess(upperfence, values.max())
+
+    def test_html_boxes_match_top_n_ops(self):
+        analyzer = StatisticalInfoToHtmlAnalyzer("ASCEND_OTHER", 2, self.temp_dir)
+        analyzer.columns_to_view = VIEW_COLUMNS
+        with patch.object(cluster_prof_Info_analysis, "plot") as plot_mock, patch("os.chmod"):
+            analyzer.GenerateDeliverable(self.summary_data.drop(columns="box"), self.DEVICE_NUM)
+        figure = plot_mock.call_args[0][0]
+        self.assertEqual(len(figure.data), 2)
+        for trace in figure.data:
+            self.assertEqual(list(trace.x), self.expected_labels)
+            self.assertEqual(len(trace.q1), len(self.expected_labels))
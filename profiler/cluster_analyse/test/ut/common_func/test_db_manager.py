@@ -0,0 +1,76 @@
+# Copyright (c) 2023, Huawei Technologies Co., Ltd.
+# All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0  (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import argparse
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+from cluster_analysis import Interface
+from common_func.constant import Constant
+from common_func.db_manager import DBManager
+from scale_test.synthetic_data_generator import SyntheticClusterConfig, generate_cluster_data
+
+
+class TestDBOutput(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = os.path.realpath(tempfile.mkdtemp())
+        config = SyntheticClusterConfig(8, tp_size=2, pp_size=2, collective_op_num=4, p2p_op_num=1)
+        data_path = generate_cluster_data(config, os.path.join(cls.temp_dir, "data"), workers=1)
+        Interface(argparse.Namespace(collection_path=data_path, workers=1, use_cache=False,
+                                     output_type=Constant.DB)).run()
+        cls.conn = sqlite3.connect(DBManager.get_db_path(data_path))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.conn.close()
+        shutil.rmtree(cls.temp_dir)
+
+    def query(self, sql: str) -> list:
+        return self.conn.execute(sql).fetchall()
+
+    def test_groups(self):
+        self.assertEqual(self.query("SELECT group_type, COUNT(*) FROM groups GROUP BY group_type ORDER BY 1"),
+                         [(Constant.COLLECTIVE, 8), (Constant.P2P, 4), (Constant.STAGE, 2)])
+        self.assertEqual(self.query("SELECT rank_id FROM group_members WHERE group_name = 'stage1' ORDER BY 1"),
+                         [(4,), (5,), (6,), (7,)])
+
+    def test_group_name_references_groups(self):
+        for table_name in (Constant.TABLE_GROUP_MEMBERS, Constant.TABLE_OPS, Constant.TABLE_LINKS):
+            self.assertEqual(self.query(f"SELECT COUNT(*) FROM {table_name} WHERE group_name NOT IN "
+                                        f"(SELECT group_name FROM groups)"), [(0,)])
+        self.assertEqual(self.query("SELECT COUNT(*) FROM steps WHERE type = 'stage' AND group_name NOT IN "
+                                    "(SELECT group_name FROM groups WHERE group_type = 'stage')"), [(0,)])
+
+    def test_rank_ids_are_integers(self):
+        self.assertEqual(self.query("SELECT DISTINCT typeof(rank_id) FROM ops"), [("integer",)])
+        self.assertEqual(self.query("SELECT DISTINCT typeof(src_rank), typeof(dst_rank) FROM links"),
+                         [("integer", "integer")])
+        self.assertEqual(self.query("SELECT DISTINCT typeof(rank_id) FROM steps WHERE type = 'rank'"),
+                         [("integer",)])
+
+    def test_total_op_info_flag(self):
+        self.assertEqual(self.query("SELECT DISTINCT op_name FROM ops WHERE is_total"), [(Constant.TOTAL_OP_INFO,)])
+        self.assertEqual(self.query("SELECT COUNT(*) FROM ops WHERE NOT is_total AND op_name = 'Total Op Info'"),
+                         [(0,)])
+        self.assertEqual(self.query("SELECT DISTINCT op_name FROM links WHERE is_total"), [(Constant.TOTAL_OP_INFO,)])
+
+
+if __name__ == '__main__':
+    unittest.main()
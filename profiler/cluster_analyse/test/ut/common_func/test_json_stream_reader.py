@@ -0,0 +1,109 @@
+# Copyright (c) 2023, Huawei Technologies Co., Ltd.
+# All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0  (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from common_func.constant import Constant
+from common_func.file_manager import FileManager
+from common_func.json_stream_reader import JsonStreamReader
+
+DOCUMENT = {
+    "step1": {
+        "collective": {
+            "hcom_allReduce__1@group": {"Elapse Time(ms)": 1.5, "Wait Time Ratio": 2e-05, "Count": -12,
+                                        "Size Distribution": {"0.0625": [1, 0.25]}},
+            "Total Op Info": {"Elapse Time(ms)": 1.5E+3, "Name": "a \"quoted\" \\u00e9 name"}
+        },
+        "p2p": {}
+    },
+    "step2": {"collective": {"hcom_broadcast__2@group": [1.25, 0, True, None, {"nested": 3.125e-2}]}},
+    "step3": 10.75,
+    "step4": {}
+}
+
+
+def rebuild(items) -> dict:
+    data = {}
+    for key_path, value in items:
+        parent = data
+        for key in key_path[:-1]:
+            parent = parent.setdefault(key, {})
+        parent[key_path[-1]] = value
+    return data
+
+
+class TestJsonStreamReader(unittest.TestCase):
+
+    def test_same_as_json_load_at_every_chunk_size(self):
+        for indent in (None, 2):
+            text = json.dumps(DOCUMENT, indent=indent)
+            for chunk_size in list(range(1, 12)) + [17, 64, 4096]:
+                with self.subTest(indent=indent, chunk_size=chunk_size):
+                    items = list(JsonStreamReader(io.StringIO(text), chunk_size).iter_items(3))
+                    self.assertEqual(rebuild(items), json.loads(text))
+
+    def test_number_cut_by_chunk(self):
+        for text in ['{"a": 1.5}', '{"a": 2e-3}', '{"a": -10.25E+2}', '{"b": {"a": 1.0}, "c": 3}']:
+            for chunk_size in range(1, len(text) + 1):
+                with self.subTest(text=text, chunk_size=chunk_size):
+                    items = JsonStreamReader(io.StringIO(text), chunk_size).iter_items(1)
+                    self.assertEqual(dict((key_path[0], value) for key_path, value in items), json.loads(text))
+
+    def test_empty_objects_yielded_at_their_depth(self):
+        items = list(JsonStreamReader(io.StringIO(json.dumps(DOCUMENT)), 7).iter_items(3))
+        self.assertIn((("step1", "p2p"), {}), items)
+        self.assertIn((("step4",), {}), items)
+        self.assertIn((("step3",), 10.75), items)
+
+    def test_invalid_document(self):
+        for text in ['[1, 2]', '{"a": 1', '{"a": 1} 2', '{"a" 1}']:
+            with self.subTest(text=text), self.assertRaises(ValueError):
+                list(JsonStreamReader(io.StringIO(text), 2).iter_items(3))
+
+
+class TestIterJsonItems(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = os.path.realpath(tempfile.mkdtemp())
+        self.file_path = os.path.join(self.temp_dir, Constant.COMM_JSON)
+        with open(self.file_path, "w") as file:
+            json.dump(DOCUMENT, file)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_streamed_records_same_as_loaded(self):
+        loaded_items = list(FileManager.iter_json_items(self.file_path))
+        with patch.object(Constant, "STREAM_JSON_SIZE", 0):
+            streamed_items = list(FileManager.iter_json_items(self.file_path))
+        self.assertEqual(streamed_items, loaded_items)
+        self.assertEqual(rebuild(loaded_items), DOCUMENT)
+
+    def test_invalid_file(self):
+        with open(self.file_path, "w") as file:
+            file.write("[1, 2]")
+        for stream_size in (0, Constant.STREAM_JSON_SIZE):
+            with patch.object(Constant, "STREAM_JSON_SIZE", stream_size), self.assertRaises(RuntimeError):
+                list(FileManager.iter_json_items(self.file_path))
+
+
+if __name__ == '__main__':
+    unittest.main()
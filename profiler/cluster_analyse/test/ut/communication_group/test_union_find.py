@@ -0,0 +1,98 @@
+# Copyright (c) 2023, Huawei Technologies Co., Ltd.
+# All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0  (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import math
+import time
+import unittest
+
+from common_func.constant import Constant
+from communication_group.communication_group_generator import CommunicationGroupGenerator, UnionFind
+from scale_test.synthetic_data_generator import SyntheticClusterConfig
+
+
+class TestUnionFind(unittest.TestCase):
+
+    def test_find_adds_new_element(self):
+        union_find = UnionFind()
+        self.assertNotIn(3, union_find)
+        self.assertEqual(union_find.find(3), 3)
+        self.assertIn(3, union_find)
+        self.assertEqual(union_find.get_groups(), [{3}])
+
+    def test_union(self):
+        union_find = UnionFind()
+        union_find.union(1, 2)
+        union_find.union(2, 1)
+        union_find.union(5, 6)
+        self.assertTrue(union_find.is_connected(1, 2))
+        self.assertFalse(union_find.is_connected(2, 5))
+        self.assertEqual(union_find.find(1), union_find.find(2))
+
+    def test_transitive_merge(self):
+        union_find = UnionFind()
+        union_find.union(1, 2)
+        union_find.union(3, 4)
+        self.assertFalse(union_find.is_connected(1, 4))
+        union_find.union(2, 3)
+        self.assertTrue(union_find.is_connected(1, 4))
+        self.assertEqual(union_find.get_groups(), [{1, 2, 3, 4}])
+
+    def test_get_groups_ordered_by_smallest_rank(self):
+        union_find = UnionFind()
+        for src_rank, dst_rank in [(9, 4), (0, 7), (3, 8), (7, 3)]:
+            union_find.union(src_rank, dst_rank)
+        self.assertEqual(union_find.get_groups(), [{0, 3, 7, 8}, {4, 9}])
+
+    def test_chain_depth_is_logarithmic(self):
+        rank_num = 10000
+        union_find = UnionFind()
+        for rank_id in range(rank_num - 1):
+            union_find.union(rank_id, rank_id + 1)
+        # union by rank keeps every tree at most log2(n) high, whatever the order of the links
+        self.assertLessEqual(max(union_find.rank.values()), math.log2(rank_num))
+        self.assertEqual(len(union_find.get_groups()), 1)
+
+
+class TestPipelineGroups(unittest.TestCase):
+
+    def test_10k_ranks_pp_layout(self):
+        config = SyntheticClusterConfig(10240, tp_size=8, pp_size=4)
+        generator = CommunicationGroupGenerator(None, None, None)
+        for rank_id in range(config.rank_num):
+            _, next_rank = config.get_pp_peers(rank_id)
+            if next_rank is not None:
+                generator.p2p_link.add((rank_id, next_rank))
+            for group_name, _ in config.get_groups(rank_id):
+                generator.collective_group_dict[group_name].add(rank_id)
+
+        start_time = time.perf_counter()
+        generator.set_p2p_groups()
+        generator.generate_p2p_communication_group()
+        elapsed_time = time.perf_counter() - start_time
+
+        # every pp group links the ranks with the same index in the 4 stages
+        self.assertEqual(len(generator.p2p_comm_group), config.stage_size)
+        self.assertEqual(generator.p2p_comm_group[0], {0, 2560, 5120, 7680})
+        self.assertEqual(generator.p2p_comm_group[-1], {2559, 5119, 7679, 10239})
+        # the tp and dp groups of a stage merge into the stage
+        stages = [sorted(stage) for stage in generator.communication_group[Constant.P2P]]
+        self.assertEqual(stages, [list(range(index * config.stage_size, (index + 1) * config.stage_size))
+                                  for index in range(config.pp_size)])
+        # near linear grouping takes well under a second, the bound leaves room for slow machines
+        self.assertLess(elapsed_time, 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
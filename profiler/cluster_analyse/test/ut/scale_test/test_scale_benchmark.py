@@ -0,0 +1,65 @@
+# Copyright (c) 2023, Huawei Technologies Co., Ltd.
+# All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0  (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from analysis.analysis_facade import AnalysisFacade
+from common_func.constant import Constant
+from scale_test import scale_benchmark
+from scale_test.synthetic_data_generator import SyntheticClusterConfig, generate_cluster_data
+
+
+class TestScaleBenchmark(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = os.path.realpath(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_run_phases(self):
+        config = SyntheticClusterConfig(8, tp_size=2, pp_size=2, collective_op_num=2, p2p_op_num=1)
+        data_path = generate_cluster_data(config, os.path.join(self.temp_dir, "data"), workers=1)
+        rank_num, records = scale_benchmark.run_phases(data_path, 1, Constant.DB)
+        self.assertEqual(rank_num, 8)
+        self.assertEqual([record[0] for record in records],
+                         ["data_map", "load_rank_data", "communication_group", "dump_db"] +
+                         [analysis.__name__ for analysis in AnalysisFacade.analysis_module] + ["total"])
+        output_path = os.path.join(data_path, Constant.CLUSTER_ANALYSIS_OUTPUT)
+        self.assertEqual(sorted(os.listdir(output_path)), [Constant.DB_FILE_NAME, "communication_group.json"])
+
+    def test_process_exit_without_result(self):
+        context = multiprocessing.get_context("spawn")
+        result_queue = context.Queue()
+        process = context.Process(target=sys.exit, args=(3,))
+        process.start()
+        with patch.object(scale_benchmark, "POLL_INTERVAL", 0.1), \
+                self.assertRaisesRegex(RuntimeError, "exited with code 3"):
+            scale_benchmark.wait_result(result_queue, process)
+        process.join()
+
+    def test_failed_run_reported(self):
+        with self.assertRaisesRegex(RuntimeError, "The benchmark process failed"):
+            scale_benchmark.benchmark(self.temp_dir, 1, Constant.TEXT)
+
+
+if __name__ == '__main__':
+    unittest.main()